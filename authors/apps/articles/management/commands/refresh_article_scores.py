@@ -0,0 +1,17 @@
+"""
+Recomputes the engagement and hot scores of all articles, after the stored
+rating totals. Hot scores decay with time, run this periodically (e.g. from a scheduler).
+"""
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.ranking import refresh_scores
+from authors.apps.articles.ratings import resync_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute the engagement and hot scores of all articles."
+
+    def handle(self, *args, **options):
+        resync_ratings()
+        refreshed = refresh_scores()
+        self.stdout.write("Refreshed scores of {0} article(s).".format(refreshed))
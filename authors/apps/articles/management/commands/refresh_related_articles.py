@@ -0,0 +1,20 @@
+"""
+Recomputes the related articles of all articles.
+Run this periodically (e.g. from a scheduler), new tags, likes and favorites
+show up in the related articles after the next run.
+"""
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.related import RELATED_PER_ARTICLE, refresh_related
+
+
+class Command(BaseCommand):
+    help = "Recompute the related articles of all articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=RELATED_PER_ARTICLE,
+                            help="Related articles kept per article.")
+
+    def handle(self, *args, **options):
+        stored = refresh_related(limit=options["limit"])
+        self.stdout.write("Stored {0} related article(s).".format(stored))
@@ -0,0 +1,28 @@
+"""
+Updates the daily reading stats of the articles and their authors.
+Run this at least daily (e.g. from a scheduler), views, likes and favorites
+are counted on the day the rollup runs.
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.articles.stats import rollup_stats
+
+
+class Command(BaseCommand):
+    help = "Update the daily reading stats of the articles and their authors."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First day to recompute (YYYY-MM-DD), by default the last rolled up day.")
+
+    def handle(self, *args, **options):
+        since = options["since"]
+        if since:
+            try:
+                since = datetime.strptime(since, "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--since must be a date such as 2018-09-24.")
+
+        articles, authors = rollup_stats(since=since)
+        self.stdout.write("Stored {0} article and {1} author daily stats.".format(articles, authors))
@@ -0,0 +1,23 @@
+# Generated by Django 2.1 on 2026-10-19 00:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0002_auto_20180924_1007'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='engagement_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='hot_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+    ]
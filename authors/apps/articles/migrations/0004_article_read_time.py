@@ -0,0 +1,49 @@
+# Generated by Django 2.1 on 2026-10-19 00:33
+
+import math
+
+from django.db import migrations, models
+
+# copies of the helpers in articles.utils as they were when this migration was written,
+# so later changes to them do not change what the migration computes
+WORDS_PER_MINUTE = 265
+
+
+def get_word_count(story):
+    return len(story.split()) if story else 0
+
+
+def get_read_time(word_count):
+    return int(math.ceil(word_count / WORDS_PER_MINUTE))
+
+
+def compute_read_time(apps, schema_editor):
+    """
+    fill in the word count and read time of existing articles
+    """
+    Article = apps.get_model('articles', 'Article')
+    for article in Article.objects.only('id', 'body').iterator():
+        word_count = get_word_count(article.body)
+        Article.objects.filter(pk=article.pk).update(
+            word_count=word_count, read_time_minutes=get_read_time(word_count))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_article_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='read_time_minutes',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(compute_read_time, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1 on 2026-10-19 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_related_article'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 2.1 on 2026-10-19 03:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0006_article_views_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleDailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.IntegerField(default=0)),
+                ('likes', models.IntegerField(default=0)),
+                ('favorites', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+                ('ratings', models.IntegerField(default=0)),
+                ('rating_total', models.FloatField(default=0)),
+                ('views_total', models.IntegerField(default=0)),
+                ('likes_total', models.IntegerField(default=0)),
+                ('favorites_total', models.IntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='articles.Article')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuthorDailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.IntegerField(default=0)),
+                ('likes', models.IntegerField(default=0)),
+                ('favorites', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+                ('ratings', models.IntegerField(default=0)),
+                ('rating_total', models.FloatField(default=0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='authordailystats',
+            unique_together={('author', 'date')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='articledailystats',
+            unique_together={('article', 'date')},
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 2.1 on 2026-10-19 05:30
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_ratings(apps, schema_editor):
+    """
+    concurrent submissions could store a user's rating of an article twice, keep the
+    latest one so the unique constraint can be created
+    """
+    Rating = apps.get_model('articles', 'Rating')
+    duplicates = (Rating.objects.filter(rated_by__isnull=False).order_by().values('article_id', 'rated_by_id')
+                  .annotate(total=Count('pk')).filter(total__gt=1))
+    for duplicate in list(duplicates):
+        ratings = Rating.objects.filter(article_id=duplicate['article_id'], rated_by_id=duplicate['rated_by_id'])
+        latest = ratings.order_by('-rated_at', '-pk').first()
+        ratings.exclude(pk=latest.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0007_daily_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_ratings, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='rating',
+            unique_together={('article', 'rated_by')},
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created_at'], name='articles_created'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', '-created_at'], name='articles_author_created'),
+        ),
+        migrations.AddIndex(
+            model_name='articlereport',
+            index=models.Index(fields=['article', '-reported_at'], name='articles_report_article'),
+        ),
+    ]
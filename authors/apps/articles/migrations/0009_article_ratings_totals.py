@@ -0,0 +1,36 @@
+# Generated by Django 2.1 on 2026-10-19 06:00
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def store_ratings_totals(apps, schema_editor):
+    """
+    stores the number and total of the existing ratings of every article
+    """
+    Article = apps.get_model('articles', 'Article')
+    Rating = apps.get_model('articles', 'Rating')
+    totals = Rating.objects.order_by().values('article_id').annotate(count=Count('pk'), total=Sum('score'))
+    for row in totals:
+        Article.objects.filter(pk=row['article_id']).update(ratings_count=row['count'], ratings_total=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='ratings_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='ratings_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(store_ratings_totals, migrations.RunPython.noop),
+    ]
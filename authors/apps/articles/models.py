@@ -4,11 +4,10 @@ model. To be used for all articles
 """
 
 from django.db import models
-from django.db.models import Avg
 from django.utils import timezone
 
 from authors.apps.articles.filters import ArticleManager
-from authors.apps.articles.utils import generate_slug
+from authors.apps.articles.utils import generate_slug, get_read_time, get_word_count
 from authors.apps.authentication.models import User
 
 
@@ -50,6 +49,25 @@ class Article(models.Model):
 
     favorites_count = models.IntegerField(default=0)
 
+    # precomputed ranking scores, updated on engagement events and
+    # recomputed periodically by the `refresh_article_scores` command
+    engagement_score = models.FloatField(default=0, db_index=True)
+
+    hot_score = models.FloatField(default=0, db_index=True)
+
+    # buffered and written in batches, see `authors.apps.articles.view_counts`
+    views_count = models.PositiveIntegerField(default=0)
+
+    # kept up to date by every rating, see `authors.apps.articles.ratings`
+    ratings_count = models.PositiveIntegerField(default=0)
+
+    ratings_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    # computed from the body on save, so lists don't need to fetch the body
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+
+    read_time_minutes = models.PositiveIntegerField(default=0, editable=False)
+
     photo_url = models.CharField(max_length=255, null=True)
 
     tags = models.ManyToManyField(Tag, related_name='article_tag')
@@ -66,22 +84,25 @@ class Article(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        override default save() to generate slug
+        override default save() to generate slug and read time
         :param args:
         :param kwargs:
         """
         self.slug = generate_slug(Article, self)
+        self.word_count = get_word_count(self.body)
+        self.read_time_minutes = get_read_time(self.word_count)
 
         super(Article, self).save(*args, **kwargs)
 
     @property
     def average_rating(self):
         """
-        calculates the average rating of the article.
+        calculates the average rating of the article from the stored totals.
         :return:
         """
-        ratings = self.scores.all().aggregate(score=Avg("score"))
-        return float('%.2f' % (ratings["score"] if ratings['score'] else 0))
+        if not self.ratings_count:
+            return 0.0
+        return float('%.2f' % (self.ratings_total / self.ratings_count))
 
     def like(self, user):
         return self.likes.add(user)
@@ -115,6 +136,12 @@ class Article(models.Model):
     class Meta:
         get_latest_by = 'created_at'
         ordering = ['-created_at', 'author']
+        indexes = [
+            # the default ordering of the lists
+            models.Index(fields=['-created_at'], name='articles_created'),
+            # the articles of an author, newest first
+            models.Index(fields=['author', '-created_at'], name='articles_author_created'),
+        ]
 
 
 class Rating(models.Model):
@@ -131,6 +158,8 @@ class Rating(models.Model):
 
     class Meta:
         ordering = ('-score',)
+        # a user rates an article once, rating it again changes the score
+        unique_together = (('article', 'rated_by'),)
 
 
 class Comments(models.Model):
@@ -192,3 +221,60 @@ class ArticleReport(models.Model):
         User, blank=False, null=False, on_delete=models.CASCADE)
     report_message = models.TextField(blank=True, null=True)
     reported_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # the reports of an article, newest first
+        indexes = [models.Index(fields=['article', '-reported_at'], name='articles_report_article')]
+
+
+class RelatedArticle(models.Model):
+    """
+    An article related to another one, see `authors.apps.articles.related`
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="related")
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = (("article", "related"),)
+        indexes = [models.Index(fields=["article", "-score"], name="articles_related_score")]
+
+
+class ArticleDailyStats(models.Model):
+    """
+    What happened to an article on a day, see `authors.apps.articles.stats`
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    views = models.IntegerField(default=0)
+    likes = models.IntegerField(default=0)
+    favorites = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+    ratings = models.IntegerField(default=0)
+    rating_total = models.FloatField(default=0)
+
+    # views, likes and favorites have no timestamps, their daily changes are the
+    # difference between these totals and the totals of the previous rollup
+    views_total = models.IntegerField(default=0)
+    likes_total = models.IntegerField(default=0)
+    favorites_total = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (("article", "date"),)
+
+
+class AuthorDailyStats(models.Model):
+    """
+    What happened to the articles of an author on a day, summed from `ArticleDailyStats`
+    """
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    views = models.IntegerField(default=0)
+    likes = models.IntegerField(default=0)
+    favorites = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+    ratings = models.IntegerField(default=0)
+    rating_total = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = (("author", "date"),)
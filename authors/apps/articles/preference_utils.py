@@ -1,6 +1,7 @@
 from rest_framework.response import Response
 from authors.apps.articles.exceptions import NotFoundException
 from .models import Article
+from .ranking import record_engagement
 
 
 def return_article(slug):
@@ -58,7 +59,16 @@ def call_preference_helpers(action, slug, current_user):
     """
 
     article = return_article(slug)
+    field, other = ("likes", "dislikes") if action == "like" else ("dislikes", "likes")
     if article.is_neutral(current_user):
-        return make_first_preference_attempt(action, slug, current_user)
-    return change_preference(action, slug, current_user)
+        response = make_first_preference_attempt(action, slug, current_user)
+        changes = {field: 1}
+    else:
+        # switching from the other preference, or taking this one back
+        switching = article.is_disliking(current_user) if action == "like" else article.is_liking(current_user)
+        response = change_preference(action, slug, current_user)
+        changes = {field: 1, other: -1} if switching else {field: -1}
+
+    record_engagement(article, **changes)
+    return response
 
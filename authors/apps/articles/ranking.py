@@ -0,0 +1,185 @@
+"""
+Article ranking,
+computes the engagement and hot scores used to order articles.
+
+The engagement score is linear in the engagement counts, so engagement events
+add the change of the score to the stored one with a single UPDATE, see
+`record_engagement`. `refresh_scores` recomputes the scores from the counts and
+decays the hot scores of articles nobody engaged with, the
+`refresh_article_scores` command runs it periodically.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.utils import timezone
+
+# weight given to each kind of engagement on an article
+LIKE_WEIGHT = 1.0
+DISLIKE_WEIGHT = -1.0
+FAVORITE_WEIGHT = 2.0
+COMMENT_WEIGHT = 1.5
+RATING_WEIGHT = 1.0
+
+# ratings above this score raise the engagement score, ratings below lower it
+NEUTRAL_RATING = 2.5
+
+# controls how fast the hot score of an article decays with age (in hours)
+GRAVITY = 1.8
+AGE_OFFSET_HOURS = 2
+
+# articles written per UPDATE by `refresh_scores`, each one takes four query parameters
+REFRESH_BATCH_SIZE = 100
+
+# maps the `ordering` query parameter to the article ordering
+ARTICLE_ORDERINGS = {
+    "new": ("-created_at",),
+    "hot": ("-hot_score", "-created_at"),
+    "top": ("-engagement_score", "-created_at"),
+}
+
+
+def get_engagement_score(likes=0, dislikes=0, favorites=0, comments=0, ratings=0, average_rating=0):
+    """
+    returns the engagement score of an article, it does not depend on the article age
+    :param likes:
+    :param dislikes:
+    :param favorites:
+    :param comments:
+    :param ratings:
+    :param average_rating:
+    :return:
+    """
+    rating_score = ratings * (float(average_rating) - NEUTRAL_RATING) / NEUTRAL_RATING if ratings else 0
+
+    return (likes * LIKE_WEIGHT + dislikes * DISLIKE_WEIGHT + favorites * FAVORITE_WEIGHT +
+            comments * COMMENT_WEIGHT + rating_score * RATING_WEIGHT)
+
+
+def get_rating_change(added, difference):
+    """
+    returns how much the engagement score changes with a rating, the rating part of
+    the score only depends on the number and the total of the ratings
+    :param added: ratings added, 0 when a rating was changed
+    :param difference: difference of the total of the ratings
+    :return:
+    """
+    return (float(difference) - added * NEUTRAL_RATING) / NEUTRAL_RATING * RATING_WEIGHT
+
+
+def get_hot_score(engagement_score, created_at, now=None):
+    """
+    returns the engagement score decayed by the age of the article
+    :param engagement_score:
+    :param created_at:
+    :param now:
+    :return:
+    """
+    now = now or timezone.now()
+    age_hours = max((now - created_at).total_seconds() / 3600, 0)
+    return engagement_score / pow(age_hours + AGE_OFFSET_HOURS, GRAVITY)
+
+
+def _count_by_article(queryset, article_ids, field="article_id"):
+    """
+    returns a dict mapping article ids to the number of rows in the queryset
+    :param queryset:
+    :param article_ids:
+    :param field:
+    :return:
+    """
+    if article_ids is not None:
+        queryset = queryset.filter(**{field + "__in": article_ids})
+    return dict(queryset.values_list(field).annotate(total=Count("pk")).order_by())
+
+
+def collect_engagement(article_ids=None):
+    """
+    returns the engagement counts of the articles, one grouped query per kind of engagement
+    :param article_ids: restrict to these articles, all articles when None
+    :return: dict mapping an article id to its engagement counts
+    """
+    from authors.apps.articles.models import Article, Comments
+
+    likes = _count_by_article(Article.likes.through.objects.all(), article_ids)
+    dislikes = _count_by_article(Article.dislikes.through.objects.all(), article_ids)
+    favorites = _count_by_article(Article.favorited_by.through.objects.all(), article_ids)
+    comments = _count_by_article(Comments.objects.all(), article_ids)
+
+    # stored on the articles, see `authors.apps.articles.ratings`
+    rated = Article.objects.filter(ratings_count__gt=0)
+    if article_ids is not None:
+        rated = rated.filter(pk__in=article_ids)
+    ratings = {
+        pk: {"total": count, "average": total / count}
+        for pk, count, total in rated.values_list("pk", "ratings_count", "ratings_total").order_by()
+    }
+
+    def engagement(pk):
+        rating = ratings.get(pk, {})
+        return {
+            "likes": likes.get(pk, 0),
+            "dislikes": dislikes.get(pk, 0),
+            "favorites": favorites.get(pk, 0),
+            "comments": comments.get(pk, 0),
+            "ratings": rating.get("total", 0),
+            "average_rating": rating.get("average", 0) or 0,
+        }
+
+    keys = set(likes) | set(dislikes) | set(favorites) | set(comments) | set(ratings)
+    if article_ids is not None:
+        keys |= set(article_ids)
+    return {pk: engagement(pk) for pk in keys}
+
+
+def refresh_scores(article_ids=None, now=None):
+    """
+    recomputes and stores the engagement and hot scores of the articles
+    :param article_ids: restrict to these articles, all articles when None
+    :param now:
+    :return: number of articles refreshed
+    """
+    from authors.apps.articles.models import Article
+
+    now = now or timezone.now()
+    engagements = collect_engagement(article_ids)
+
+    articles = Article.objects.all()
+    if article_ids is not None:
+        articles = articles.filter(pk__in=article_ids)
+    rows = list(articles.values_list("pk", "created_at").order_by())
+
+    with transaction.atomic():
+        for start in range(0, len(rows), REFRESH_BATCH_SIZE):
+            scores = {}
+            for pk, created_at in rows[start:start + REFRESH_BATCH_SIZE]:
+                engagement_score = get_engagement_score(**engagements.get(pk, {}))
+                scores[pk] = engagement_score, get_hot_score(engagement_score, created_at, now)
+
+            Article.objects.filter(pk__in=scores).update(**{
+                field: Case(*[When(pk=pk, then=Value(values[index])) for pk, values in scores.items()],
+                            output_field=FloatField())
+                for index, field in enumerate(("engagement_score", "hot_score"))
+            })
+    return len(rows)
+
+
+def record_engagement(article, now=None, **changes):
+    """
+    updates the scores of an article after an engagement event with one UPDATE, the change of
+    the engagement score is added to the stored one and the hot score follows it
+    :param article: article instance or primary key
+    :param now:
+    :param changes: changes of the engagement counts, e.g. `likes=1, dislikes=-1`
+    :return:
+    """
+    from authors.apps.articles.models import Article
+
+    pk = getattr(article, "pk", article)
+    created_at = getattr(article, "created_at", None)
+    if created_at is None:
+        created_at = Article.objects.values_list("created_at", flat=True).get(pk=pk)
+
+    engagement_score = F("engagement_score") + get_engagement_score(**changes)
+    Article.objects.filter(pk=pk).update(
+        engagement_score=engagement_score,
+        # both columns are computed from the engagement score before the UPDATE
+        hot_score=engagement_score * get_hot_score(1.0, created_at, now))
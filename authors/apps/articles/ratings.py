@@ -0,0 +1,109 @@
+"""
+Article ratings,
+a user's rating of an article is written with a single upsert and the number and
+total of the ratings of the article, stored on the article, are updated by the
+difference in the same transaction, so reading the average never aggregates the
+ratings table. The engagement and hot scores of the article are updated in the
+same statement.
+
+Ratings written otherwise (e.g. bulk inserts) leave the stored totals behind,
+`resync_ratings` recomputes them, the `refresh_article_scores` command runs it.
+"""
+import sqlite3
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from authors.apps.articles.ranking import get_hot_score, get_rating_change
+
+# PostgreSQL 9.5+ and SQLite 3.24+
+UPSERT_SQL = """
+INSERT INTO {table} ({article}, {rated_by}, {score}, {rated_at}) VALUES (%s, %s, %s, %s)
+ON CONFLICT ({article}, {rated_by}) DO UPDATE SET {score} = excluded.{score}
+"""
+
+
+def has_upsert():
+    """
+    tells whether the database supports `INSERT ... ON CONFLICT DO UPDATE`
+    :return:
+    """
+    if connection.vendor == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 24)
+    return connection.vendor == "postgresql"
+
+
+def _upsert(article_id, user_id, score, now, exists):
+    from authors.apps.articles.models import Rating
+
+    if not has_upsert():
+        # the lock on the article keeps `exists` true until the transaction ends
+        if exists:
+            Rating.objects.filter(article_id=article_id, rated_by_id=user_id).update(score=score)
+        else:
+            Rating.objects.create(article_id=article_id, rated_by_id=user_id, score=score, rated_at=now)
+        return
+
+    quote = connection.ops.quote_name
+    columns = {name: quote(Rating._meta.get_field(name).column) for name in ("article", "rated_by", "score",
+                                                                               "rated_at")}
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_SQL.format(table=quote(Rating._meta.db_table), **columns), [
+            article_id, user_id, connection.ops.adapt_decimalfield_value(score, 4, 2),
+            connection.ops.adapt_datetimefield_value(now)])
+
+
+def rate(article, user, score, now=None):
+    """
+    stores the rating of an article by a user, replacing the previous one
+    :param article: the article, its `ratings_count` and `ratings_total` are updated
+    :param user:
+    :param score:
+    :param now:
+    :return: the rating
+    """
+    from authors.apps.articles.models import Article, Rating
+
+    now = now or timezone.now()
+    score = Decimal(score).quantize(Decimal("0.01"))
+    with transaction.atomic():
+        # the lock on the article orders concurrent ratings of it, each one sees the previous
+        count, total, engagement_score, created_at = Article.objects.select_for_update().values_list(
+            "ratings_count", "ratings_total", "engagement_score", "created_at").get(pk=article.pk)
+        previous, rated_at = Rating.objects.filter(article_id=article.pk, rated_by_id=user.pk).order_by(
+        ).values_list("score", "rated_at").first() or (None, now)
+
+        # rating again changes the score only, the rating stays on the day it was first made
+        _upsert(article.pk, user.pk, score, now, previous is not None)
+
+        added = 0 if previous is not None else 1
+        difference = score - (previous or 0)
+        engagement_score += get_rating_change(added, difference)
+        Article.objects.filter(pk=article.pk).update(
+            ratings_count=F("ratings_count") + added, ratings_total=F("ratings_total") + difference,
+            engagement_score=engagement_score, hot_score=get_hot_score(engagement_score, created_at, now))
+
+    article.ratings_count, article.ratings_total = count + added, total + difference
+    return Rating(article=article, rated_by=user, score=score, rated_at=rated_at)
+
+
+def resync_ratings(article_ids=None):
+    """
+    recomputes the stored number and total of the ratings of the articles
+    :param article_ids: restrict to these articles, all articles when None
+    :return: number of articles updated
+    """
+    from authors.apps.articles.models import Article, Rating
+
+    ratings = Rating.objects.filter(article=OuterRef("pk")).order_by().values("article")
+    articles = Article.objects.all()
+    if article_ids is not None:
+        articles = articles.filter(pk__in=article_ids)
+    return articles.update(
+        ratings_count=Coalesce(Subquery(ratings.annotate(total=Count("pk")).values("total"),
+                                        output_field=IntegerField()), 0),
+        ratings_total=Coalesce(Subquery(ratings.annotate(total=Sum("score")).values("total"),
+                                        output_field=DecimalField(max_digits=12, decimal_places=2)), 0))
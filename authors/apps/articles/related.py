@@ -0,0 +1,80 @@
+"""
+Related articles,
+scores pairs of articles by the tags they share and by the readers who liked
+or favorited both, and keeps the best neighbours of every article
+"""
+import heapq
+from collections import defaultdict
+from math import log2
+
+from django.db import transaction
+
+# weight of each kind of shared feature between two articles
+TAG_WEIGHT = 1.0
+CO_LIKE_WEIGHT = 0.5
+CO_FAVORITE_WEIGHT = 1.0
+
+# features shared by more articles than this (e.g. a tag on every article) say little
+# about two articles and would make the pairs grow with the square of their size
+MAX_FEATURE_ARTICLES = 500
+
+# neighbours stored per article by `refresh_related`
+RELATED_PER_ARTICLE = 10
+
+
+def collect_features():
+    """
+    returns the articles of every feature, one query per kind of feature
+    :return: list of (weight, article ids) pairs
+    """
+    from authors.apps.articles.models import Article
+
+    features = []
+    for weight, through, field in ((TAG_WEIGHT, Article.tags.through, "tag_id"),
+                                   (CO_LIKE_WEIGHT, Article.likes.through, "user_id"),
+                                   (CO_FAVORITE_WEIGHT, Article.favorited_by.through, "userprofile_id")):
+        articles = defaultdict(list)
+        for feature, article in through.objects.values_list(field, "article_id").order_by().iterator():
+            articles[feature].append(article)
+        features.extend((weight, ids) for ids in articles.values())
+    return features
+
+
+def get_similarities(features):
+    """
+    returns the similarity of every pair of articles sharing a feature, a feature
+    shared by n articles adds `weight / log2(n + 1)` to each of their pairs
+    :param features: list of (weight, article ids) pairs
+    :return: dict mapping an article id to a dict of neighbour ids and scores
+    """
+    scores = defaultdict(lambda: defaultdict(float))
+    for weight, articles in features:
+        if len(articles) < 2 or len(articles) > MAX_FEATURE_ARTICLES:
+            continue
+        score = weight / log2(len(articles) + 1)
+        for article in articles:
+            neighbours = scores[article]
+            for other in articles:
+                if other != article:
+                    neighbours[other] += score
+    return scores
+
+
+def refresh_related(limit=RELATED_PER_ARTICLE):
+    """
+    recomputes and stores the top neighbours of every article
+    :param limit: neighbours kept per article
+    :return: number of related articles stored
+    """
+    from authors.apps.articles.models import RelatedArticle
+
+    related = []
+    for article, neighbours in get_similarities(collect_features()).items():
+        # ties go to the newest articles so runs are repeatable
+        for other in heapq.nsmallest(limit, neighbours, key=lambda pk: (-neighbours[pk], -pk)):
+            related.append(RelatedArticle(article_id=article, related_id=other, score=neighbours[other]))
+
+    with transaction.atomic():
+        RelatedArticle.objects.all().delete()
+        RelatedArticle.objects.bulk_create(related, batch_size=1000)
+    return len(related)
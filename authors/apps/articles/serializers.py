@@ -1,15 +1,18 @@
 """
 Serializer classes for articles
 """
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 from rest_framework.pagination import PageNumberPagination
 from authors.apps.articles.exceptions import NotFoundException
 
 from authors.apps.articles.models import (Article,
                                           Tag, Rating, ArticleReport, Comments, Replies)
+from authors.apps.articles.ratings import rate
 from authors.apps.articles.utils import get_date
 from authors.apps.authentication.models import User
-from authors.apps.profiles.models import UserProfile
+from authors.apps.core.instrumentation import TimedSerializerMixin
 from authors.apps.profiles.serializers import UserProfileSerializer
 from rest_framework.exceptions import NotFound
 
@@ -25,7 +28,7 @@ class TagRelatedField(serializers.RelatedField):
         return value.tag_name
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Handles serialization and deserialization of Tag objects."""
 
     class Meta:
@@ -33,14 +36,14 @@ class TagSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class RepliesSerializer(serializers.ModelSerializer):
+class RepliesSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Replies
         fields = '__all__'
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     replies = RepliesSerializer(many=True, read_only=True)
 
@@ -49,7 +52,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'body', 'article', 'author', 'replies')
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Define action logic for an article
     """
@@ -143,8 +146,7 @@ class ArticleSerializer(serializers.ModelSerializer):
         :return:
         """
         response = super().to_representation(instance)
-        profile = UserProfileSerializer(UserProfile.objects.get(
-            user=instance.author), context=self.context).data
+        profile = UserProfileSerializer(instance.author.userprofile, context=self.context).data
 
         response['author'] = profile
         return response
@@ -159,7 +161,9 @@ class ArticleSerializer(serializers.ModelSerializer):
         model = Article
 
         fields = ('slug', 'title', 'description', 'body', 'created_at', 'average_rating', 'user_rating',
-                  'updated_at', 'favorites_count', 'photo_url', 'author', 'tagList', 'comments', 'likes', 'dislikes')
+                  'updated_at', 'favorites_count', 'photo_url', 'author', 'tagList', 'comments', 'likes', 'dislikes',
+                  'word_count', 'read_time_minutes', 'views_count')
+        read_only_fields = ('views_count',)
 
     def get_favorites_count(self, instance):
         return instance.favorited_by.count()
@@ -171,6 +175,114 @@ class ArticleSerializer(serializers.ModelSerializer):
         return instance.dislikes.all().count()
 
 
+def count_subquery(model, field="article"):
+    """
+    returns a subquery counting the rows of `model` related to the outer article
+    :param model:
+    :param field:
+    :return:
+    """
+    rows = model.objects.filter(**{field: OuterRef("pk")}).order_by().values(field)
+    return Coalesce(Subquery(rows.annotate(total=Count("pk")).values("total"), output_field=IntegerField()), 0)
+
+
+class ArticleAuthorSerializer(TimedSerializerMixin, serializers.Serializer):
+    """
+    Summary of the author of an article
+    """
+    username = serializers.CharField()
+    avatar = serializers.URLField(source="userprofile.avatar")
+
+
+class ArticleListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Lightweight representation of an article used by list views.
+    `body`, `comments` and the full `author` profile are only
+    included when requested with `?expand=body,comments,author`
+    """
+    EXPANDABLE = ("body", "comments", "author")
+    SUMMARY_FIELDS = ("id", "slug", "title", "description", "created_at", "updated_at", "photo_url",
+                      "word_count", "read_time_minutes", "views_count", "ratings_count", "ratings_total",
+                      "author__id", "author__username",
+                      "author__userprofile__id", "author__userprofile__user", "author__userprofile__avatar")
+
+    author = ArticleAuthorSerializer(read_only=True)
+    tagList = TagRelatedField(many=True, read_only=True, source='tags')
+    favorites_count = serializers.IntegerField(source="favorited_count", read_only=True)
+    likes = serializers.IntegerField(source="likes_count", read_only=True)
+    dislikes = serializers.IntegerField(source="dislikes_count", read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+
+    class Meta:
+        """
+        class behaviours
+        """
+        model = Article
+
+        fields = ('slug', 'title', 'description', 'created_at', 'updated_at', 'photo_url', 'author', 'tagList',
+                  'favorites_count', 'likes', 'dislikes', 'comments_count', 'average_rating', 'word_count',
+                  'read_time_minutes', 'views_count')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = self.get_expand(self.context.get("request", None))
+
+        if "body" in expand:
+            self.fields["body"] = serializers.CharField(read_only=True)
+        if "comments" in expand:
+            self.fields["comments"] = CommentSerializer(many=True, read_only=True)
+        self.expand = expand
+
+    @classmethod
+    def get_expand(cls, request):
+        """
+        returns the expandable fields requested with the `expand` query parameter
+        :param request:
+        :return:
+        """
+        if request is None:
+            return set()
+        requested = request.query_params.get("expand", "").split(",")
+        return {field.strip() for field in requested if field.strip() in cls.EXPANDABLE}
+
+    @classmethod
+    def setup_queryset(cls, queryset, request=None):
+        """
+        fetches only the columns and relations needed to list articles,
+        counts are computed by the database instead of per article
+        :param queryset:
+        :param request:
+        :return:
+        """
+        expand = cls.get_expand(request)
+        fields = cls.SUMMARY_FIELDS + (("body",) if "body" in expand else ())
+
+        queryset = queryset.select_related("author__userprofile").only(*fields).prefetch_related("tags").annotate(
+            favorited_count=count_subquery(Article.favorited_by.through),
+            likes_count=count_subquery(Article.likes.through),
+            dislikes_count=count_subquery(Article.dislikes.through),
+            comments_count=count_subquery(Comments),
+        )
+
+        if "comments" in expand:
+            queryset = queryset.prefetch_related("comments__replies")
+        return queryset
+
+    def to_representation(self, instance):
+        """
+        formats serializer display response
+        :param instance:
+        :return:
+        """
+        response = super().to_representation(instance)
+        response["average_rating"] = float('%.2f' % response["average_rating"])
+
+        if "author" in self.expand:
+            response["author"] = UserProfileSerializer(instance.author.userprofile, context=self.context).data
+        return response
+
+
 class PaginatedArticleSerializer(PageNumberPagination):
     """
     Pagination class
@@ -195,85 +307,64 @@ class PaginatedArticleSerializer(PageNumberPagination):
         }
 
 
-class RatingSerializer(serializers.ModelSerializer):
+class RatingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Define action logic for an article rating
     """
-    article = serializers.PrimaryKeyRelatedField(
-        queryset=Article.objects.all())
+    article = serializers.SlugRelatedField(slug_field="slug", read_only=True)
     rated_at = serializers.DateTimeField(read_only=True)
-    rated_by = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    rated_by = serializers.SlugRelatedField(slug_field="username", read_only=True)
     score = serializers.DecimalField(
         required=True, max_digits=4, decimal_places=2)
+    average_rating = serializers.FloatField(source="article.average_rating", read_only=True)
 
     @staticmethod
-    def update_request_data(data, slug, user: User):
+    def get_rated_article(slug, user: User):
         """
+        returns the article rated, only with the fields a rating needs
         :param user:
         :param slug:
-        :param data:
         :return:
         """
         try:
-            article = Article.objects.get(slug__exact=slug)
+            article = Article.objects.only("id", "slug", "author_id", "ratings_count", "ratings_total").get(
+                slug__exact=slug)
         except Article.DoesNotExist:
             raise NotFoundException("Article is not found.")
 
-        if article.author == user:
+        if article.author_id == user.pk:
             raise serializers.ValidationError({
                 "article": ["You can not rate your self"]
             })
+        return article
 
-        score = data.get("score", 0)
-        if score > 5 or score < 0:
-            raise serializers.ValidationError({
-                "score": ["Score value must not go below `0` and not go beyond `5`"]
-            })
-
-        data.update({"article": article.pk})
-        data.update({"rated_by": user.pk})
-        return data
-
-    def create(self, validated_data):
+    def validate_score(self, score):
         """
-        :param validated_data:
+        :param score:
         :return:
         """
-        rated_by = validated_data.get("rated_by", None)
-        article = validated_data.get("article", None)
-        score = validated_data.get("score", 0)
-
-        try:
-            rating = Rating.objects.get(
-                rated_by=rated_by, article__slug=article.slug)
-        except Rating.DoesNotExist:
-            return Rating.objects.create(**validated_data)
-
-        rating.score = score
-        rating.save()
-        return rating
+        if score > 5 or score < 0:
+            raise serializers.ValidationError("Score value must not go below `0` and not go beyond `5`")
+        return score
 
-    def to_representation(self, instance):
+    def create(self, validated_data):
         """
-        :param instance:
+        :param validated_data:
         :return:
         """
-        response = super().to_representation(instance)
-
-        response['article'] = instance.article.slug
-        response['rated_by'] = instance.rated_by.username
-        response['average_rating'] = instance.article.average_rating
-        return response
+        return rate(validated_data["article"], validated_data["rated_by"], validated_data["score"])
 
     class Meta:
         """
         class behaviours
         """
         model = Rating
-        fields = ("score", "rated_by", "rated_at", "article")
+        fields = ("score", "rated_by", "rated_at", "article", "average_rating")
+        # rating an article again updates the rating, see `authors.apps.articles.ratings`
+        validators = []
 
 
-class ArticleReportSerializer(serializers.ModelSerializer):
+class ArticleReportSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Handles serialization and deserialization of ArticleReportSerializer objects.
     """
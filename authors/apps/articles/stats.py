@@ -0,0 +1,214 @@
+"""
+Reading stats,
+daily rollups of the views, likes, favorites, comments and ratings of every
+article and of every author, so stats are read without scanning the event tables.
+
+Comments and ratings are counted on the day of their timestamp. Views, likes and
+favorites have no timestamps, each rollup stores their totals and counts the
+difference with the totals of the previous rollup on the day it runs, so run
+`rollup_article_stats` at least daily.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Subquery, Sum, OuterRef
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from authors.apps.articles.ranking import _count_by_article
+
+# fields of the rollups
+TIMESTAMPED = ("comments", "ratings", "rating_total")
+SNAPSHOTS = ("views", "likes", "favorites")
+STATS = SNAPSHOTS + TIMESTAMPED
+
+
+def _count_by_day(queryset, timestamp, since, **totals):
+    """
+    returns the rows of the queryset grouped by article and day
+    :param queryset:
+    :param timestamp: name of the timestamp field
+    :param since: first day
+    :param totals: aggregates computed per article and day
+    :return: dict mapping (article id, date) to the aggregates
+    """
+    rows = queryset.filter(**{timestamp + "__date__gte": since, "article__isnull": False}).annotate(
+        day=TruncDate(timestamp)).order_by().values("article_id", "day").annotate(**totals)
+    return {(row.pop("article_id"), row.pop("day")): row for row in rows}
+
+
+def get_snapshot_changes(today):
+    """
+    returns the changes of the views, likes and favorites of the articles since the previous rollup
+    :param today:
+    :return: dict mapping article ids to their changes and new totals
+    """
+    from authors.apps.articles.models import Article, ArticleDailyStats
+
+    likes = _count_by_article(Article.likes.through.objects.all(), None)
+    favorites = _count_by_article(Article.favorited_by.through.objects.all(), None)
+
+    previous = ArticleDailyStats.objects.filter(article=OuterRef("pk"), date__lt=today).order_by("-date")
+    articles = Article.objects.order_by().annotate(**{
+        "previous_" + field: Subquery(previous.values(field + "_total")[:1]) for field in SNAPSHOTS
+    }).values_list("pk", "views_count", "previous_views", "previous_likes", "previous_favorites")
+
+    changes = {}
+    for pk, views, previous_views, previous_likes, previous_favorites in articles:
+        totals = {"views": views, "likes": likes.get(pk, 0), "favorites": favorites.get(pk, 0)}
+        previous_totals = {"views": previous_views or 0, "likes": previous_likes or 0,
+                           "favorites": previous_favorites or 0}
+        changes[pk] = {field: totals[field] - previous_totals[field] for field in SNAPSHOTS}
+        changes[pk].update({field + "_total": totals[field] for field in SNAPSHOTS})
+    return changes
+
+
+def _carry_totals_forward(rows, since):
+    """
+    fills the views, likes and favorites totals of the new rows of past days, e.g. of a late
+    comment, with those of the previous rollup of their article, a new row with zero totals
+    would make the next rollup count the whole totals again
+    :param rows: dict mapping (article id, date) to the rows of the rollup
+    :param since: first day of the rollup
+    :return:
+    """
+    from authors.apps.articles.models import Article, ArticleDailyStats
+
+    totals = [field + "_total" for field in SNAPSHOTS]
+    missing = {pk for (pk, date), row in rows.items() if "views_total" not in row}
+    if not missing:
+        return
+
+    previous = ArticleDailyStats.objects.filter(article=OuterRef("pk"), date__lt=since).order_by("-date")
+    articles = Article.objects.filter(pk__in=missing).order_by().annotate(**{
+        "previous_" + field: Subquery(previous.values(field)[:1]) for field in totals
+    }).values_list("pk", *["previous_" + field for field in totals])
+    carried = {pk: {field: value or 0 for field, value in zip(totals, values)} for pk, *values in articles}
+
+    for pk, date in sorted(key for key in rows if key[0] in missing):
+        row = rows[(pk, date)]
+        if "views_total" in row:
+            carried[pk] = {field: row[field] for field in totals}
+        else:
+            row.update(carried[pk])
+
+
+def rollup_articles(since, today):
+    """
+    recomputes the daily stats of the articles from `since` to `today`, the views, likes and
+    favorites of earlier rollups are kept, those of today are taken from the current totals
+    :param since:
+    :param today:
+    :return: number of rows stored
+    """
+    from authors.apps.articles.models import ArticleDailyStats, Comments, Rating
+
+    existing = ArticleDailyStats.objects.filter(date__gte=since, date__lte=today)
+    rows = {}
+    for row in existing.values():
+        key = (row["article_id"], row["date"])
+        rows[key] = {field: value for field, value in row.items() if field not in ("id", "article_id", "date")}
+        rows[key].update({field: 0 for field in TIMESTAMPED})
+
+    events = (_count_by_day(Comments.objects.all(), "created_at", since, comments=Count("pk")),
+              _count_by_day(Rating.objects.all(), "rated_at", since, ratings=Count("pk"), rating_total=Sum("score")))
+    for counts in events:
+        for key, values in counts.items():
+            row = rows.setdefault(key, {})
+            row.update({field: value for field, value in values.items()})
+
+    for pk, values in get_snapshot_changes(today).items():
+        row = rows.get((pk, today))
+        if row is None:
+            if not any(values[field] for field in SNAPSHOTS):
+                # nothing changed, the previous totals still hold
+                continue
+            row = rows[(pk, today)] = {}
+        row.update(values)
+    _carry_totals_forward(rows, since)
+
+    stats = [ArticleDailyStats(article_id=pk, date=date, **{
+        field: float(value or 0) if field == "rating_total" else value or 0 for field, value in values.items()
+    }) for (pk, date), values in rows.items()]
+
+    with transaction.atomic():
+        existing.delete()
+        ArticleDailyStats.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
+
+
+def rollup_authors(since, today):
+    """
+    recomputes the daily stats of the authors from `since` to `today` from those of their articles
+    :param since:
+    :param today:
+    :return: number of rows stored
+    """
+    from authors.apps.articles.models import ArticleDailyStats, AuthorDailyStats
+
+    rows = ArticleDailyStats.objects.filter(
+        date__gte=since, date__lte=today, article__author__isnull=False).order_by().values(
+        "article__author_id", "date").annotate(**{field + "_sum": Sum(field) for field in STATS})
+
+    stats = [AuthorDailyStats(author_id=row["article__author_id"], date=row["date"], **{
+        field: row[field + "_sum"] for field in STATS}) for row in rows]
+
+    with transaction.atomic():
+        AuthorDailyStats.objects.filter(date__gte=since, date__lte=today).delete()
+        AuthorDailyStats.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
+
+
+def get_first_day():
+    """
+    returns the day the next rollup starts from, the day of the last rollup so late
+    events of that day are counted, or the day of the first event on the first rollup
+    :return:
+    """
+    from authors.apps.articles.models import ArticleDailyStats, Comments, Rating
+
+    last = ArticleDailyStats.objects.order_by("-date").values_list("date", flat=True).first()
+    if last is not None:
+        return last
+
+    firsts = [queryset.order_by(field).values_list(field, flat=True).first()
+              for queryset, field in ((Comments.objects.all(), "created_at"), (Rating.objects.all(), "rated_at"))]
+    firsts = [timezone.localtime(first).date() for first in firsts if first is not None]
+    return min(firsts) if firsts else timezone.localdate()
+
+
+def rollup_stats(since=None, today=None):
+    """
+    updates the daily stats of the articles and the authors
+    :param since: first day to recompute, by default the day of the last rollup
+    :param today:
+    :return: number of article rows and author rows stored
+    """
+    today = today or timezone.localdate()
+    since = min(since or get_first_day(), today)
+    return rollup_articles(since, today), rollup_authors(since, today)
+
+
+def get_author_stats(author, days):
+    """
+    returns the daily stats of an author over the last days, read from the rollups only
+    :param author:
+    :param days:
+    :return: the totals over the days and the stats of every day with activity
+    """
+    from authors.apps.articles.models import AuthorDailyStats
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    rows = list(AuthorDailyStats.objects.filter(author=author, date__gte=since).order_by("date").values(
+        "date", *STATS))
+
+    totals = defaultdict(float)
+    for row in rows:
+        for field in STATS:
+            totals[field] += row[field]
+        row["average_rating"] = round(row.pop("rating_total") / row["ratings"], 2) if row["ratings"] else 0
+
+    summary = {field: int(totals[field]) for field in STATS if field != "rating_total"}
+    summary["average_rating"] = round(totals["rating_total"] / totals["ratings"], 2) if totals["ratings"] else 0
+    return {"since": since, "days": days, "totals": summary, "daily": rows}
@@ -0,0 +1,81 @@
+"""
+tests for the lightweight article list representation
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Comments, Tag
+from authors.apps.articles.tests.test_data import TestData
+from authors.apps.authentication.models import User
+
+
+class Tests(TestCase, TestData):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        self.client = APIClient()
+        self.user = User.objects.create_user(self.user_name, self.user_email, self.password)
+        self.user.is_active = True
+        self.user.is_email_verified = True
+        self.user.save()
+
+        response = self.client.post(
+            "/api/users/login/", {"user": {"email": self.user_email, "password": self.password}},
+            format="json")
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(response.data.get("token")))
+
+        self.tag = Tag.objects.create(tag_name="python")
+
+    def create_articles(self, total):
+        for index in range(total):
+            article = Article.objects.create(
+                author=self.user, title="article {0}".format(index), description="description",
+                body="a long body " * 50)
+            article.tags.add(self.tag)
+            article.likes.add(self.user)
+            Comments.objects.create(article=article, author=self.user, body="a comment")
+
+    def list_articles(self, query=""):
+        response = self.client.get("/api/articles/{0}".format(query))
+        self.assertEqual(response.status_code, 200)
+        return response.json()["articles"]["results"]
+
+    def test_list_omits_large_fields(self):
+        self.create_articles(2)
+        article = self.list_articles()[0]
+
+        self.assertNotIn("body", article)
+        self.assertNotIn("comments", article)
+        self.assertEqual(article["author"], {"username": self.user_name, "avatar": None})
+        self.assertEqual(article["tagList"], ["python"])
+        self.assertEqual(article["likes"], 1)
+        self.assertEqual(article["comments_count"], 1)
+        self.assertEqual(article["read_time_minutes"], 1)
+
+    def test_list_expand(self):
+        self.create_articles(2)
+        article = self.list_articles("?expand=body,comments,author")[0]
+
+        self.assertIn("body", article)
+        self.assertEqual(len(article["comments"]), 1)
+        self.assertEqual(article["author"]["username"], self.user_name)
+        self.assertIn("following", article["author"])
+
+    def test_list_queries_do_not_grow_with_articles(self):
+        self.create_articles(2)
+        with CaptureQueriesContext(connection) as few:
+            self.list_articles()
+
+        self.create_articles(5)
+        with CaptureQueriesContext(connection) as many:
+            self.list_articles()
+
+        self.assertEqual(len(few), len(many))
+        for query in many.captured_queries:
+            self.assertNotIn('"body"', query["sql"])
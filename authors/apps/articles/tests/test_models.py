@@ -51,3 +51,11 @@ class Tests(TestCase):
         """Tests the creation of the Article model with a Tag model added to it"""
         self.article.tags.add(self.tag1, self.tag2)
         self.assertEqual('Django', str(self.article.tags.all()[0]))
+
+    def test_read_time_on_save(self):
+        """Tests the word count and read time are computed when an article is saved"""
+        self.article.body = "word " * 600
+        self.article.save()
+        article = Article.objects.get(pk=self.article.pk)
+        self.assertEqual(article.word_count, 600)
+        self.assertEqual(article.read_time_minutes, 3)
@@ -0,0 +1,134 @@
+"""
+tests for article ranking
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Comments
+from authors.apps.articles import ranking
+from authors.apps.articles.ranking import get_engagement_score, get_hot_score, refresh_scores
+from authors.apps.articles.tests.test_data import TestData
+from authors.apps.authentication.models import User
+
+
+class Tests(TestCase, TestData):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        self.client = APIClient()
+        self.user = User.objects.create_user(self.user_name, self.user_email, self.password)
+        self.user.is_active = True
+        self.user.is_email_verified = True
+        self.user.save()
+
+        self.reader = User.objects.create_user("reader", "reader@sims.andela", self.password)
+        self.reader.is_active = True
+        self.reader.is_email_verified = True
+        self.reader.save()
+
+        response = self.client.post(
+            "/api/users/login/", {"user": {"email": "reader@sims.andela", "password": self.password}},
+            format="json")
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(response.data.get("token")))
+
+        self.old_article = Article.objects.create(
+            author=self.user, title="old article", description="old", body="old body",
+            created_at=timezone.now() - timedelta(days=3))
+        self.new_article = Article.objects.create(
+            author=self.user, title="new article", description="new", body="new body")
+
+    def test_engagement_score(self):
+        self.assertEqual(get_engagement_score(), 0)
+        self.assertGreater(get_engagement_score(likes=1), get_engagement_score(dislikes=1))
+        self.assertGreater(get_engagement_score(ratings=2, average_rating=5), 0)
+        self.assertLess(get_engagement_score(ratings=2, average_rating=1), 0)
+
+    def test_hot_score_decays_with_age(self):
+        now = timezone.now()
+        fresh = get_hot_score(10, now, now)
+        stale = get_hot_score(10, now - timedelta(days=1), now)
+        self.assertGreater(fresh, stale)
+        self.assertGreater(stale, 0)
+
+    def test_like_updates_scores(self):
+        response = self.client.post("/api/articles/{0}/like/".format(self.old_article.slug))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        article = Article.objects.get(pk=self.old_article.pk)
+        self.assertGreater(article.engagement_score, 0)
+        self.assertGreater(article.hot_score, 0)
+
+    def test_list_ordering(self):
+        self.old_article.likes.add(self.reader)
+        self.old_article.likes.add(self.user)
+        self.new_article.likes.add(self.reader)
+        refresh_scores()
+
+        response = self.client.get("/api/articles/?ordering=top")
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["articles"]["results"]
+        self.assertEqual(results[0]["slug"], self.old_article.slug)
+
+        response = self.client.get("/api/articles/?ordering=hot")
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["articles"]["results"]
+        self.assertEqual(results[0]["slug"], self.new_article.slug)
+
+    def test_list_invalid_ordering(self):
+        response = self.client.get("/api/articles/?ordering=random")
+        self.assertEqual(response.status_code, 400)
+
+    def test_refresh_command(self):
+        self.new_article.likes.add(self.reader)
+        call_command("refresh_article_scores", stdout=StringIO())
+        self.assertGreater(Article.objects.get(pk=self.new_article.pk).hot_score, 0)
+        self.assertEqual(Article.objects.get(pk=self.old_article.pk).hot_score, 0)
+
+    def test_comment_updates_scores(self):
+        response = self.client.post(
+            "/api/articles/{0}/comment/".format(self.new_article.slug),
+            data=json.dumps({"comment": {"body": "nice one"}}), content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(Article.objects.get(pk=self.new_article.pk).engagement_score, 0)
+
+    def scores(self, article):
+        return Article.objects.values_list("engagement_score", "hot_score").get(pk=article.pk)
+
+    def test_events_update_scores_incrementally(self):
+        slug = self.old_article.slug
+        self.client.post("/api/articles/{0}/like/".format(slug))
+        self.client.post("/api/articles/{0}/dislike/".format(slug))
+        self.client.post("/api/articles/{0}/favorite/".format(slug))
+        self.client.post("/api/articles/{0}/comment/".format(slug),
+                         data=json.dumps({"comment": {"body": "nice one"}}), content_type='application/json')
+        self.client.post("/api/articles/{0}/comment/".format(slug),
+                         data=json.dumps({"comment": {"body": "again"}}), content_type='application/json')
+        self.client.delete("/api/articles/comment/{0}/".format(Comments.objects.filter(article=self.old_article).order_by("pk").first().pk))
+        incremental = self.scores(self.old_article)
+        self.assertEqual(incremental[0], get_engagement_score(dislikes=1, favorites=1, comments=1))
+
+        refresh_scores([self.old_article.pk])
+        refreshed = self.scores(self.old_article)
+        self.assertAlmostEqual(incremental[0], refreshed[0])
+        self.assertAlmostEqual(incremental[1], refreshed[1], places=6)
+
+    def test_refresh_writes_in_batches(self):
+        for index in range(3):
+            Article.objects.create(author=self.user, title="batch {0}".format(index), description="batch",
+                                   body="batch body").likes.add(self.reader)
+
+        # a grouped count per kind of engagement, the rated articles, the articles and an UPDATE per batch
+        with mock.patch.object(ranking, "REFRESH_BATCH_SIZE", 2), self.assertNumQueries(6 + 3 + 2):
+            self.assertEqual(refresh_scores(), 5)
+        self.assertEqual(Article.objects.filter(engagement_score=get_engagement_score(likes=1)).count(), 3)
@@ -0,0 +1,121 @@
+"""
+tests for rating writes and the rating totals stored on articles
+"""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Rating
+from authors.apps.articles.ranking import refresh_scores
+from authors.apps.articles.ratings import rate, resync_ratings
+from authors.apps.authentication.models import User
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        self.client = APIClient()
+        self.author = User.objects.create_user("rated", "rated@sims.andela", "password123")
+        self.readers = []
+        for index in range(2):
+            user = User.objects.create_user("rater{0}".format(index), "rater{0}@sims.andela".format(index),
+                                            "password123")
+            user.is_active = user.is_email_verified = True
+            user.save()
+            self.readers.append(user)
+        self.article = Article.objects.create(author=self.author, title="Rated", description="Description",
+                                              body="Body")
+
+    def post_rating(self, score, user=None, slug=None):
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format((user or self.readers[0]).token))
+        return self.client.post("/api/articles/{0}/rate/".format(slug or self.article.slug),
+                                {"article": {"score": score}}, format="json")
+
+    def test_rating_again_replaces_rating(self):
+        rate(self.article, self.readers[0], 2)
+        rate(self.article, self.readers[0], 4)
+        rate(self.article, self.readers[1], 5)
+
+        self.assertEqual(Rating.objects.filter(article=self.article).count(), 2)
+        self.assertEqual(Rating.objects.get(article=self.article, rated_by=self.readers[0]).score, 4)
+
+        article = Article.objects.get(pk=self.article.pk)
+        self.assertEqual((article.ratings_count, article.ratings_total), (2, Decimal("9.00")))
+        self.assertEqual(article.average_rating, 4.5)
+        self.assertEqual((self.article.ratings_count, self.article.ratings_total), (2, Decimal("9.00")))
+
+    def test_rating_again_keeps_rating_date(self):
+        rated_at = timezone.now() - timedelta(days=3)
+        rate(self.article, self.readers[0], 2, now=rated_at)
+        self.assertEqual(rate(self.article, self.readers[0], 4).rated_at, rated_at)
+        self.assertEqual(Rating.objects.get(article=self.article, rated_by=self.readers[0]).rated_at, rated_at)
+
+    def test_rating_without_upsert(self):
+        with mock.patch("authors.apps.articles.ratings.has_upsert", return_value=False):
+            rate(self.article, self.readers[0], 2)
+            rate(self.article, self.readers[0], 5)
+
+        self.assertEqual(Rating.objects.get(article=self.article, rated_by=self.readers[0]).score, 5)
+        self.assertEqual(Article.objects.get(pk=self.article.pk).average_rating, 5.0)
+
+    def test_scores_updated_with_rating(self):
+        rate(self.article, self.readers[0], 5)
+        rate(self.article, self.readers[1], 1)
+        rate(self.article, self.readers[1], 3)
+        rated = Article.objects.values_list("engagement_score", "hot_score").get(pk=self.article.pk)
+
+        refresh_scores([self.article.pk])
+        refreshed = Article.objects.values_list("engagement_score", "hot_score").get(pk=self.article.pk)
+        self.assertAlmostEqual(rated[0], refreshed[0])
+        self.assertAlmostEqual(rated[1], refreshed[1], places=4)
+
+    def test_rate_article(self):
+        response = self.post_rating(4)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rating = response.json()["article"]
+        self.assertEqual((rating["article"], rating["rated_by"], rating["score"], rating["average_rating"]),
+                         (self.article.slug, "rater0", "4.00", 4.0))
+
+        self.assertEqual(self.post_rating(2).json()["article"]["average_rating"], 2.0)
+        self.assertEqual(self.post_rating(5, user=self.readers[1]).json()["article"]["average_rating"], 3.5)
+
+    def test_rate_article_queries(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(self.readers[0].token))
+        self.post_rating(3)
+
+        # user, article, lock, previous rating, upsert, totals, and the savepoint of the transaction
+        with self.assertNumQueries(8):
+            self.assertEqual(self.post_rating(4).status_code, status.HTTP_200_OK)
+
+    def test_invalid_ratings(self):
+        response = self.post_rating(7)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["errors"]["score"],
+                         ["Score value must not go below `0` and not go beyond `5`"])
+
+        self.assertEqual(self.post_rating(3, user=self.author).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post_rating(3, slug="missing").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Rating.objects.exists())
+
+    def test_totals_resynced(self):
+        Rating.objects.bulk_create([Rating(article=self.article, rated_by=reader, score=score)
+                                    for reader, score in zip(self.readers, (1, 4))])
+        self.assertEqual(Article.objects.get(pk=self.article.pk).ratings_count, 0)
+
+        self.assertEqual(resync_ratings(), 1)
+        self.assertEqual(Article.objects.get(pk=self.article.pk).average_rating, 2.5)
+
+        Rating.objects.all().delete()
+        call_command("refresh_article_scores", stdout=StringIO())
+        self.assertEqual(Article.objects.get(pk=self.article.pk).ratings_count, 0)
@@ -0,0 +1,94 @@
+"""
+tests for related articles
+"""
+from io import StringIO
+from math import log2
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, RelatedArticle, Tag
+from authors.apps.articles.related import get_similarities, refresh_related
+from authors.apps.authentication.models import User
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        self.client = APIClient()
+        self.readers = []
+        for index in range(3):
+            user = User.objects.create_user("reader{0}".format(index), "reader{0}@sims.andela".format(index),
+                                            "password123")
+            user.is_active = user.is_email_verified = True
+            user.save()
+            self.readers.append(user)
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(self.readers[0].token))
+
+        self.articles = [Article.objects.create(author=self.readers[0], title="Article {0}".format(index),
+                                                description="Description", body="Body")
+                         for index in range(4)]
+        dragons, trains = Tag.objects.create(tag_name="dragons"), Tag.objects.create(tag_name="trains")
+        first, second, third, fourth = self.articles
+        first.tags.add(dragons, trains)
+        second.tags.add(dragons, trains)
+        third.tags.add(dragons)
+        # only liked along with the first article, by two readers
+        first.likes.add(*self.readers[:2])
+        fourth.likes.add(*self.readers[:2])
+        for reader in self.readers[1:]:
+            reader.userprofile.favorites.add(first, third)
+
+    def get_related(self, article):
+        response = self.client.get("/api/articles/{0}/related/".format(article.slug))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["slug"] for item in response.json()["articles"]]
+
+    def test_similarities(self):
+        scores = get_similarities([(1.0, [1, 2, 3]), (0.5, [1, 2]), (2.0, [4])])
+
+        self.assertAlmostEqual(scores[1][2], 1.0 / 2 + 0.5 / log2(3))
+        self.assertAlmostEqual(scores[3][1], 1.0 / 2)
+        self.assertNotIn(4, scores)
+        self.assertNotIn(1, scores[1])
+
+    def test_related_articles(self):
+        self.assertEqual(refresh_related(), 8)
+        first, second, third, fourth = self.articles
+
+        # the third article shares a tag and two favorites, the second two tags, the fourth two likes
+        self.assertEqual(self.get_related(first), [third.slug, second.slug, fourth.slug])
+        self.assertEqual(self.get_related(fourth), [first.slug])
+
+        response = self.client.get("/api/articles/{0}/related/".format(fourth.slug))
+        self.assertEqual(response.json()["articles"][0]["likes"], 2)
+
+    def test_related_articles_read_in_constant_queries(self):
+        refresh_related()
+        with self.assertNumQueries(5):
+            self.get_related(self.articles[0])
+
+    def test_refresh_replaces_related(self):
+        refresh_related()
+        self.articles[3].likes.clear()
+        refresh_related()
+
+        self.assertEqual(self.get_related(self.articles[3]), [])
+
+    def test_limit(self):
+        refresh_related(limit=1)
+        self.assertEqual(RelatedArticle.objects.filter(article=self.articles[0]).count(), 1)
+
+    def test_unknown_article(self):
+        response = self.client.get("/api/articles/unknown/related/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        output = StringIO()
+        call_command("refresh_related_articles", stdout=output)
+        self.assertEqual(output.getvalue().strip(), "Stored 8 related article(s).")
@@ -0,0 +1,128 @@
+"""
+tests for the reading stats rollups
+"""
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, ArticleDailyStats, AuthorDailyStats, Comments, Rating
+from authors.apps.articles.stats import rollup_stats
+from authors.apps.authentication.models import User
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        self.client = APIClient()
+        self.users = []
+        for index in range(3):
+            user = User.objects.create_user("stats{0}".format(index), "stats{0}@sims.andela".format(index),
+                                            "password123")
+            user.is_active = user.is_email_verified = True
+            user.save()
+            self.users.append(user)
+        self.author, self.first_reader, self.second_reader = self.users
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(self.author.token))
+
+        self.article = Article.objects.create(author=self.author, title="Stats", description="Stats", body="Stats")
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def at(self, day):
+        return timezone.make_aware(datetime.combine(day, time(12)))
+
+    def set_views(self, views):
+        Article.objects.filter(pk=self.article.pk).update(views_count=views)
+
+    def stats(self, day, model=ArticleDailyStats):
+        return model.objects.filter(date=day).values(
+            "views", "likes", "favorites", "comments", "ratings", "rating_total").get()
+
+    def roll_up_two_days(self):
+        Comments.objects.create(article=self.article, author=self.first_reader, body="First",
+                                created_at=self.at(self.yesterday))
+        Rating.objects.create(article=self.article, rated_by=self.first_reader, score=4,
+                              rated_at=self.at(self.yesterday))
+        self.article.likes.add(self.first_reader)
+        self.second_reader.userprofile.favorites.add(self.article)
+        self.set_views(3)
+        rollup_stats(today=self.yesterday)
+
+        Comments.objects.create(article=self.article, author=self.second_reader, body="Second",
+                                created_at=self.at(self.today))
+        Rating.objects.create(article=self.article, rated_by=self.second_reader, score=2,
+                              rated_at=self.at(self.today))
+        self.article.likes.add(self.second_reader)
+        self.second_reader.userprofile.favorites.remove(self.article)
+        self.set_views(5)
+        return rollup_stats(today=self.today)
+
+    def test_rollups(self):
+        self.assertEqual(self.roll_up_two_days(), (2, 2))
+
+        self.assertEqual(self.stats(self.yesterday), {
+            "views": 3, "likes": 1, "favorites": 1, "comments": 1, "ratings": 1, "rating_total": 4})
+        self.assertEqual(self.stats(self.today), {
+            "views": 2, "likes": 1, "favorites": -1, "comments": 1, "ratings": 1, "rating_total": 2})
+        self.assertEqual(self.stats(self.today, AuthorDailyStats), self.stats(self.today))
+
+    def test_rollups_are_idempotent(self):
+        self.roll_up_two_days()
+        # the next rollup starts from the last rolled up day
+        self.assertEqual(rollup_stats(today=self.today), (1, 1))
+
+        self.assertEqual(self.stats(self.yesterday)["views"], 3)
+        self.assertEqual(self.stats(self.today)["views"], 2)
+
+    def test_late_events_do_not_count_views_again(self):
+        before_yesterday = self.yesterday - timedelta(days=1)
+        self.set_views(10)
+        rollup_stats(today=before_yesterday - timedelta(days=1))
+        rollup_stats(today=before_yesterday)
+
+        # commented after the rollup of its day, the rollup of that day has no row
+        Comments.objects.create(article=self.article, author=self.first_reader, body="Late",
+                                created_at=self.at(before_yesterday))
+        rollup_stats(today=self.yesterday)
+        rollup_stats(today=self.today)
+
+        self.assertEqual(sum(ArticleDailyStats.objects.values_list("views", flat=True)), 10)
+        self.assertEqual(self.stats(before_yesterday)["comments"], 1)
+
+    def test_quiet_articles_have_no_rows(self):
+        self.assertEqual(rollup_stats(), (0, 0))
+
+    def test_author_stats(self):
+        self.roll_up_two_days()
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/articles/stats/?days=7")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.json()["stats"]
+        self.assertEqual(stats["totals"], {
+            "views": 5, "likes": 2, "favorites": 0, "comments": 2, "ratings": 2, "average_rating": 3.0})
+        self.assertEqual([day["date"] for day in stats["daily"]], [str(self.yesterday), str(self.today)])
+        self.assertEqual(stats["daily"][0]["average_rating"], 4.0)
+
+        # only the stats of the articles of the user
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(self.first_reader.token))
+        self.assertEqual(self.client.get("/api/articles/stats/").json()["stats"]["daily"], [])
+
+    def test_author_stats_days(self):
+        for days in ("0", "366", "week"):
+            response = self.client.get("/api/articles/stats/?days={0}".format(days))
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command(self):
+        Comments.objects.create(article=self.article, author=self.first_reader, body="First")
+        output = StringIO()
+        call_command("rollup_article_stats", "--since", str(self.yesterday), stdout=output)
+        self.assertEqual(output.getvalue().strip(), "Stored 1 article and 1 author daily stats.")
@@ -0,0 +1,100 @@
+"""
+tests for article view counting
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.articles.view_counts import record_view, view_buffer
+from authors.apps.authentication.models import User
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        cache.clear()
+        view_buffer.flush()
+        self.client = APIClient()
+        self.readers = []
+        for index in range(2):
+            user = User.objects.create_user("viewer{0}".format(index), "viewer{0}@sims.andela".format(index),
+                                            "password123")
+            user.is_active = user.is_email_verified = True
+            user.save()
+            self.readers.append(user)
+        self.article = Article.objects.create(author=self.readers[0], title="Viewed", description="Viewed",
+                                              body="Viewed")
+        self.other = Article.objects.create(author=self.readers[0], title="Other", description="Other",
+                                            body="Other")
+
+    def tearDown(self):
+        cache.clear()
+        view_buffer.flush()
+
+    def view(self, reader, article=None):
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(reader.token))
+        response = self.client.get("/api/articles/{0}/".format((article or self.article).slug))
+        return response.json()["article"]["views_count"]
+
+    def views_count(self, article=None):
+        return Article.objects.get(pk=(article or self.article).pk).views_count
+
+    def test_views_counted_once_per_reader(self):
+        self.assertEqual(self.view(self.readers[0]), 1)
+        self.assertEqual(self.view(self.readers[0]), 1)
+        self.assertEqual(self.view(self.readers[1]), 2)
+        self.assertEqual(self.views_count(), 2)
+
+    @override_settings(VIEW_COUNT_DEDUPE_WINDOW=1)
+    def test_views_counted_again_after_the_window(self):
+        self.view(self.readers[0])
+        cache.delete("article_views:seen:{0}:{1}".format(self.article.pk, self.readers[0].pk))
+        self.view(self.readers[0])
+        self.assertEqual(self.views_count(), 2)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=3600, VIEW_COUNT_FLUSH_SIZE=3)
+    def test_views_written_in_batches(self):
+        view_buffer.flush()
+        record_view(self.article, self.readers[0])
+        record_view(self.article, self.readers[1])
+        self.assertEqual(self.views_count(), 0)
+        self.assertEqual(view_buffer.pending(), {self.article.pk: 2})
+
+        # the third view fills the buffer, every article is updated by one query
+        with self.assertNumQueries(1):
+            record_view(self.other, self.readers[0])
+        self.assertEqual(view_buffer.pending(), {})
+        self.assertEqual(self.views_count(), 2)
+        self.assertEqual(self.views_count(self.other), 1)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=3600)
+    def test_flush(self):
+        view_buffer.flush()
+        record_view(self.article, self.readers[0])
+        self.assertEqual(view_buffer.flush(), 1)
+        self.assertEqual(view_buffer.flush(), 0)
+        self.assertEqual(self.views_count(), 1)
+
+    def test_failed_flush_keeps_views(self):
+        with mock.patch.object(QuerySet, "update", side_effect=DatabaseError("database is locked")), \
+                self.assertLogs("authors.requests", "WARNING"):
+            self.assertEqual(self.view(self.readers[0]), 1)
+        self.assertEqual(view_buffer.pending(), {self.article.pk: 1})
+
+        self.view(self.readers[1])
+        self.assertEqual(self.views_count(), 2)
+
+    def test_views_count_in_lists(self):
+        self.view(self.readers[0])
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(self.readers[0].token))
+        response = self.client.get("/api/articles/?ordering=new")
+        counts = {article["slug"]: article["views_count"] for article in response.json()["articles"]["results"]}
+        self.assertEqual(counts, {self.article.slug: 1, self.other.slug: 0})
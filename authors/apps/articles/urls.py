@@ -8,7 +8,8 @@ from rest_framework.routers import DefaultRouter
 from authors.apps.articles.views import (FavoriteArticlesAPIView,
                                          ArticleViewSet, TagViewSet, RatingsView, ArticleReportView,
                                          CommentsView, RepliesView,
-                                         DislikeOrUndislikeAPIView, LikeOrUnlikeAPIView)
+                                         DislikeOrUndislikeAPIView, LikeOrUnlikeAPIView,
+                                         RelatedArticlesAPIView, AuthorStatsAPIView)
 
 
 urlpatterns = [
@@ -27,10 +28,12 @@ urlpatterns = [
     path("<slug>/rate/", RatingsView.as_view()),
 
     path("reports/", ArticleReportView.as_view()),
+    path("stats/", AuthorStatsAPIView.as_view()),
     path("reports/<slug>/", ArticleReportView.as_view()),
 
     path("<slug>/like/", LikeOrUnlikeAPIView.as_view()),
     path("<slug>/dislike/", DislikeOrUndislikeAPIView.as_view()),
+    path("<slug>/related/", RelatedArticlesAPIView.as_view()),
 
 ]
 
@@ -8,6 +8,19 @@ from datetime import datetime
 from django.template.defaultfilters import slugify
 
 
+# average adult reading speed, used to estimate article read time
+WORDS_PER_MINUTE = 265
+
+
+def get_words(story):
+    """
+    return the words in a statement or sentence
+    :param story:
+    :return:
+    """
+    return story.split() if story else []
+
+
 def get_common_words(story, max_words=5):
     """
     return a list of common words in a statement or sentence
@@ -15,11 +28,29 @@ def get_common_words(story, max_words=5):
     :param max_words:
     :return:
     """
-    split_it = story.split()
-    counter = Counter(split_it)
+    counter = Counter(get_words(story))
     return dict(counter.most_common(max_words)).keys()
 
 
+def get_word_count(story):
+    """
+    return the number of words in a statement or sentence
+    :param story:
+    :return:
+    """
+    return len(get_words(story))
+
+
+def get_read_time(word_count, words_per_minute=WORDS_PER_MINUTE):
+    """
+    return the estimated minutes needed to read the given number of words
+    :param word_count:
+    :param words_per_minute:
+    :return:
+    """
+    return int(math.ceil(word_count / words_per_minute))
+
+
 def create_unique_number():
     """
     returns a unique random number
@@ -0,0 +1,110 @@
+"""
+Article view counting,
+views are deduplicated per user with the cache and buffered in the process,
+the buffer is written with a single UPDATE every `VIEW_COUNT_FLUSH_INTERVAL`
+seconds or once it holds `VIEW_COUNT_FLUSH_SIZE` views, so hot articles do
+not take a row lock per request.
+
+Flushes run in the request that finds the buffer due, so a process that serves
+no more article views keeps its buffer until it exits. Views still buffered are
+lost when the process is killed without running `atexit` hooks, e.g. on SIGKILL
+or when a dyno restart times out. A failed flush keeps its views in the buffer
+for the next one.
+"""
+import atexit
+import logging
+import threading
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import Case, F, IntegerField, Value, When
+
+logger = logging.getLogger("authors.requests")
+
+
+def seen_key(article_id, viewer):
+    return "article_views:seen:{0}:{1}".format(article_id, viewer)
+
+
+class ViewBuffer:
+    """
+    Holds the views counted by the process and not written yet
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_flush = time()
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def add(self, article_id):
+        with self._lock:
+            self._pending[article_id] = self._pending.get(article_id, 0) + 1
+
+    def flush(self):
+        """
+        adds the buffered views to the articles with one UPDATE
+        :return: number of views written
+        """
+        from authors.apps.articles.models import Article
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time()
+        if not pending:
+            return 0
+
+        increments = Case(*[When(pk=pk, then=Value(views)) for pk, views in pending.items()],
+                          default=Value(0), output_field=IntegerField())
+        try:
+            Article.objects.filter(pk__in=pending).update(views_count=F("views_count") + increments)
+        except DatabaseError:
+            with self._lock:
+                for pk, views in pending.items():
+                    self._pending[pk] = self._pending.get(pk, 0) + views
+            raise
+        return sum(pending.values())
+
+    def maybe_flush(self):
+        """
+        flushes the buffer if the last flush is older than `VIEW_COUNT_FLUSH_INTERVAL` seconds
+        or the buffer is full
+        """
+        interval = getattr(settings, "VIEW_COUNT_FLUSH_INTERVAL", 10)
+        size = getattr(settings, "VIEW_COUNT_FLUSH_SIZE", 100)
+        with self._lock:
+            due = time() - self._last_flush >= interval or sum(self._pending.values()) >= size
+        if not due:
+            return
+        try:
+            self.flush()
+        except DatabaseError:
+            # the reader that triggered the flush still gets the article
+            logger.warning("Flushing %s article views failed", sum(self.pending().values()), exc_info=True)
+
+
+view_buffer = ViewBuffer()
+atexit.register(view_buffer.flush)
+
+
+def record_view(article, user):
+    """
+    counts a view of an article, a user viewing the same article again within
+    `VIEW_COUNT_DEDUPE_WINDOW` seconds is not counted
+    :param article: article instance or primary key
+    :param user: the viewer
+    :return: True when the view was counted
+    """
+    article_id = getattr(article, "pk", article)
+    window = getattr(settings, "VIEW_COUNT_DEDUPE_WINDOW", 1800)
+    if not cache.add(seen_key(article_id, user.pk), 1, window):
+        return False
+
+    view_buffer.add(article_id)
+    view_buffer.maybe_flush()
+    return True
@@ -1,6 +1,7 @@
 """
 Views for articles
 """
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.exceptions import NotFound
@@ -10,11 +11,17 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 from authors.apps.articles.exceptions import (
     NotFoundException, InvalidQueryParameterException)
-from authors.apps.articles.models import Article, Tag, ArticleReport
+from authors.apps.articles.models import Article, Tag, ArticleReport, RelatedArticle
 from authors.apps.articles.renderer import ArticleJSONRenderer, TagJSONRenderer
 from authors.apps.articles.serializers import (RatingSerializer, ArticleReportSerializer,
-                                               ArticleSerializer, PaginatedArticleSerializer, TagSerializer)
+                                               ArticleSerializer, ArticleListSerializer, PaginatedArticleSerializer,
+                                               TagSerializer)
 from authors.apps.articles.permissions import IsSuperuser
+from authors.apps.articles.ranking import ARTICLE_ORDERINGS, record_engagement
+from authors.apps.articles.related import RELATED_PER_ARTICLE
+from authors.apps.articles.stats import get_author_stats
+from authors.apps.articles.view_counts import record_view
+from authors.apps.jobs.queue import enqueue
 
 from .preference_utils import call_preference_helpers
 
@@ -43,6 +50,7 @@ class ArticleViewSet(ViewSet):
         """
         limit = request.query_params.get("limit", 20)
         offset = request.query_params.get("offset", 0)
+        ordering = request.query_params.get("ordering", "new")
 
         def to_int(val):
             """
@@ -58,18 +66,24 @@ class ArticleViewSet(ViewSet):
         except ValueError:
             raise InvalidQueryParameterException()
 
-        queryset = Article.objects.search(request.query_params)
+        if ordering not in ARTICLE_ORDERINGS:
+            raise InvalidQueryParameterException(
+                "`ordering` must be one of: {0}".format(", ".join(sorted(ARTICLE_ORDERINGS))))
 
-        if queryset.count() > 0:
-            queryset = queryset[offset:]
+        queryset = Article.objects.search(request.query_params).order_by(*ARTICLE_ORDERINGS[ordering])
+        queryset = ArticleListSerializer.setup_queryset(queryset, request)
 
-        data = self.serializer_class(queryset, many=True, context={
-                                     'request': request}).data
+        if offset:
+            queryset = queryset[offset:]
 
         pager_class = PaginatedArticleSerializer()
         pager_class.page_size = limit
+        page = pager_class.paginate_queryset(queryset, request)
 
-        return Response(pager_class.get_paginated_response(pager_class.paginate_queryset(data, request)))
+        data = ArticleListSerializer(page, many=True, context={
+                                     'request': request}).data
+
+        return Response(pager_class.get_paginated_response(data))
 
     def retrieve(self, request, slug=None):
         """
@@ -78,8 +92,11 @@ class ArticleViewSet(ViewSet):
         :param request:
         :return:
         """
-        queryset = Article.objects.all()
+        queryset = Article.objects.select_related('author__userprofile')
         article = get_object_or_404(queryset, slug=slug)
+        if record_view(article, request.user):
+            # the reader sees their own view, other buffered views show up once flushed
+            article.views_count += 1
         serializer = self.serializer_class(
             article, context={'request': request})
         return Response(serializer.data)
@@ -96,7 +113,10 @@ class ArticleViewSet(ViewSet):
             data=article, context={'request': request})
         serializer.tags = article.get("tags", [])
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        # the job is committed with the article, never without it
+        with transaction.atomic():
+            serializer.save()
+            enqueue('authors.apps.notifications.notify.fan_out_article', serializer.instance.pk)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -157,12 +177,11 @@ class RatingsView(APIView):
         :param slug:
         :param request:
         """
-        data = self.serializer_class.update_request_data(
-            request.data.get("article", {}), slug, request.user)
+        article = self.serializer_class.get_rated_article(slug, request.user)
 
-        serializer = self.serializer_class(data=data)
+        serializer = self.serializer_class(data=request.data.get("article", {}))
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        serializer.save(article=article, rated_by=request.user)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -188,6 +207,7 @@ class FavoriteArticlesAPIView(APIView):
         profile.favorite(article)
         article.favorites_count += 1
         article.save()
+        record_engagement(article, favorites=1)
 
         serializer = self.serializer_class(article, context=serializer_context)
 
@@ -209,12 +229,53 @@ class FavoriteArticlesAPIView(APIView):
         profile.unfavorite(article)
         article.favorites_count = article.favorites_count - 1 if article.favorites_count > 0 else 0
         article.save()
+        record_engagement(article, favorites=-1)
 
         serializer = self.serializer_class(article, context=serializer_context)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class RelatedArticlesAPIView(APIView):
+    """
+    returns the articles related to an article, best first,
+    as stored by the `refresh_related_articles` command
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, slug=None):
+        article_id = Article.objects.filter(slug=slug).values_list("pk", flat=True).first()
+        if article_id is None:
+            raise NotFound('An article with this slug was not found.')
+
+        related = list(RelatedArticle.objects.filter(article_id=article_id).order_by(
+            "-score", "-related_id").values_list("related_id", flat=True)[:RELATED_PER_ARTICLE])
+        articles = ArticleListSerializer.setup_queryset(Article.objects.filter(pk__in=related), request)
+        articles = sorted(articles, key=lambda article: related.index(article.pk))
+
+        data = ArticleListSerializer(articles, many=True, context={'request': request}).data
+        return Response({"articles": data}, status=status.HTTP_200_OK)
+
+
+class AuthorStatsAPIView(APIView):
+    """
+    returns the daily reading stats of the articles of the user over the last `days` days,
+    as rolled up by the `rollup_article_stats` command
+    """
+    permission_classes = (IsAuthenticated,)
+    MAX_DAYS = 365
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get("days", 30))
+        except ValueError:
+            raise InvalidQueryParameterException("`days` must be a number of days.")
+        if not 0 < days <= self.MAX_DAYS:
+            raise InvalidQueryParameterException("`days` must be between 1 and {0}.".format(self.MAX_DAYS))
+
+        return Response({"stats": get_author_stats(request.user, days)}, status=status.HTTP_200_OK)
+
+
 class TagViewSet(viewsets.ModelViewSet):
     """Handles creating, reading, updating and deleting tags"""
     queryset = Tag.objects.all()
@@ -280,7 +341,7 @@ class ArticleReportView(APIView):
 
                 article = ArticleSerializer.get_article_object(slug)
                 article_reports = ArticleReport.objects.filter(
-                    article=article.id)
+                    article=article.id).order_by('-reported_at')
                 serializer = self.serializer_class(article_reports, many=True)
                 return Response({"reports": serializer.data}, status=status.HTTP_200_OK)
 
@@ -6,7 +6,9 @@ from rest_framework.views import APIView
 
 from authors.apps.articles.exceptions import NotFoundException
 from authors.apps.articles.models import Comments, Article, Replies
+from authors.apps.articles.ranking import record_engagement
 from authors.apps.articles.serializers import RepliesSerializer, CommentSerializer
+from authors.apps.notifications.notify import notify_comment
 
 
 def get_object(obj_Class, pk):
@@ -36,6 +38,8 @@ class CommentsView(APIView):
             serializer = CommentSerializer(data=content_data)
             serializer.is_valid(raise_exception=True)
             serializer.save()
+            record_engagement(instance, comments=1)
+            notify_comment(serializer.instance)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except Article.DoesNotExist:
             return Response({"message": "Sorry, this article is not found."}, status=status.HTTP_404_NOT_FOUND)
@@ -66,6 +70,7 @@ class CommentsView(APIView):
             instance = Comments.objects.get(id=Id,)
             if str(instance):
                 instance.delete()
+                record_engagement(instance.article_id, comments=-1)
         except Comments.DoesNotExist:
             raise NotFoundException("Comment  is not found for delete.")
         return Response({"message", "Comment deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
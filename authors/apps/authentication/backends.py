@@ -59,7 +59,8 @@ class JWTAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed(error_message)
 
         try:
-            user = User.objects.get(id=payload['id'])
+            # views read the profile of `request.user` without another query
+            user = User.objects.select_related('userprofile').get(id=payload['id'])
         except User.DoesNotExist:
             error_message = 'No user matching this token was found.'
             raise exceptions.AuthenticationFailed(error_message)
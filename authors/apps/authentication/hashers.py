@@ -0,0 +1,39 @@
+"""
+Password hashers whose cost is read from the settings,
+see `PASSWORD_HASHER`, `PBKDF2_ITERATIONS` and `ARGON2_*` in the settings.
+
+Django rehashes a password when its user logs in and the stored hash was made
+by another hasher or at another cost, so changing the cost needs no migration.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 SHA256 with `PBKDF2_ITERATIONS` iterations,
+    verifies the `pbkdf2_sha256` hashes made by Django's default hasher
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 with `ARGON2_TIME_COST`, `ARGON2_MEMORY_COST` (KiB) and `ARGON2_PARALLELISM`,
+    needs argon2-cffi
+    """
+
+    @property
+    def time_cost(self):
+        return getattr(settings, "ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, "ARGON2_MEMORY_COST", Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, "ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
@@ -0,0 +1,73 @@
+"""
+Measures how many password checks, the bulk of the work of a login,
+one core can do per second at different hasher costs.
+"""
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand, CommandError
+
+# the setting each hasher takes its cost from
+COSTS = {
+    "pbkdf2": ("iterations", "PBKDF2_ITERATIONS"),
+    "argon2": ("time_cost", "ARGON2_TIME_COST"),
+}
+HASHERS = {"pbkdf2": PBKDF2PasswordHasher, "argon2": Argon2PasswordHasher}
+
+
+def time_check(hasher, password, duration):
+    """
+    verifies a password for at least `duration` seconds
+    :param hasher:
+    :param password:
+    :param duration:
+    :return: seconds per check
+    """
+    encoded = hasher.encode(password, hasher.salt())
+    checks, started = 0, perf_counter()
+    while True:
+        hasher.verify(password, encoded)
+        checks += 1
+        elapsed = perf_counter() - started
+        if elapsed >= duration:
+            return elapsed / checks
+
+
+class Command(BaseCommand):
+    help = "Measure password checks (logins) per second per core at different hasher costs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hasher", choices=sorted(HASHERS), default=settings.PASSWORD_HASHER,
+                            help="Defaults to the PASSWORD_HASHER setting.")
+        parser.add_argument("--costs", type=int, nargs="+",
+                            help="PBKDF2 iterations or argon2 time costs to try, defaults to the configured cost.")
+        parser.add_argument("--duration", type=float, default=2.0, help="Seconds spent on each cost.")
+        parser.add_argument("--budget-ms", type=float, default=100.0,
+                            help="Latency a password check may add to a login, in milliseconds.")
+
+    def handle(self, *args, **options):
+        name = options["hasher"]
+        attribute, setting = COSTS[name]
+        hasher = HASHERS[name]()
+        if name == "argon2":
+            hasher.memory_cost, hasher.parallelism = settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM
+            try:
+                hasher._load_library()
+            except ValueError as error:
+                raise CommandError(str(error))
+
+        within_budget = None
+        for cost in options["costs"] or [getattr(settings, setting)]:
+            setattr(hasher, attribute, cost)
+            seconds = time_check(hasher, "benchmark password", options["duration"])
+            self.stdout.write("{0} {1}={2}: {3:.1f} ms per login, {4:.1f} logins/s per core".format(
+                name, attribute, cost, seconds * 1000, 1 / seconds))
+            if seconds * 1000 <= options["budget_ms"]:
+                within_budget = max(cost, within_budget or cost)
+
+        if within_budget is None:
+            self.stdout.write("No cost fits in {0} ms.".format(options["budget_ms"]))
+        else:
+            self.stdout.write("Highest cost within {0} ms: {1}={2}, set {3} to use it.".format(
+                options["budget_ms"], attribute, within_budget, setting))
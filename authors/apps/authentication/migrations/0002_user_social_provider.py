@@ -0,0 +1,42 @@
+# Generated by Django 2.1 on 2026-10-19 01:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def clear_duplicate_social_ids(apps, schema_editor):
+    """
+    social ids used to default to a timestamp, keep the first user of a
+    duplicated one so the unique constraint can be created
+    """
+    User = apps.get_model('authentication', 'User')
+    duplicates = (User.objects.values('social_id').annotate(total=Count('pk'))
+                  .filter(total__gt=1).values_list('social_id', flat=True))
+    for social_id in list(duplicates):
+        users = User.objects.filter(social_id=social_id).order_by('pk')
+        users.exclude(pk=users.first().pk).update(social_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='social_provider',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='social_id',
+            field=models.CharField(blank=True, default=None, max_length=255, null=True),
+        ),
+        migrations.RunPython(clear_duplicate_social_ids, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='user',
+            unique_together={('social_provider', 'social_id')},
+        ),
+    ]
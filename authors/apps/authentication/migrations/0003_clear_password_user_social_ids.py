@@ -0,0 +1,42 @@
+# Generated by Django 2.1 on 2026-10-19 07:00
+
+from datetime import datetime
+
+from django.db import migrations
+
+
+def is_timestamp(social_id):
+    """
+    tells the social ids given by default to every user, a timestamp of their creation
+    such as `20181023101532123456`, from the ids set by a social login
+    """
+    if not social_id or len(social_id) != 20 or not social_id.isdigit():
+        return False
+    try:
+        datetime.strptime(social_id, '%Y%m%d%H%M%S%f')
+    except ValueError:
+        return False
+    return True
+
+
+def clear_password_user_social_ids(apps, schema_editor):
+    """
+    users who signed up with a password kept their timestamp social id and no
+    provider, so a social login took them for a social user of that provider
+    """
+    User = apps.get_model('authentication', 'User')
+    users = User.objects.filter(social_provider='', social_id__isnull=False).values_list('pk', 'social_id')
+    password_users = [pk for pk, social_id in users.iterator() if is_timestamp(social_id)]
+    for start in range(0, len(password_users), 500):
+        User.objects.filter(pk__in=password_users[start:start + 500]).update(social_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_user_social_provider'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_password_user_social_ids, migrations.RunPython.noop),
+    ]
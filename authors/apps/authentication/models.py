@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta
 
 import jwt
@@ -5,9 +6,35 @@ from django.conf import settings
 from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin
 )
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils.functional import cached_property
 
-from authors.apps.social_auth.utils import create_unique_number
+from authors.apps.core.metrics import record_cache_lookup
+
+LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",
+                        "django.core.cache.backends.dummy.DummyCache")
+
+
+def missing_email_key(email):
+    """
+    returns the cache key remembering that no user has this email
+    :param email:
+    :return:
+    """
+    return "users:missing-email:{0}".format(hashlib.sha1(email.encode("utf8")).hexdigest())
+
+
+def get_missing_email_timeout():
+    """
+    returns how long an email without a user is remembered, 0 when the default cache
+    is local to each process: `User.save()` would only forget the email in the process
+    that created the user, the others would keep answering that it has no user
+    :return:
+    """
+    if settings.CACHES["default"]["BACKEND"] in LOCAL_CACHE_BACKENDS:
+        return 0
+    return getattr(settings, "MISSING_EMAIL_CACHE_TIMEOUT", 60)
 
 
 class UserManager(BaseUserManager):
@@ -30,9 +57,8 @@ class UserManager(BaseUserManager):
 
         user = self.model(username=username, email=self.normalize_email(email))
         user.set_password(password)
-        user.save()
 
-        return user
+        return self.save_with_profile(user)
 
     def create_superuser(self, username, email, password):
         """
@@ -51,6 +77,82 @@ class UserManager(BaseUserManager):
 
         return user
 
+    def create_social_user(self, username, email, provider, social_id):
+        """
+        Create and return a `User` signed up with a social login, in a single
+        insert and without hashing a password: they can not log in with one.
+        """
+        user = self.model(username=username, email=self.normalize_email(email),
+                          social_provider=provider, social_id=social_id)
+        user.set_unusable_password()
+
+        return self.save_with_profile(user)
+
+    def save_with_profile(self, user, **profile_fields):
+        """
+        Save a new `User` and create its profile in one transaction, the
+        profile is cached on the user.
+        """
+        UserProfile = self.model._meta.get_field('userprofile').related_model
+        with transaction.atomic(using=self.db):
+            # tells the `post_save` fallback of the profiles app not to create one
+            user._saving_with_profile = True
+            try:
+                user.save(using=self.db)
+            finally:
+                del user._saving_with_profile
+            UserProfile.objects.create(user=user, **profile_fields)
+
+        return user
+
+    def bulk_create_with_profiles(self, users, **profile_fields):
+        """
+        Insert new users, e.g. for imports, and their profiles with a query
+        each. Emails must be normalized already. Returns the users with their
+        profile cached.
+        """
+        UserProfile = self.model._meta.get_field('userprofile').related_model
+        with transaction.atomic(using=self.db):
+            self.bulk_create(users)
+            if any(user.pk is None for user in users):
+                # not every database returns the primary keys of bulk inserts
+                ids = dict(self.filter(email__in=[user.email for user in users]).values_list('email', 'pk'))
+                for user in users:
+                    user.pk, user._state.adding = ids[user.email], False
+
+            UserProfile.objects.bulk_create([UserProfile(user=user, **profile_fields) for user in users])
+            by_id = {user.pk: user for user in users}
+            for profile in UserProfile.objects.filter(user__in=users):
+                by_id[profile.user_id].userprofile = profile
+
+        cache.delete_many([missing_email_key(user.email) for user in users])
+        return users
+
+    def get_by_email(self, email, *fields):
+        """
+        returns the user with this email, or None. Emails without a user are
+        remembered for `MISSING_EMAIL_CACHE_TIMEOUT` seconds when the cache is
+        shared, so repeated guesses do not reach the database.
+        :param email:
+        :param fields: only fetch these columns
+        :return:
+        """
+        timeout = get_missing_email_timeout()
+        if not timeout:
+            return self.only(*fields).filter(email=email).first()
+
+        key = missing_email_key(email)
+        missing = cache.get(key, False)
+        record_cache_lookup("missing_email", missing)
+        if missing:
+            return None
+
+        try:
+            return self.only(*fields).get(email=email)
+        except self.model.DoesNotExist:
+            cache.set(key, True, timeout)
+            return None
+
 
 class User(AbstractBaseUser, PermissionsMixin):
     # Each `User` needs a human-readable unique identifier that we can use to
@@ -84,8 +186,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     # A timestamp representing when this object was last updated.
     updated_at = models.DateTimeField(auto_now=True)
 
-    # user social ID
-    social_id = models.CharField(db_index=False, max_length=255, default=create_unique_number)
+    # The provider (google or facebook) and the id at that provider of users
+    # who signed up with a social login. Users created before the provider was
+    # recorded have an empty provider, other users have no social id.
+    social_provider = models.CharField(max_length=20, blank=True, default='')
+    social_id = models.CharField(max_length=255, null=True, blank=True, default=None)
 
     # More fields required by Django when specifying a custom user model.
 
@@ -98,6 +203,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     # objects of this type.
     objects = UserManager()
 
+    class Meta:
+        # also the index of social logins looking up their user
+        unique_together = (('social_provider', 'social_id'),)
+
     def __str__(self):
         """
         Returns a string representation of this `User`.
@@ -106,11 +215,16 @@ class User(AbstractBaseUser, PermissionsMixin):
         """
         return self.email
 
-    @property
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # the email may have been remembered as missing before this user had it
+        cache.delete(missing_email_key(self.email))
+
+    @cached_property
     def token(self):
         """
         Enable getting access to the token in as though 'token' is an
-        instance variable.
+        instance variable. The token is encoded once per instance.
         """
         return self.generate_token()
 
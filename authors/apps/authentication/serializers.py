@@ -1,15 +1,14 @@
-from django.contrib.auth import authenticate
+from django.http import Http404
 
 from rest_framework import serializers
 import re
 from .models import User
 
-from django.shortcuts import get_object_or_404
-from authors.apps.profiles.models import UserProfile
+from authors.apps.core.instrumentation import TimedSerializerMixin
 from authors.apps.profiles.serializers import UserProfileSerializer
 
 
-class RegistrationSerializer(serializers.ModelSerializer):
+class RegistrationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializers registration requests and creates a new user."""
 
     # Ensure passwords are at least 8 characters long, no longer than 128
@@ -76,7 +75,9 @@ class RegistrationSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)
 
 
-class LoginSerializer(serializers.Serializer):
+class LoginSerializer(TimedSerializerMixin, serializers.Serializer):
+    # the only columns a login reads
+    user_fields = ('id', 'email', 'username', 'password', 'is_active', 'is_email_verified')
 
     email = serializers.CharField(max_length=255)
     username = serializers.CharField(max_length=255, read_only=True)
@@ -117,10 +118,19 @@ class LoginSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 'A password is required to log in.'
             )
-        user = authenticate(username=email, password=password)
+        # Fetch the user once with the columns a login needs and check the
+        # password here, `authenticate` would load the whole row for the same
+        # check.
+        user = User.objects.get_by_email(email, *self.user_fields)
+        if user is None:
+            # hash the password anyway, like `ModelBackend.authenticate`, so
+            # the response time does not tell whether the email is registered
+            User().set_password(password)
+        elif not user.check_password(password):
+            user = None
 
         # If no user was found matching this email/password combination then
-        # `authenticate` will return `None`. Raise an exception in this case.
+        # `user` is `None`. Raise an exception in this case.
         self.check_user(user)
         # The `validate` method should return a dictionary of validated data.
         # This is the data that is passed to the `create` and `update` methods
@@ -132,7 +142,7 @@ class LoginSerializer(serializers.Serializer):
         }
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Handles serialization and deserialization of User objects."""
 
     # Passwords must be at least 8 characters, but no more than 128
@@ -187,7 +197,7 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class InvokePasswordReset(serializers.Serializer):
+class InvokePasswordReset(TimedSerializerMixin, serializers.Serializer):
 
     email = serializers.CharField(max_length=255)
 
@@ -200,25 +210,17 @@ class InvokePasswordReset(serializers.Serializer):
                 'An email address is required.'
             )
 
-        user = get_object_or_404(User, email=email)
-
-        # get user token
-        token = user.token
-
+        # the token only needs the user id
+        user = User.objects.get_by_email(email, 'id')
         if user is None:
-            raise serializers.ValidationError(
-                'A user with this email was not found.'
-            )
-
-        # call send email method here
-        # email_structure(email, token)
+            raise Http404('A user with this email was not found.')
 
         return {
-            'email': token
+            'email': user.token
         }
 
 
-class UsersListSerializer(serializers.ModelSerializer):
+class UsersListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     This class handles the implementation of a custom relational field.
     """
@@ -233,7 +235,6 @@ class UsersListSerializer(serializers.ModelSerializer):
         """
 
         user = super().to_representation(instance)
-        profile = UserProfileSerializer(
-            UserProfile.objects.get(user_id=instance.id), context=self.context).data
+        profile = UserProfileSerializer(instance.userprofile, context=self.context).data
         user['profile'] = profile
         return user
@@ -1,6 +1,13 @@
 """
 This module contains data used by other test modules
 """
+import os
+import tempfile
+
+# a cache shared by processes, like memcached or the database cache of a deployment
+SHARED_CACHES = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                             "LOCATION": os.path.join(tempfile.gettempdir(), "authors-haven-tests")}}
+
 
 class BaseTest():
     """
@@ -1,15 +1,21 @@
 """This module tests the login and registration of a user."""
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
 from django.utils.encoding import force_text
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 
-from django.test import TestCase
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
 from authors.apps.authentication.models import User
 
-from authors.apps.authentication.tests.base_test import BaseTest
+from authors.apps.authentication.tests.base_test import SHARED_CACHES, BaseTest
 
 
 class RegistrationAPIViewTestCase(TestCase, BaseTest):
@@ -195,3 +201,69 @@ class RegistrationAPIViewTestCase(TestCase, BaseTest):
         self.assertEqual(self.response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual('This field may not be blank.',
                          self.response.json()['errors']['password'][0])
+
+
+class LoginFastPathTestCase(TestCase, BaseTest):
+    """Test suite for the queries run by a login."""
+
+    def setUp(self):
+        """Define the test client and other test variables."""
+        BaseTest.__init__(self)
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(self.user_name, self.user_email, self.password)
+        self.user.is_active = True
+        self.user.is_email_verified = True
+        self.user.save()
+
+    def tearDown(self):
+        cache.clear()
+
+    def login(self, email):
+        return self.client.post(
+            "/api/users/login/", {"user": {"email": email, "password": self.password}}, format="json")
+
+    def test_login_fetches_the_user_once(self):
+        """Test a login runs a single query."""
+        with self.assertNumQueries(1):
+            response = self.login(self.user_email)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(self.user.pk, jwt.decode(response.data['token'], settings.SECRET_KEY, algorithms=['HS256'])['id'])
+
+    def test_token_is_encoded_once(self):
+        """Test the token of a user is only encoded once."""
+        self.assertIs(self.user.token, self.user.token)
+
+    def test_unknown_email_still_hashes_password(self):
+        """Test a login with an unknown email takes as long as a wrong password."""
+        with mock.patch("django.contrib.auth.base_user.make_password", wraps=make_password) as hashed:
+            self.assertEqual(status.HTTP_400_BAD_REQUEST, self.login('unknown@sims.andela').status_code)
+        hashed.assert_called_once_with(self.password)
+
+    def test_unknown_email_not_remembered_per_process(self):
+        """Test a cache local to the process does not remember unknown emails."""
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertEqual(status.HTTP_400_BAD_REQUEST, self.login('unknown@sims.andela').status_code)
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_unknown_email_is_remembered(self):
+        """Test unknown emails only reach the database once."""
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, self.login('unknown@sims.andela').status_code)
+        with self.assertNumQueries(0):
+            self.assertEqual(status.HTTP_400_BAD_REQUEST, self.login('unknown@sims.andela').status_code)
+
+        with self.assertNumQueries(0):
+            response = self.client.post(
+                "/api/users/reset/password/", {"user": {"email": 'unknown@sims.andela'}}, format="json")
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_new_user_is_not_remembered_as_unknown(self):
+        """Test an email is forgotten as unknown once a user registers with it."""
+        self.login('new@sims.andela')
+        user = User.objects.create_user('new', 'new@sims.andela', self.password)
+        user.is_email_verified = True
+        user.save()
+
+        self.assertEqual(status.HTTP_200_OK, self.login('new@sims.andela').status_code)
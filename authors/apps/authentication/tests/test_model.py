@@ -1,7 +1,14 @@
 """This module tests the authentication model."""
-from django.test import TestCase
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from authors.apps.authentication.backends import JWTAuthentication
 from authors.apps.authentication.models import User
-from authors.apps.authentication.tests.base_test import BaseTest
+from authors.apps.profiles.models import UserProfile
+from authors.apps.authentication.tests.base_test import SHARED_CACHES, BaseTest
 
 
 class ModelTestCase(TestCase, BaseTest):
@@ -68,3 +75,72 @@ class ModelTestCase(TestCase, BaseTest):
         self.assertTrue(self.user.token)
         self.assertTrue(self.superuser.token)
         self.assertGreater(len(self.user.token), 10)
+
+    def test_profile_created_with_user(self):
+        """
+        Test that the profile is created along with the user and cached on it.
+        """
+        with self.assertNumQueries(0):
+            self.assertEqual(self.user.userprofile.user_id, self.user.pk)
+        self.assertTrue(UserProfile.objects.filter(user=self.superuser).exists())
+
+    def test_profile_created_for_users_saved_directly(self):
+        """
+        Test that users saved without the manager, e.g. from the admin, get a profile.
+        """
+        created = User.objects.create(username="direct", email="direct@sims.andela")
+        saved = User(username="saved", email="saved@sims.andela")
+        saved.save()
+
+        for user in (created, saved):
+            self.assertEqual(UserProfile.objects.get(user=user).pk, user.userprofile.pk)
+        self.assertEqual(UserProfile.objects.count(), User.objects.count())
+
+    def test_user_not_saved_without_profile(self):
+        """
+        Test that the user and its profile are saved in the same transaction.
+        """
+        with mock.patch.object(UserProfile.objects, "create", side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                User.objects.create_user("noprofile", "no@profile.com", "password123")
+
+        self.assertFalse(User.objects.filter(username="noprofile").exists())
+
+    def test_bulk_create_with_profiles(self):
+        """
+        Test that users are imported in bulk along with their profiles.
+        """
+        users = [User(username="bulk{0}".format(index), email="bulk{0}@sims.andela".format(index))
+                 for index in range(3)]
+
+        with CaptureQueriesContext(connection) as queries:
+            users = User.objects.bulk_create_with_profiles(users, bio="Imported")
+
+        self.assertEqual(len([query for query in queries if query["sql"].startswith("INSERT")]), 2)
+
+        for user in users:
+            self.assertEqual(user.userprofile.bio, "Imported")
+            self.assertEqual(UserProfile.objects.get(user_id=user.pk).pk, user.userprofile.pk)
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_bulk_created_emails_not_remembered_as_missing(self):
+        """
+        Test that missing emails are forgotten once users are imported with them.
+        """
+        cache.clear()
+        self.assertIsNone(User.objects.get_by_email("bulk0@sims.andela"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(User.objects.get_by_email("bulk0@sims.andela"))
+
+        User.objects.bulk_create_with_profiles([User(username="bulk0", email="bulk0@sims.andela")])
+        self.assertEqual(User.objects.get_by_email("bulk0@sims.andela").username, "bulk0")
+        cache.clear()
+
+    def test_authentication_loads_profile(self):
+        """
+        Test that the authenticated user comes with its profile.
+        """
+        user, _ = JWTAuthentication().authenticate_credentials(None, self.user.token)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user.userprofile.user_id, self.user.pk)
@@ -0,0 +1,83 @@
+"""This module tests the password hasher policy."""
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.authentication.models import User
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+
+class PasswordHashingTestCase(TestCase):
+    """This class defines the test suite for password hashing."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.email, self.password = "hashing@example.com", "password123"
+
+    def create_user(self):
+        user = User.objects.create_user("hashing", self.email, self.password)
+        user.is_active = user.is_email_verified = True
+        user.save()
+        return user
+
+    def login(self):
+        return self.client.post(
+            "/api/users/login/", {"user": {"email": self.email, "password": self.password}}, format="json")
+
+    def test_preferred_hasher(self):
+        """Test that new passwords are hashed by the configured hasher."""
+        self.assertEqual(settings.PASSWORD_HASHERS[0], settings.PASSWORD_HASHER_CLASSES[settings.PASSWORD_HASHER])
+        self.assertEqual(argon2 is not None, settings.PASSWORD_HASHER == "argon2")
+
+    @override_settings(PASSWORD_HASHERS=["authors.apps.authentication.hashers.ConfigurablePBKDF2PasswordHasher"],
+                       PBKDF2_ITERATIONS=1000)
+    def test_iterations_setting(self):
+        """Test that PBKDF2 uses the configured number of iterations."""
+        user = self.create_user()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+
+    @override_settings(PASSWORD_HASHERS=["authors.apps.authentication.hashers.ConfigurablePBKDF2PasswordHasher"],
+                       PBKDF2_ITERATIONS=1000)
+    def test_rehash_on_login(self):
+        """Test that a password hashed at another cost is rehashed on login."""
+        user = self.create_user()
+
+        with self.settings(PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    @skipUnless(argon2, "argon2-cffi is not installed")
+    @override_settings(PASSWORD_HASHERS=["authors.apps.authentication.hashers.ConfigurableArgon2PasswordHasher",
+                                         "authors.apps.authentication.hashers.ConfigurablePBKDF2PasswordHasher"],
+                       PBKDF2_ITERATIONS=1000, ARGON2_TIME_COST=1)
+    def test_pbkdf2_upgraded_to_argon2(self):
+        """Test that PBKDF2 passwords are rehashed with argon2 on login."""
+        user = self.create_user()
+        user.password = get_hasher("pbkdf2_sha256").encode(self.password, "salt")
+        user.save()
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2$"))
+
+    def test_benchmark_command(self):
+        """Test the password hashing benchmark."""
+        output = StringIO()
+        call_command("benchmark_password_hashing", "--hasher", "pbkdf2", "--costs", "100", "200",
+                     "--duration", "0.01", "--budget-ms", "1000", stdout=output)
+
+        self.assertIn("pbkdf2 iterations=100:", output.getvalue())
+        self.assertIn("Highest cost within 1000.0 ms: iterations=200", output.getvalue())
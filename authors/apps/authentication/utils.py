@@ -16,7 +16,19 @@ def send_password_reset_email(to_email, token, current_site):
                    """.format(current_site, token)
     from_email = os.environ.get('EMAIL_HOST_USER')
     to_email = to_email
-    try:
-        send_mail(subject, message, from_email, [to_email], fail_silently=False,)
-    except Exception as e:
-        return {'email': str(e)}
+    # run as a job, a failure is retried
+    send_mail(subject, message, from_email, [to_email], fail_silently=False,)
+
+
+def send_activation_email(to_email, link):
+    """
+    Sends the account activation link to a new user, run as a job after registration.
+    """
+    send_mail(
+        'Authors Haven account activation.',
+        'Hey there, Thank you for expressing interest in Authors Haven. '
+        'Follow the link to activate your account {}'.format(link),
+        'no-reply@uio.nm',
+        [to_email],
+        fail_silently=False,
+    )
@@ -1,4 +1,4 @@
-from django.core.mail import send_mail
+from django.db import transaction
 from django.utils.encoding import force_text
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework import status
@@ -9,18 +9,21 @@ from rest_framework.views import APIView
 
 from authors.apps.authentication.backends import JWTAuthentication
 from authors.apps.authentication.models import User
-from authors.apps.authentication.utils import send_password_reset_email
+from authors.apps.jobs.queue import enqueue
+from authors.apps.core.throttling import AccountTokenBucketThrottle, IPTokenBucketThrottle, ThrottleFirstMixin
 from .renderers import UserJSONRenderer
 from .serializers import (
     LoginSerializer, RegistrationSerializer, UserSerializer,
     InvokePasswordReset, UsersListSerializer)
 
 
-class RegistrationAPIView(APIView):
+class RegistrationAPIView(ThrottleFirstMixin, APIView):
     # Allow any user (authenticated or not) to hit this endpoint.
     permission_classes = (AllowAny,)
     renderer_classes = (UserJSONRenderer,)
     serializer_class = RegistrationSerializer
+    throttle_classes = (IPTokenBucketThrottle,)
+    throttle_scope = 'register'
 
     def post(self, request):
         user = request.data.get('user', {})
@@ -30,32 +33,31 @@ class RegistrationAPIView(APIView):
         # your own work later on. Get familiar with it.
         serializer = self.serializer_class(data=user)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        user_data = serializer.data
-        uid = force_text(urlsafe_base64_encode(user['email'].encode("utf8")))
-        # Send a user a verification email on successful register.
-        send_mail(
-            'Authors Haven account activation.',
-            'Hey there, Thank you for expressing interest in Authors Haven. '
-            'Follow the link to activate your account {}/api/users/activate_account/{}/{}/'
-            .format(request.get_host(), uid, user_data['token']),
-            'no-reply@uio.nm',
-            [user['email']],
-            fail_silently=False,
-        )
+        # Send a user a verification email on successful register, from a worker
+        # once the user is committed.
+        with transaction.atomic():
+            serializer.save()
+            user_data = serializer.data
+            uid = force_text(urlsafe_base64_encode(user['email'].encode("utf8")))
+            link = '{}/api/users/activate_account/{}/{}/'.format(request.get_host(), uid, user_data['token'])
+            enqueue('authors.apps.authentication.utils.send_activation_email', user['email'], link)
         user_data.update({
             'message': 'A verification link has been sent by mail.',
-            'link': '{}/api/users/activate_account/{}/{}/'.format(request.get_host(), uid, user_data['token'])
+            'link': link
         })
         del user_data['token']
 
         return Response(user_data, status=status.HTTP_201_CREATED)
 
 
-class LoginAPIView(APIView):
+class LoginAPIView(ThrottleFirstMixin, APIView):
     permission_classes = (AllowAny,)
     renderer_classes = (UserJSONRenderer,)
     serializer_class = LoginSerializer
+    # per IP and per account, so a burst against one account is stopped
+    # even when it comes from many addresses
+    throttle_classes = (IPTokenBucketThrottle, AccountTokenBucketThrottle)
+    throttle_scope = 'login'
 
     def post(self, request):
         user = request.data.get('user', {})
@@ -103,6 +105,7 @@ class InvokePasswordResetAPIView(LoginAPIView):
     """
     permission_classes = (AllowAny,)
     serializer_class = InvokePasswordReset
+    throttle_scope = 'password_reset'
 
     def post(self, request):
         user = request.data.get('user', {})
@@ -117,9 +120,9 @@ class InvokePasswordResetAPIView(LoginAPIView):
         serializer = self.serializer_class(data=user)
         serializer.is_valid(raise_exception=True)
 
-        # call send email function
-        send_password_reset_email(
-            user['email'], serializer.data['email'], request.get_host())
+        # sent by a job, a slow mail server does not hold up the request
+        enqueue('authors.apps.authentication.utils.send_password_reset_email',
+                user['email'], serializer.data['email'], request.get_host())
 
         return Response({"message": "Check your email for a link"}, status=status.HTTP_200_OK)
 
@@ -160,7 +163,7 @@ class UsersListAPIView(RetrieveUpdateAPIView):
         """
         This method returns a list of users with their profiles.
         """
-        queryset = User.objects.filter(is_active=True, is_email_verified=True)
+        queryset = User.objects.filter(is_active=True, is_email_verified=True).select_related('userprofile')
         serializer = self.serializer_class(queryset, many=True, context={'request': request})
 
         return Response({'users': serializer.data}, status=status.HTTP_200_OK)
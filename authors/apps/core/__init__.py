@@ -0,0 +1,3 @@
+
+
+default_app_config = 'authors.apps.core.apps.CoreConfig'
@@ -0,0 +1,146 @@
+"""
+Synthetic data generator,
+fills the database with users, profiles, follows, articles, tags, ratings,
+likes, favorites, comments and replies for benchmarks and load tests
+"""
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from authors.apps.articles.models import Article, Comments, Rating, Replies, Tag
+from authors.apps.articles.ranking import refresh_scores
+from authors.apps.articles.ratings import resync_ratings
+from authors.apps.articles.utils import get_read_time, get_word_count
+from authors.apps.authentication.models import User
+from authors.apps.profiles.models import UserProfile
+
+# rows created per unit of scale, per-row counts do not grow with the scale
+SCALE_USERS = 20
+SCALE_TAGS = 10
+ARTICLES_PER_USER = 5
+TAGS_PER_ARTICLE = 3
+FOLLOWS_PER_USER = 5
+FAVORITES_PER_USER = 5
+LIKES_PER_ARTICLE = 5
+DISLIKES_PER_ARTICLE = 1
+RATINGS_PER_ARTICLE = 3
+COMMENTS_PER_ARTICLE = 3
+REPLIES_PER_COMMENT = 1
+
+PASSWORD = "benchmark1"
+
+WORDS = ("dragon", "train", "python", "django", "query", "index", "author", "haven", "story", "write",
+         "read", "fast", "slow", "cache", "table", "row", "column", "join", "scale", "latency")
+
+
+class GeneratedData:
+    """
+    Holds the rows created by `generate`
+    """
+
+    def __init__(self, prefix, users, profiles, tags, articles, comments):
+        self.prefix = prefix
+        self.users = users
+        self.profiles = profiles
+        self.tags = tags
+        self.articles = articles
+        self.comments = comments
+        self.password = PASSWORD
+
+
+def _sample(rng, population, size, exclude=None):
+    candidates = [item for item in population if item != exclude]
+    return rng.sample(candidates, min(size, len(candidates)))
+
+
+def _text(rng, minimum, maximum):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(minimum, maximum)))
+
+
+def create_users(prefix, total, password_hash):
+    """
+    bulk creates active, verified users along with their profiles
+    :param prefix:
+    :param total:
+    :param password_hash:
+    :return: users and profiles, in creation order
+    """
+    users = User.objects.bulk_create_with_profiles([
+        User(username="{0}_user_{1}".format(prefix, index), email="{0}_user_{1}@example.com".format(prefix, index),
+             password=password_hash, is_active=True, is_email_verified=True)
+        for index in range(total)
+    ], bio="Generated user")
+    return users, [user.userprofile for user in users]
+
+
+def generate(scale=1, seed=0, prefix="gen"):
+    """
+    creates a synthetic data set, `scale` multiplies the number of users, articles and tags
+    :param scale:
+    :param seed: the same seed always produces the same data set
+    :param prefix: prefix of the generated usernames, tag names and slugs
+    :return: GeneratedData
+    """
+    rng = random.Random(seed)
+
+    with transaction.atomic():
+        users, profiles = create_users(prefix, SCALE_USERS * scale, make_password(PASSWORD))
+
+        Tag.objects.bulk_create([Tag(tag_name="{0}_tag_{1}".format(prefix, index))
+                                 for index in range(SCALE_TAGS * scale)])
+        tags = list(Tag.objects.filter(tag_name__startswith="{0}_tag_".format(prefix)).order_by("pk"))
+
+        new_articles = []
+        for index in range(len(users) * ARTICLES_PER_USER):
+            body = _text(rng, 50, 1500)
+            word_count = get_word_count(body)
+            new_articles.append(Article(
+                slug="{0}-article-{1}".format(prefix, index), author=users[index % len(users)],
+                title="Generated article {0}".format(index), description=_text(rng, 5, 20), body=body,
+                word_count=word_count, read_time_minutes=get_read_time(word_count)))
+        Article.objects.bulk_create(new_articles)
+        articles = list(Article.objects.filter(slug__startswith="{0}-article-".format(prefix)).order_by("pk"))
+
+        Follow = UserProfile.following.through
+        Follow.objects.bulk_create([
+            Follow(from_userprofile=profile, to_userprofile=followed)
+            for profile in profiles for followed in _sample(rng, profiles, FOLLOWS_PER_USER, exclude=profile)
+        ])
+
+        Favorite = UserProfile.favorites.through
+        Favorite.objects.bulk_create([
+            Favorite(userprofile=profile, article=article)
+            for profile in profiles for article in _sample(rng, articles, FAVORITES_PER_USER)
+        ])
+
+        ArticleTag, Like, Dislike = Article.tags.through, Article.likes.through, Article.dislikes.through
+        tag_rows, like_rows, dislike_rows, rating_rows, comment_rows = [], [], [], [], []
+        for article in articles:
+            tag_rows += [ArticleTag(article=article, tag=tag) for tag in _sample(rng, tags, TAGS_PER_ARTICLE)]
+
+            readers = _sample(rng, users, LIKES_PER_ARTICLE + DISLIKES_PER_ARTICLE, exclude=article.author)
+            like_rows += [Like(article=article, user=user) for user in readers[:LIKES_PER_ARTICLE]]
+            dislike_rows += [Dislike(article=article, user=user) for user in readers[LIKES_PER_ARTICLE:]]
+
+            rating_rows += [Rating(article=article, rated_by=user, score=rng.randint(0, 5))
+                            for user in _sample(rng, users, RATINGS_PER_ARTICLE, exclude=article.author)]
+            comment_rows += [Comments(article=article, author=rng.choice(users), body=_text(rng, 5, 50))
+                             for _ in range(COMMENTS_PER_ARTICLE)]
+
+        ArticleTag.objects.bulk_create(tag_rows)
+        Like.objects.bulk_create(like_rows)
+        Dislike.objects.bulk_create(dislike_rows)
+        Rating.objects.bulk_create(rating_rows)
+        Comments.objects.bulk_create(comment_rows)
+
+        comments = list(Comments.objects.filter(article__in=articles).order_by("pk"))
+        Replies.objects.bulk_create([
+            Replies(comment=comment, author=rng.choice(users), content=_text(rng, 5, 30))
+            for comment in comments for _ in range(REPLIES_PER_COMMENT)
+        ])
+
+        resync_ratings([article.pk for article in articles])
+        refresh_scores([article.pk for article in articles])
+
+    return GeneratedData(prefix, users, profiles, tags, articles, comments)
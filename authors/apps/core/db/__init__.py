@@ -0,0 +1,3 @@
+"""
+Database helpers, a connection pool and the pooled PostgreSQL backend using it
+"""
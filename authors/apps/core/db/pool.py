@@ -0,0 +1,133 @@
+"""
+Connection pool,
+keeps the connections a process opened so requests reuse them instead of
+connecting to the database every time.
+
+At most `max_size` connections are open at once, a thread asking for one while
+all of them are in use waits up to `timeout` seconds. A connection idle for
+more than `health_check_interval` seconds is checked before it is handed out
+and replaced when the database dropped it.
+"""
+import threading
+from time import monotonic
+
+from authors.apps.core.metrics import registry
+
+pool_wait = registry.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection.", ("alias",))
+pool_events = registry.counter(
+    "db_pool_connections_total",
+    "Pooled database connections, by event (created, reused, discarded or timeout).", ("alias", "event"))
+
+
+class PoolTimeout(Exception):
+    """
+    Raised when no connection became free within the timeout of the pool
+    """
+
+
+class ConnectionPool:
+    """
+    A thread safe pool of connections made by `connect`
+    """
+
+    def __init__(self, connect, max_size=10, timeout=10.0, health_check_interval=30.0, check=None,
+                 alias="default"):
+        """
+        :param connect: callable opening a new connection
+        :param max_size: connections open at most
+        :param timeout: seconds to wait for a free connection
+        :param health_check_interval: seconds a connection may be idle before it is checked
+        :param check: callable returning whether a connection still works
+        :param alias: name of the database in the metrics
+        """
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.check = check or (lambda connection: True)
+        self.alias = alias
+        self.size = 0
+        self._idle = []
+        self._condition = threading.Condition()
+
+    def get(self):
+        """
+        returns a free connection, opening one when none is idle and the pool is not full
+        :return:
+        """
+        started = monotonic()
+        while True:
+            with self._condition:
+                while not self._idle and self.size >= self.max_size:
+                    remaining = self.timeout - (monotonic() - started)
+                    if remaining <= 0:
+                        pool_events.inc(alias=self.alias, event="timeout")
+                        raise PoolTimeout("No database connection free after {0} seconds".format(self.timeout))
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    connection, idle_since = self._idle.pop()
+                else:
+                    connection, idle_since = None, None
+                    self.size += 1
+
+            if connection is None:
+                try:
+                    connection = self.connect()
+                except Exception:
+                    self._forget()
+                    raise
+                pool_events.inc(alias=self.alias, event="created")
+                break
+
+            if self._is_healthy(connection, idle_since):
+                pool_events.inc(alias=self.alias, event="reused")
+                break
+            self.discard(connection)
+
+        pool_wait.observe(monotonic() - started, alias=self.alias)
+        return connection
+
+    def _is_healthy(self, connection, idle_since):
+        if monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            return bool(self.check(connection))
+        except Exception:
+            return False
+
+    def put(self, connection):
+        """
+        gives a connection back to the pool, it must not be in a transaction
+        :param connection:
+        """
+        with self._condition:
+            self._idle.append((connection, monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        """
+        closes a broken connection and frees its place in the pool
+        :param connection:
+        """
+        try:
+            connection.close()
+        except Exception:
+            pass
+        pool_events.inc(alias=self.alias, event="discarded")
+        self._forget()
+
+    def _forget(self):
+        with self._condition:
+            self.size -= 1
+            self._condition.notify()
+
+    def close_all(self):
+        """
+        closes the idle connections
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self.discard(connection)
@@ -0,0 +1,74 @@
+"""
+PostgreSQL backend taking its connections from a per process pool, see
+`authors.apps.core.db.pool`. Enable it with `DB_POOL=True`.
+
+Closing a connection, which Django does at the end of every request when
+`CONN_MAX_AGE` is 0, gives it back to the pool instead.
+"""
+import os
+import threading
+
+from django.conf import settings
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from authors.apps.core.db.pool import ConnectionPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _check(connection):
+    if connection.closed:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return True
+
+
+def get_pool(alias, conn_params, connect):
+    """
+    returns the pool of the process for a database, a forked process gets new pools
+    :param alias:
+    :param conn_params:
+    :param connect: callable opening a new connection
+    :return:
+    """
+    key = (os.getpid(), alias, repr(sorted(conn_params.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                connect, max_size=settings.DB_POOL_MAX_SIZE, timeout=settings.DB_POOL_TIMEOUT,
+                health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL, check=_check, alias=alias)
+    return pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The PostgreSQL backend with pooled connections
+    """
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, conn_params, lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        connection = pool.get()
+        self.isolation_level = self.settings_dict['OPTIONS'].get('isolation_level', connection.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias, self.get_connection_params(), None)
+        connection = self.connection
+
+        # closed within an atomic block Django still holds the connection, so it is not shared
+        broken = connection.closed or self.in_atomic_block or (self.errors_occurred and not self.is_usable())
+        if not broken and connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                broken = True
+        if broken:
+            pool.discard(connection)
+        else:
+            pool.put(connection)
@@ -0,0 +1,123 @@
+"""
+Read replica routing,
+reads of the apps in `REPLICA_APPS` go to one of the `REPLICA_DATABASES` while
+a GET or HEAD request is handled, everything else goes to the primary.
+
+Reads go to the primary as well
+- once the request wrote anything, so it reads its own writes,
+- for `REPLICA_PIN_SECONDS` after a request of the same client wrote, so the
+  next requests do not miss writes the replicas did not replay yet,
+- inside a transaction of the primary,
+- when a replica lags more than `REPLICA_MAX_LAG` seconds behind the primary.
+"""
+import logging
+import random
+import threading
+from contextlib import contextmanager
+from time import monotonic
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger("authors.requests")
+
+_local = threading.local()
+# alias -> (checked at, lag in seconds), kept for `REPLICA_LAG_CHECK_INTERVAL` seconds
+_lags = {}
+
+PRIMARY_LAG_SQL = "SELECT 0"
+POSTGRESQL_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+class RoutingState:
+    """
+    Routing of the request handled by a thread
+    """
+
+    def __init__(self, use_replicas=False, pinned=False):
+        self.use_replicas = use_replicas
+        self.pinned = pinned
+        self.wrote = False
+
+
+def get_state():
+    return getattr(_local, "state", None)
+
+
+@contextmanager
+def replica_reads(pinned=False):
+    """
+    lets the reads within the block go to the replicas
+    :param pinned: True to read from the primary anyway
+    :return: the routing state of the block
+    """
+    previous = get_state()
+    _local.state = RoutingState(use_replicas=True, pinned=pinned)
+    try:
+        yield _local.state
+    finally:
+        _local.state = previous
+
+
+def get_replica_lag(alias):
+    """
+    returns how many seconds a replica is behind the primary, measured at most every
+    `REPLICA_LAG_CHECK_INTERVAL` seconds, infinite when the replica cannot be reached
+    :param alias:
+    :return:
+    """
+    checked = _lags.get(alias)
+    if checked is not None and monotonic() - checked[0] < settings.REPLICA_LAG_CHECK_INTERVAL:
+        return checked[1]
+
+    connection = connections[alias]
+    sql = POSTGRESQL_LAG_SQL if connection.vendor == "postgresql" else PRIMARY_LAG_SQL
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            lag = float(cursor.fetchone()[0] or 0)
+    except Exception:
+        logger.warning("Replica %s cannot be reached", alias, exc_info=True)
+        connection.close()
+        lag = float("inf")
+    _lags[alias] = (monotonic(), lag)
+    return lag
+
+
+def reset_replica_lags():
+    _lags.clear()
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of `REPLICA_APPS` to a replica that is not lagging, see the module
+    """
+
+    def db_for_read(self, model, **hints):
+        state = get_state()
+        if state is None or not state.use_replicas or state.pinned or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label not in settings.REPLICA_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        replicas = [alias for alias in settings.REPLICA_DATABASES
+                    if get_replica_lag(alias) <= settings.REPLICA_MAX_LAG]
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = get_state()
+        if state is not None:
+            # read your own writes
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replicas hold the same rows as the primary
+        return True
@@ -1,5 +1,7 @@
 from rest_framework.views import exception_handler
 
+from authors.apps.core.metrics import api_exceptions
+
 def core_exception_handler(exc, context):
     # If an exception is thrown that we don't explicitly handle here, we want
     # to delegate to the default exception handler offered by DRF. If we do
@@ -18,8 +20,12 @@ def core_exception_handler(exc, context):
         # If this exception is one that we can handle, handle it. Otherwise,
         # return the response generated earlier by the default exception 
         # handler.
+        api_exceptions.inc(exception=exception_class, handler='core')
         return handlers[exception_class](exc, context, response)
 
+    # Exceptions DRF does not know about are left to Django, which turns
+    # them into a 500 response.
+    api_exceptions.inc(exception=exception_class, handler='default' if response is not None else 'unhandled')
     return response
 
 def _handle_generic_error(exc, context, response):
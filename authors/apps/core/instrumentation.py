@@ -0,0 +1,171 @@
+"""
+Per-request instrumentation,
+records query counts and time spent in the database, serializers and renderers
+"""
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+from authors.apps.core.metrics import (
+    format_value, http_request_db_duration, http_request_duration, http_request_queries,
+    http_request_render_duration, http_request_serializer_duration, http_requests, registry)
+
+_local = threading.local()
+
+
+class RequestTimings:
+    """
+    Collects the timings of a single request
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.query_count = 0
+        self.durations = {"db": 0.0, "serializer": 0.0, "render": 0.0}
+        self._active = set()
+
+    def record_query(self, execute, sql, params, many, context):
+        """
+        database execute wrapper, counts queries and their duration
+        """
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_count += 1
+            self.durations["db"] += perf_counter() - started
+
+    @contextmanager
+    def measure(self, name):
+        """
+        adds the time spent in the block to `name`,
+        nested blocks of the same name are only counted once
+        :param name:
+        """
+        if name in self._active:
+            yield
+            return
+
+        self._active.add(name)
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.durations[name] = self.durations.get(name, 0.0) + perf_counter() - started
+
+    def start(self, name):
+        """
+        starts timing `name`, for phases that can not be wrapped in a block
+        :param name:
+        """
+        self._active.add(name)
+        self.durations["_" + name] = perf_counter()
+
+    def stop(self, name):
+        """
+        stops timing `name` started with `start`
+        :param name:
+        """
+        started = self.durations.pop("_" + name, None)
+        self._active.discard(name)
+        if started is not None:
+            self.durations[name] = self.durations.get(name, 0.0) + perf_counter() - started
+
+    @property
+    def total(self):
+        return perf_counter() - self.started
+
+    def as_milliseconds(self):
+        """
+        returns the durations in milliseconds, `app` is the time not spent in the other phases
+        :return:
+        """
+        total = self.total
+        durations = {name: value for name, value in self.durations.items() if not name.startswith("_")}
+        app = max(total - sum(durations.values()), 0)
+        durations.update({"app": app, "total": total})
+        return {name: round(value * 1000, 3) for name, value in durations.items()}
+
+
+def get_current_timings():
+    """
+    returns the timings of the request being handled by this thread, if any
+    :return:
+    """
+    return getattr(_local, "timings", None)
+
+
+def set_current_timings(timings):
+    _local.timings = timings
+
+
+@contextmanager
+def measure(name):
+    """
+    adds the time spent in the block to the current request timings
+    :param name:
+    """
+    timings = get_current_timings()
+    if timings is None:
+        yield
+        return
+
+    with timings.measure(name):
+        yield
+
+
+REQUEST_HISTOGRAMS = (
+    ("duration_seconds", http_request_duration),
+    ("db_seconds", http_request_db_duration),
+    ("serializer_seconds", http_request_serializer_duration),
+    ("render_seconds", http_request_render_duration),
+    ("queries", http_request_queries),
+)
+
+
+def observe_request(app, view, method, status_code, timings):
+    """
+    adds the timings of a finished request to the metrics registry
+    :param app:
+    :param view:
+    :param method:
+    :param status_code:
+    :param timings:
+    """
+    durations = timings.durations
+    http_requests.inc(app=app, view=view, method=method, status=status_code)
+    http_request_duration.observe(timings.total, app=app, view=view)
+    http_request_db_duration.observe(durations["db"], app=app, view=view)
+    http_request_serializer_duration.observe(durations["serializer"], app=app, view=view)
+    http_request_render_duration.observe(durations["render"], app=app, view=view)
+    http_request_queries.observe(timings.query_count, app=app, view=view)
+    registry.maybe_flush()
+
+
+def request_summary():
+    """
+    returns the request histograms grouped by view
+    :return:
+    """
+    collected = registry.collect()
+    views = {}
+    for name, histogram in REQUEST_HISTOGRAMS:
+        for (app, view), sample in collected[histogram.name].items():
+            views.setdefault(view, {"app": app})[name] = {
+                "count": sample["count"],
+                "sum": round(sample["sum"], 6),
+                "buckets": {format_value(bound): count for bound, count in histogram.cumulative_buckets(sample)},
+            }
+    return views
+
+
+class TimedSerializerMixin:
+    """
+    Adds the time spent turning instances into data to the `serializer` timing of the request,
+    goes before the DRF base class, nested serializers are only counted once
+    """
+
+    def to_representation(self, instance):
+        with measure("serializer"):
+            return super().to_representation(instance)
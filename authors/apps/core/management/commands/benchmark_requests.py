@@ -0,0 +1,65 @@
+"""
+Measures the latency of a route the way the web processes serve it, closing the
+database connections after every request. Run it with `DB_POOL=False` and with
+`DB_POOL=True` to compare connecting per request with pooled connections.
+"""
+from statistics import mean
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+from authors.apps.authentication.models import User
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the latency of a route and count the database connections it opens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/articles/", help="Route requested.")
+        parser.add_argument("--requests", type=int, default=200, help="Number of requests.")
+        parser.add_argument("--warmup", type=int, default=10, help="Requests sent before measuring.")
+        parser.add_argument("--user", default=None, help="Username of the user the requests are sent as.")
+        parser.add_argument("--host", default=None, help="Host header, by default the first of ALLOWED_HOSTS.")
+
+    def handle(self, *args, **options):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != "*"]
+        client = Client(HTTP_HOST=options["host"] or (hosts[0].lstrip(".") if hosts else "localhost"))
+        headers = {}
+        if options["user"]:
+            headers["HTTP_AUTHORIZATION"] = "Token " + User.objects.get(username=options["user"]).token
+        opened = []
+
+        def count(**kwargs):
+            opened.append(kwargs["connection"].alias)
+
+        for _ in range(options["warmup"]):
+            client.get(options["path"], **headers)
+            close_old_connections()
+
+        durations, statuses = [], set()
+        connection_created.connect(count)
+        try:
+            for _ in range(options["requests"]):
+                started = perf_counter()
+                response = client.get(options["path"], **headers)
+                # the test client keeps the connections open, the request handler would close them here
+                close_old_connections()
+                durations.append((perf_counter() - started) * 1000)
+                statuses.add(response.status_code)
+        finally:
+            connection_created.disconnect(count)
+
+        self.stdout.write("GET {0}: {1} requests, statuses {2}".format(
+            options["path"], len(durations), ", ".join(str(code) for code in sorted(statuses))))
+        self.stdout.write("latency ms: mean {0:.2f}, p50 {1:.2f}, p95 {2:.2f}, p99 {3:.2f}".format(
+            mean(durations), percentile(durations, 0.5), percentile(durations, 0.95), percentile(durations, 0.99)))
+        self.stdout.write("database connections opened: {0}".format(len(opened)))
@@ -0,0 +1,85 @@
+"""
+Runs EXPLAIN on the queries the API runs most and flags the ones scanning a whole
+table. Run it against a database of realistic size, e.g. filled by `generate_data`:
+on small tables PostgreSQL rightly prefers sequential scans.
+"""
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.articles.models import Article, ArticleReport, Comments, Rating
+from authors.apps.authentication.models import User
+from authors.apps.notifications.models import Notification
+from authors.apps.profiles.models import FollowSuggestion, UserProfile
+
+# `Seq Scan on articles_article` (PostgreSQL), `SCAN articles_article` or
+# `SCAN TABLE articles_article` (SQLite), index scans name their index
+SEQUENTIAL_SCAN = re.compile(r"Seq Scan on (\w+)|\bSCAN (?:TABLE )?(\w+)(?!\w| USING)")
+
+
+def get_hot_queries(user, article, profile):
+    """
+    returns the hot queries of the API for a sample user, article and profile
+    :param user:
+    :param article:
+    :param profile:
+    :return: list of (name, queryset)
+    """
+    return [
+        ("article list", Article.objects.order_by("-created_at")[:20]),
+        ("article by slug", Article.objects.filter(slug=article.slug)),
+        ("articles of an author", Article.objects.filter(author=user).order_by("-created_at")[:20]),
+        ("feed", Article.objects.filter(
+            author__userprofile__in=profile.following.all()).order_by("-created_at")[:20]),
+        ("rating of a user", Rating.objects.filter(rated_by=user, article=article)),
+        ("comments of an article", Comments.objects.filter(article=article).order_by("-created_at")),
+        ("reports of an article", ArticleReport.objects.filter(article=article).order_by("-reported_at")),
+        ("unread notifications", Notification.objects.filter(
+            recipient=user, read_at__isnull=True).order_by("-id")[:20]),
+        ("follow suggestions", FollowSuggestion.objects.filter(profile=profile).order_by("-score")[:20]),
+    ]
+
+
+def find_sequential_scans(plan):
+    """
+    returns the tables a query plan reads in full
+    :param plan: output of `QuerySet.explain()`
+    :return:
+    """
+    return sorted({first or second for first, second in SEQUENTIAL_SCAN.findall(plan)})
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the hot queries of the API and flag sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--analyze", action="store_true",
+                            help="Run the queries and show actual timings (PostgreSQL only).")
+        parser.add_argument("--fail-on-scan", action="store_true",
+                            help="Exit with an error when a query scans a whole table.")
+
+    def handle(self, *args, **options):
+        article = Article.objects.exclude(author=None).order_by("pk").first()
+        if article is None:
+            raise CommandError("The database has no articles, run `generate_data` first.")
+        user = User.objects.get(pk=article.author_id)
+        profile = UserProfile.objects.get(user=user)
+
+        explain_options = {"analyze": True} if options["analyze"] else {}
+        flagged = []
+        for name, queryset in get_hot_queries(user, article, profile):
+            plan = queryset.explain(**explain_options)
+            scans = find_sequential_scans(plan)
+            self.stdout.write("== {0}{1}".format(name, " (sequential scan of {0})".format(
+                ", ".join(scans)) if scans else ""))
+            self.stdout.write(plan + "\n")
+            if scans:
+                flagged.append(name)
+
+        if not flagged:
+            self.stdout.write("No sequential scans.")
+            return
+        summary = "Sequential scans in: {0}".format(", ".join(flagged))
+        if options["fail_on_scan"]:
+            raise CommandError(summary)
+        self.stdout.write(summary)
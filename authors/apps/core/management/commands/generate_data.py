@@ -0,0 +1,25 @@
+"""
+Fills the database with synthetic users, articles and engagement,
+see `authors.apps.core.data_generator`.
+"""
+from django.core.management.base import BaseCommand
+
+from authors.apps.core import data_generator
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users, profiles, follows, articles, tags, ratings, likes, comments and replies."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1,
+                            help="Multiplies the number of users ({0}), tags ({1}) and articles.".format(
+                                data_generator.SCALE_USERS, data_generator.SCALE_TAGS))
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, the same seed gives the same data.")
+        parser.add_argument("--prefix", default="gen", help="Prefix of generated usernames, tags and slugs.")
+
+    def handle(self, *args, **options):
+        data = data_generator.generate(scale=options["scale"], seed=options["seed"], prefix=options["prefix"])
+        self.stdout.write("Generated {0} users, {1} tags, {2} articles and {3} comments. "
+                          "Every user's password is `{4}`.".format(
+                              len(data.users), len(data.tags), len(data.articles), len(data.comments),
+                              data.password))
@@ -0,0 +1,364 @@
+"""
+In-process metrics registry,
+counters and histograms exported in the Prometheus text exposition format.
+
+When `METRICS_MULTIPROC_DIR` is set every worker process periodically writes
+its samples to a file in that directory and the exporter sums the samples
+of all the files, so metrics survive gunicorn spreading requests over workers.
+The gunicorn hooks in `gunicorn.conf.py` empty the directory when the server
+starts and merge the file of every worker that exits into `metrics_dead.json`,
+so restarted workers are neither lost nor counted twice.
+"""
+import atexit
+import json
+import os
+import threading
+from time import time
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def format_value(value):
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ('{0}="{1}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+             for name, value in labels)
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """
+    Base class of the metric types, holds one sample per combination of label values
+    """
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError("{0} expects the labels {1}".format(self.name, ", ".join(self.labelnames)))
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._samples.items()}
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(Metric):
+    """
+    A value that only goes up
+    """
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    @staticmethod
+    def merge(first, second):
+        return first + second
+
+    def expose(self, samples):
+        for key, value in sorted(samples.items()):
+            yield "{0}{1} {2}".format(self.name, _format_labels(zip(self.labelnames, key)), format_value(value))
+
+
+class Histogram(Metric):
+    """
+    Observations counted in cumulative buckets, along with their count and sum
+    """
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = {"buckets": [0] * (len(self.buckets) + 1), "count": 0, "sum": 0.0}
+                self._samples[key] = sample
+            sample["buckets"][index] += 1
+            sample["count"] += 1
+            sample["sum"] += value
+
+    @staticmethod
+    def _copy(value):
+        return {"buckets": list(value["buckets"]), "count": value["count"], "sum": value["sum"]}
+
+    @staticmethod
+    def merge(first, second):
+        return {
+            "buckets": [a + b for a, b in zip(first["buckets"], second["buckets"])],
+            "count": first["count"] + second["count"],
+            "sum": first["sum"] + second["sum"],
+        }
+
+    def cumulative_buckets(self, sample):
+        """
+        returns (upper bound, cumulative count) pairs of a sample
+        :param sample:
+        :return:
+        """
+        cumulative, buckets = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), sample["buckets"]):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return buckets
+
+    def expose(self, samples):
+        for key, sample in sorted(samples.items()):
+            labels = list(zip(self.labelnames, key))
+            for bound, count in self.cumulative_buckets(sample):
+                yield "{0}_bucket{1} {2}".format(
+                    self.name, _format_labels(labels + [("le", format_value(bound))]), count)
+            yield "{0}_sum{1} {2}".format(self.name, _format_labels(labels), format_value(sample["sum"]))
+            yield "{0}_count{1} {2}".format(self.name, _format_labels(labels), sample["count"])
+
+
+DEAD_PROCESSES_FILE = "metrics_dead.json"
+
+
+def _is_samples_file(filename):
+    return filename.startswith("metrics_") and filename.endswith(".json")
+
+
+def _read_samples(path):
+    """
+    returns the samples dumped to a file, None when it is missing or half written
+    :param path:
+    :return:
+    """
+    try:
+        with open(path) as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_samples(path, dumped):
+    temporary = path + ".tmp"
+    with open(temporary, "w") as output:
+        json.dump(dumped, output)
+    os.replace(temporary, path)
+
+
+def _merge_samples(first, second):
+    """
+    sums two dumps of samples, without the metrics: histograms are dicts, counters numbers
+    :param first:
+    :param second:
+    :return:
+    """
+    merged = {name: {tuple(key): value for key, value in samples} for name, samples in first.items()}
+    for name, samples in second.items():
+        metric = merged.setdefault(name, {})
+        for key, value in samples:
+            key = tuple(key)
+            current = metric.get(key)
+            if current is None:
+                metric[key] = value
+            else:
+                metric[key] = (Histogram if isinstance(value, dict) else Counter).merge(current, value)
+    return {name: [[list(key), value] for key, value in samples.items()] for name, samples in merged.items()}
+
+
+def mark_process_dead(pid, directory):
+    """
+    merges the samples of a worker process that exited into the dead processes file and removes
+    its own file, so a later process with the same pid starts from zero
+    :param pid:
+    :param directory: the multiprocess directory
+    """
+    path = os.path.join(directory, "metrics_{0}.json".format(pid))
+    dumped = _read_samples(path)
+    if dumped is not None:
+        dead = os.path.join(directory, DEAD_PROCESSES_FILE)
+        _write_samples(dead, _merge_samples(_read_samples(dead) or {}, dumped))
+    for stale in (path, path + ".tmp"):
+        try:
+            os.remove(stale)
+        except FileNotFoundError:
+            pass
+
+
+def clear_multiprocess_dir(directory):
+    """
+    removes the samples of a previous run of the server
+    :param directory: the multiprocess directory
+    """
+    if not os.path.isdir(directory):
+        return
+    for filename in os.listdir(directory):
+        if _is_samples_file(filename) or _is_samples_file(filename[:-len(".tmp")]):
+            os.remove(os.path.join(directory, filename))
+
+
+class Registry:
+    """
+    Holds the metrics of the process and exports them
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError("A metric named {0} is already registered".format(metric.name))
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name):
+        return self._metrics[name]
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+    @staticmethod
+    def multiprocess_dir():
+        # the gunicorn master imports this module for its hooks without configuring django
+        if not settings.configured:
+            return None
+        return getattr(settings, "METRICS_MULTIPROC_DIR", None)
+
+    def _process_file(self, directory):
+        return os.path.join(directory, "metrics_{0}.json".format(os.getpid()))
+
+    def dump(self):
+        """
+        returns the samples of this process in a json serializable form
+        :return:
+        """
+        return {
+            name: [[list(key), value] for key, value in metric.samples().items()]
+            for name, metric in self._metrics.items()
+        }
+
+    def flush(self):
+        """
+        writes the samples of this process to the multiprocess directory
+        """
+        directory = self.multiprocess_dir()
+        if not directory:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        _write_samples(self._process_file(directory), self.dump())
+        self._last_flush = time()
+
+    def maybe_flush(self):
+        """
+        flushes the samples if the last flush is older than `METRICS_FLUSH_INTERVAL` seconds
+        """
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5)
+        if self.multiprocess_dir() and time() - self._last_flush >= interval:
+            self.flush()
+
+    def collect(self):
+        """
+        returns the samples of every metric, summed over all the worker processes
+        :return: dict mapping metric names to their samples
+        """
+        directory = self.multiprocess_dir()
+        if not directory:
+            return {name: metric.samples() for name, metric in self._metrics.items()}
+
+        self.flush()
+        collected = {name: {} for name in self._metrics}
+        for filename in sorted(os.listdir(directory)):
+            dumped = _read_samples(os.path.join(directory, filename)) if _is_samples_file(filename) else None
+            if dumped is None:
+                continue
+
+            for name, samples in dumped.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in samples:
+                    key = tuple(key)
+                    current = collected[name].get(key)
+                    collected[name][key] = value if current is None else metric.merge(current, value)
+        return collected
+
+    def exposition(self):
+        """
+        returns the metrics in the Prometheus text exposition format
+        :return:
+        """
+        lines = []
+        collected = self.collect()
+        for name, metric in sorted(self._metrics.items()):
+            lines.append("# HELP {0} {1}".format(name, metric.documentation))
+            lines.append("# TYPE {0} {1}".format(name, metric.kind))
+            lines.extend(metric.expose(collected.get(name, {})))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+http_requests = registry.counter(
+    "http_requests_total", "Requests handled, by view and response status.", ("app", "view", "method", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Request latency.", ("app", "view"))
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent in the database per request.", ("app", "view"))
+http_request_serializer_duration = registry.histogram(
+    "http_request_serializer_duration_seconds", "Time spent in serializers per request.", ("app", "view"))
+http_request_render_duration = registry.histogram(
+    "http_request_render_duration_seconds", "Time spent rendering the response.", ("app", "view"))
+http_request_queries = registry.histogram(
+    "http_request_db_queries", "SQL queries per request.", ("app", "view"), buckets=QUERY_BUCKETS)
+api_exceptions = registry.counter(
+    "api_exceptions_total", "Exceptions raised by API views, by exception and the handler that formatted them.",
+    ("exception", "handler"))
+cache_requests = registry.counter(
+    "cache_requests_total", "Cache lookups, by cache and result (hit or miss).", ("cache", "result"))
+
+
+def record_cache_lookup(cache, hit):
+    """
+    counts a cache lookup, the hit ratio is hits / (hits + misses)
+    :param cache: name of the cache, e.g. `social_auth`
+    :param hit: True when the value was found
+    """
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
@@ -0,0 +1,145 @@
+"""
+Middleware shared by all the apps
+"""
+import hashlib
+import json
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from authors.apps.core.db.routers import replica_reads
+from authors.apps.core.instrumentation import (
+    RequestTimings, get_current_timings, observe_request, set_current_timings)
+
+logger = logging.getLogger("authors.requests")
+
+
+def get_view_name(request):
+    """
+    returns the app and a label for the view that handled the request,
+    e.g. (`articles`, `ArticleViewSet.list`)
+    :param request:
+    :return:
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "none", "unresolved"
+
+    view_class = getattr(match.func, "cls", None)
+    module = view_class.__module__ if view_class else match.func.__module__
+    parts = module.split(".")
+    app = parts[2] if parts[:2] == ["authors", "apps"] and len(parts) > 2 else parts[0]
+
+    if view_class is None:
+        return app, match._func_path
+
+    actions = getattr(match.func, "actions", None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return app, "{0}.{1}".format(view_class.__name__, action)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the number of queries and the time spent in the database, serializers
+    and renderers for every request. The timings are sent back in a `Server-Timing`
+    header, logged as a structured line and aggregated per view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        set_current_timings(timings)
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.record_query))
+                response = self.get_response(request)
+        finally:
+            set_current_timings(None)
+
+        app, view = get_view_name(request)
+        durations = timings.as_milliseconds()
+        observe_request(app, view, request.method, response.status_code, timings)
+
+        if getattr(settings, "SERVER_TIMING_HEADER", True):
+            response["Server-Timing"] = self.server_timing(durations, timings.query_count)
+
+        logger.info(json.dumps({
+            "event": "request",
+            "method": request.method,
+            "path": request.path,
+            "app": app,
+            "view": view,
+            "status": response.status_code,
+            "queries": timings.query_count,
+            "durations_ms": durations,
+        }, sort_keys=True))
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        called right before a DRF response is rendered
+        """
+        timings = get_current_timings()
+        if timings is not None:
+            timings.start("render")
+            response.add_post_render_callback(lambda rendered: timings.stop("render"))
+        return response
+
+    @staticmethod
+    def server_timing(durations, query_count):
+        """
+        formats the durations as a `Server-Timing` header value
+        :param durations:
+        :param query_count:
+        :return:
+        """
+        entries = []
+        for name in ("db", "serializer", "render", "app", "total"):
+            entry = "{0};dur={1}".format(name, durations.get(name, 0))
+            if name == "db":
+                entry += ';desc="{0} queries"'.format(query_count)
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+def get_pin_key(request):
+    """
+    returns the cache key pinning the client of the request to the primary database,
+    None for a client that sends no token or session
+    :param request:
+    :return:
+    """
+    credentials = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        return None
+    return "replica_pin:" + hashlib.sha256(credentials.encode("utf8")).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets GET and HEAD requests read from the replicas, see `authors.apps.core.db.routers`.
+    A client whose request wrote reads from the primary for the next `REPLICA_PIN_SECONDS`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+
+        key = get_pin_key(request)
+        pinned = request.method not in ("GET", "HEAD") or bool(key and cache.get(key))
+        with replica_reads(pinned=pinned) as state:
+            response = self.get_response(request)
+
+        if state.wrote and key:
+            cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+        return response
@@ -0,0 +1,43 @@
+"""
+tests for the synthetic data generator
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from authors.apps.articles.models import Article, Comments, Rating, Replies
+from authors.apps.authentication.models import User
+from authors.apps.core import data_generator
+
+
+class Tests(TestCase):
+
+    def test_generate(self):
+        data = data_generator.generate(scale=1, seed=3, prefix="test")
+        users = data_generator.SCALE_USERS
+
+        self.assertEqual(User.objects.filter(username__startswith="test_user_").count(), users)
+        self.assertEqual(len(data.profiles), users)
+        self.assertEqual(Article.objects.count(), users * data_generator.ARTICLES_PER_USER)
+        self.assertEqual(Comments.objects.count(), len(data.articles) * data_generator.COMMENTS_PER_ARTICLE)
+        self.assertEqual(Replies.objects.count(), len(data.comments) * data_generator.REPLIES_PER_COMMENT)
+        self.assertFalse(Rating.objects.filter(article__author=data.users[0], rated_by=data.users[0]).exists())
+
+        profile = data.profiles[0]
+        self.assertEqual(profile.following.count(), data_generator.FOLLOWS_PER_USER)
+        self.assertNotIn(profile, profile.following.all())
+        self.assertTrue(data.users[0].check_password(data.password))
+
+    def test_generate_is_deterministic(self):
+        first = data_generator.generate(seed=7, prefix="first")
+        second = data_generator.generate(seed=7, prefix="second")
+
+        self.assertEqual([article.body for article in first.articles],
+                         [article.body for article in second.articles])
+
+    def test_command(self):
+        output = StringIO()
+        call_command("generate_data", "--scale", "1", "--prefix", "cmd", stdout=output)
+
+        self.assertIn("Generated {0} users".format(data_generator.SCALE_USERS), output.getvalue())
@@ -0,0 +1,96 @@
+"""
+tests for the database connection pool
+"""
+import threading
+
+from django.test import SimpleTestCase
+
+from authors.apps.core.db.pool import ConnectionPool, PoolTimeout, pool_events, pool_wait
+
+
+class FakeConnection:
+    opened = 0
+
+    def __init__(self):
+        FakeConnection.opened += 1
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Tests(SimpleTestCase):
+
+    def setUp(self):
+        FakeConnection.opened = 0
+        pool_events.reset()
+        pool_wait.reset()
+
+    def pool(self, **kwargs):
+        options = dict(max_size=2, timeout=0.05, health_check_interval=30, check=lambda connection: not connection.closed)
+        options.update(kwargs)
+        return ConnectionPool(FakeConnection, **options)
+
+    def test_connections_reused(self):
+        pool = self.pool()
+        first = pool.get()
+        pool.put(first)
+
+        self.assertIs(pool.get(), first)
+        self.assertEqual(FakeConnection.opened, 1)
+        self.assertEqual(pool_events.samples(), {("default", "created"): 1, ("default", "reused"): 1})
+        self.assertEqual(pool_wait.samples()[("default",)]["count"], 2)
+
+    def test_size_limited(self):
+        pool = self.pool()
+        pool.get()
+        pool.get()
+
+        with self.assertRaises(PoolTimeout):
+            pool.get()
+        self.assertEqual(pool.size, 2)
+        self.assertEqual(pool_events.samples()[("default", "timeout")], 1)
+
+    def test_waits_for_free_connection(self):
+        pool = self.pool(max_size=1, timeout=5)
+        first = pool.get()
+        threading.Timer(0.05, pool.put, (first,)).start()
+
+        self.assertIs(pool.get(), first)
+        self.assertGreater(pool_wait.samples()[("default",)]["sum"], 0.01)
+
+    def test_broken_idle_connection_replaced(self):
+        pool = self.pool(health_check_interval=0)
+        first = pool.get()
+        pool.put(first)
+        first.closed = True
+
+        second = pool.get()
+        self.assertIsNot(second, first)
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(pool_events.samples()[("default", "discarded")], 1)
+
+    def test_recently_used_connection_not_checked(self):
+        checked = []
+        pool = self.pool(check=checked.append)
+        pool.put(pool.get())
+        pool.get()
+
+        self.assertEqual(checked, [])
+
+    def test_failed_connect_frees_place(self):
+        def connect():
+            raise OSError("database down")
+
+        pool = ConnectionPool(connect, max_size=1, timeout=0)
+        with self.assertRaises(OSError):
+            pool.get()
+        self.assertEqual(pool.size, 0)
+
+    def test_discard_frees_place(self):
+        pool = self.pool(max_size=1)
+        connection = pool.get()
+        pool.discard(connection)
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.get(), connection)
@@ -0,0 +1,52 @@
+"""
+tests for the EXPLAIN of the hot queries and the indexes they rely on
+"""
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from authors.apps.articles.models import Article, Rating
+from authors.apps.authentication.models import User
+from authors.apps.core.management.commands.explain_hot_queries import find_sequential_scans
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        self.author = User.objects.create_user("explained", "explained@sims.andela", "password123")
+        self.reader = User.objects.create_user("reader", "reader@sims.andela", "password123")
+        self.article = Article.objects.create(author=self.author, title="Explained", description="Description",
+                                              body="Body")
+
+    def test_sequential_scans_found(self):
+        self.assertEqual(find_sequential_scans(
+            "Limit\n  ->  Seq Scan on articles_article  (cost=0.00..1.01 rows=1 width=4)"), ["articles_article"])
+        self.assertEqual(find_sequential_scans("3 0 0 SCAN TABLE articles_rating"), ["articles_rating"])
+        self.assertEqual(find_sequential_scans("2 0 0 SCAN articles_rating"), ["articles_rating"])
+        self.assertEqual(find_sequential_scans(
+            "5 0 0 SCAN articles_article USING INDEX articles_created\n"
+            "4 0 0 SEARCH articles_rating USING INDEX articles_rating_uniq (article_id=?)\n"
+            "  ->  Index Scan using articles_author_created on articles_article"), [])
+
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command("explain_hot_queries", "--fail-on-scan", stdout=out)
+
+        self.assertIn("== articles of an author", out.getvalue())
+        self.assertIn("articles_author_created", out.getvalue())
+        self.assertIn("No sequential scans.", out.getvalue())
+
+    def test_needs_articles(self):
+        Article.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command("explain_hot_queries", stdout=StringIO())
+
+    def test_article_rated_once_per_user(self):
+        Rating.objects.create(article=self.article, rated_by=self.reader, score=3)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Rating.objects.create(article=self.article, rated_by=self.reader, score=4)
@@ -0,0 +1,111 @@
+"""
+tests for the metrics registry and the prometheus exporter
+"""
+import json
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from authors.apps.core.metrics import Registry, clear_multiprocess_dir, mark_process_dead, registry
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        self.registry = Registry()
+        self.requests = self.registry.counter("requests_total", "Requests.", ("view",))
+        self.latency = self.registry.histogram("latency_seconds", "Latency.", ("view",), buckets=(0.1, 1))
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_exposition_format(self):
+        self.requests.inc(view="list")
+        self.requests.inc(2, view="list")
+        self.latency.observe(0.05, view="list")
+        self.latency.observe(0.5, view="list")
+
+        lines = self.registry.exposition().splitlines()
+        self.assertIn("# TYPE requests_total counter", lines)
+        self.assertIn('requests_total{view="list"} 3.0', lines)
+        self.assertIn("# TYPE latency_seconds histogram", lines)
+        self.assertIn('latency_seconds_bucket{view="list",le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{view="list",le="1.0"} 2', lines)
+        self.assertIn('latency_seconds_bucket{view="list",le="+Inf"} 2', lines)
+        self.assertIn('latency_seconds_count{view="list"} 2', lines)
+
+    def test_labels_are_required(self):
+        with self.assertRaises(ValueError):
+            self.requests.inc(path="/")
+
+    def test_multiprocess_aggregation(self):
+        self.requests.inc(view="list")
+        self.latency.observe(0.05, view="list")
+
+        # samples written by another worker process
+        other = {"requests_total": [[["list"], 4]],
+                 "latency_seconds": [[["list"], {"buckets": [0, 1, 0], "count": 1, "sum": 0.5}]]}
+        with open(os.path.join(self.directory, "metrics_1.json"), "w") as output:
+            json.dump(other, output)
+
+        with override_settings(METRICS_MULTIPROC_DIR=self.directory):
+            collected = self.registry.collect()
+
+        self.assertEqual(collected["requests_total"][("list",)], 5)
+        self.assertEqual(collected["latency_seconds"][("list",)]["buckets"], [1, 1, 0])
+        self.assertEqual(collected["latency_seconds"][("list",)]["count"], 2)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "metrics_{0}.json".format(os.getpid()))))
+
+    def test_dead_processes_counted_once(self):
+        def write(pid, requests):
+            with open(os.path.join(self.directory, "metrics_{0}.json".format(pid)), "w") as output:
+                json.dump({"requests_total": [[["list"], requests]],
+                           "latency_seconds": [[["list"], {"buckets": [1, 0, 0], "count": 1, "sum": 0.05}]]},
+                          output)
+
+        write(1, 4)
+        mark_process_dead(1, self.directory)
+        # a new worker reusing the pid of the dead one
+        write(1, 2)
+        mark_process_dead(1, self.directory)
+        write(2, 1)
+
+        self.assertEqual(sorted(os.listdir(self.directory)), ["metrics_2.json", "metrics_dead.json"])
+        with override_settings(METRICS_MULTIPROC_DIR=self.directory):
+            collected = self.registry.collect()
+        self.assertEqual(collected["requests_total"][("list",)], 7)
+        self.assertEqual(collected["latency_seconds"][("list",)]["count"], 3)
+
+        clear_multiprocess_dir(self.directory)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_metrics_endpoint(self):
+        registry.reset()
+        client = APIClient()
+        client.post("/api/users/login/", {"user": {"email": "nobody@sims.andela", "password": "nopassword1"}},
+                    format="json")
+
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn('http_requests_total{app="authentication",view="LoginAPIView.post",method="POST",'
+                      'status="400"} 1.0', body)
+        self.assertIn('api_exceptions_total{exception="ValidationError",handler="core"} 1.0', body)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_endpoint_token(self):
+        client = APIClient()
+        self.assertEqual(client.get("/metrics").status_code, 401)
+        self.assertEqual(client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code, 200)
+
+    @override_settings(METRICS_TOKEN=None, TESTING=False)
+    def test_metrics_endpoint_closed_without_token(self):
+        self.assertEqual(APIClient().get("/metrics").status_code, 404)
@@ -0,0 +1,229 @@
+"""
+query count regression guard,
+replays every route of the articles, authentication, profiles and notifications apps at two data sizes
+and compares the number of SQL queries with the budgets in query_budgets.json
+
+Every route needs an entry `"<METHOD> <route>"` in the budget file holding the request to
+replay and the number of queries allowed. A request fails the test when it runs more queries
+than its budget, or when its queries grow with the data unless the entry has a
+`known_n_plus_one` reason. Run with `QUERY_BUDGETS_UPDATE=1` to rewrite the budgets with the
+measured counts.
+"""
+import json
+import os
+import re
+from importlib import import_module
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.encoding import force_text
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import ArticleReport, Comments, Rating, Replies
+from authors.apps.core import data_generator
+from authors.apps.notifications.models import Notification
+
+BUDGETS_FILE = os.path.join(os.path.dirname(__file__), "query_budgets.json")
+
+# the url configurations under test and where they are mounted
+URLCONFS = (
+    ("/api/articles/", "authors.apps.articles.urls"),
+    ("/api/", "authors.apps.authentication.urls"),
+    ("/api/profiles/", "authors.apps.profiles.urls"),
+    ("/api/notifications/", "authors.apps.notifications.urls"),
+)
+
+# rows added to every relation of the replayed objects for the second data size
+GROWTH = 10
+
+
+def get_route(pattern):
+    """
+    returns the readable form of a url pattern, `^(?P<slug>[^/.]+)/$` becomes `<slug>/`
+    :param pattern:
+    :return:
+    """
+    route = re.sub(r"\(\?P<(\w+)>[^)]*\)", r"<\1>", str(pattern))
+    return route.lstrip("^").rstrip("$")
+
+
+def get_routes():
+    """
+    returns the routes of the url configurations under test and the methods their views handle,
+    the format suffix routes and the api root of the router are left out
+    :return: dict mapping routes to sets of methods
+    """
+    routes = {}
+    for prefix, urlconf in URLCONFS:
+        for pattern in import_module(urlconf).urlpatterns:
+            if pattern.name == "api-root" or "(?P<format>" in str(pattern.pattern):
+                continue
+
+            callback = pattern.callback
+            actions = getattr(callback, "actions", None)
+            if actions:
+                methods = {method.upper() for method in actions}
+            else:
+                methods = {method.upper() for method in callback.cls.http_method_names
+                           if hasattr(callback.cls, method) and method not in ("head", "options")}
+            routes.setdefault(prefix + get_route(pattern.pattern), set()).update(methods)
+    return routes
+
+
+def format_data(value, context):
+    """
+    fills the `{placeholders}` of the strings of a request payload
+    :param value:
+    :param context:
+    :return:
+    """
+    if isinstance(value, dict):
+        return {key: format_data(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [format_data(item, context) for item in value]
+    if isinstance(value, str):
+        return value.format(**context)
+    return value
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        with open(BUDGETS_FILE) as source:
+            self.budgets = json.load(source)
+
+    def test_every_route_has_a_budget(self):
+        routes = get_routes()
+        budgeted = {}
+        for key in self.budgets:
+            method, route = key.split(" ", 1)
+            budgeted.setdefault(route, set()).add(method)
+
+        missing = sorted(route for route in routes if route not in budgeted)
+        self.assertFalse(missing, "Routes without a query budget in {0}: {1}".format(
+            os.path.basename(BUDGETS_FILE), ", ".join(missing)))
+
+        unknown = sorted("{0} {1}".format(method, route) for route, methods in budgeted.items()
+                         for method in methods - routes.get(route, set()))
+        self.assertFalse(unknown, "Budgets of routes or methods that do not exist: {0}".format(", ".join(unknown)))
+
+    def create_context(self, data):
+        """
+        prepares the objects the requests are replayed against
+        :param data: the generated data set
+        :return: the values of the path and payload placeholders
+        """
+        user, author, other = data.users[:3]
+        user.is_superuser = user.is_staff = True
+        user.save()
+
+        article, favorited = [article for article in data.articles if article.author == author][:2]
+        own_article = next(article for article in data.articles if article.author == user)
+
+        article.likes.remove(user)
+        article.dislikes.remove(user)
+        Rating.objects.filter(article=article, rated_by=user).delete()
+        user.userprofile.favorites.remove(article)
+        user.userprofile.favorites.add(favorited)
+        user.userprofile.following.add(author.userprofile)
+        user.userprofile.following.remove(other.userprofile)
+
+        comment = Comments.objects.create(article=article, author=user, body="A comment")
+        reply = Replies.objects.create(comment=comment, author=user, content="A reply")
+        ArticleReport.objects.create(article=article, user=author, report_message="Spam")
+        Notification.objects.create(recipient=user, actor=author, article=article,
+                                    verb=Notification.ARTICLE_PUBLISHED)
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(user.token))
+
+        return {
+            "user": user, "author": author, "article_object": article, "comment_object": comment,
+            "article": article.slug, "article_id": article.pk, "favorited": favorited.slug,
+            "own_article": own_article.slug, "comment": comment.pk, "reply": reply.pk, "tag": data.tags[0].pk,
+            "username": user.username, "user_id": user.pk, "email": user.email, "password": data.password,
+            "followed": author.username, "other": other.username, "token": user.token,
+            "uid": force_text(urlsafe_base64_encode(user.email.encode("utf8"))),
+        }
+
+    def grow(self, context):
+        """
+        adds more rows to the tables and to every relation of the replayed objects
+        :param context:
+        """
+        data = data_generator.generate(scale=2, seed=1, prefix="large")
+        article, comment = context["article_object"], context["comment_object"]
+        profiles = [context["user"].userprofile, context["author"].userprofile]
+
+        for reader, profile in zip(data.users[:GROWTH], data.profiles[:GROWTH]):
+            article.likes.add(reader)
+            profile.favorites.add(article)
+            profile.following.add(*profiles)
+            profiles[0].following.add(profile)
+            Rating.objects.create(article=article, rated_by=reader, score=3)
+            Replies.objects.create(comment=comment, author=reader, content="Another reply")
+            new_comment = Comments.objects.create(article=article, author=reader, body="Another comment")
+            Replies.objects.create(comment=new_comment, author=reader, content="Another reply")
+            ArticleReport.objects.create(article=article, user=reader, report_message="Spam")
+            Notification.objects.create(recipient=context["user"], actor=reader, article=article,
+                                        verb=Notification.ARTICLE_COMMENTED)
+        article.tags.add(*data.tags[:GROWTH])
+
+    def replay(self, key, entry, context):
+        """
+        sends the request of a budget entry and rolls back its changes
+        :param key:
+        :param entry:
+        :param context:
+        :return: number of queries run by the request
+        """
+        method = key.split(" ", 1)[0].lower()
+        path = entry["path"].format(**context)
+        client = APIClient() if entry.get("anonymous") else self.client
+
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                if method == "get":
+                    response = client.get(path)
+                else:
+                    response = getattr(client, method)(path, format_data(entry.get("data"), context), format="json")
+            transaction.set_rollback(True)
+
+        self.assertEqual(response.status_code, entry.get("status", 200), "{0} {1}".format(key, response.content[:500]))
+        return len(queries)
+
+    def replay_all(self, context):
+        return {key: self.replay(key, entry, context) for key, entry in sorted(self.budgets.items())
+                if "skip" not in entry}
+
+    def test_query_budgets(self):
+        context = self.create_context(data_generator.generate(scale=1, seed=0, prefix="small"))
+        small = self.replay_all(context)
+        self.grow(context)
+        large = self.replay_all(context)
+
+        if os.environ.get("QUERY_BUDGETS_UPDATE"):
+            for key, queries in large.items():
+                self.budgets[key]["queries"] = queries
+            with open(BUDGETS_FILE, "w") as output:
+                json.dump(self.budgets, output, indent=2, sort_keys=True)
+                output.write("\n")
+
+        errors = []
+        for key, queries in sorted(large.items()):
+            entry = self.budgets[key]
+            if queries > entry["queries"]:
+                errors.append("{0}: {1} queries, the budget is {2}".format(key, queries, entry["queries"]))
+
+            grows = queries > small[key]
+            if grows and not entry.get("known_n_plus_one"):
+                errors.append("{0}: queries grow with the data, {1} then {2}".format(key, small[key], queries))
+            elif entry.get("known_n_plus_one") and not grows:
+                errors.append("{0}: queries no longer grow with the data, remove `known_n_plus_one`".format(key))
+
+        self.assertFalse(errors, "\n".join(errors))
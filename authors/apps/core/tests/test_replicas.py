@@ -0,0 +1,92 @@
+"""
+tests for the read replica routing, the test settings add a second SQLite
+database as the replica, it has the schema but never gets the rows of the primary
+"""
+from time import monotonic
+
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+from authors.apps.core.db import routers
+from authors.apps.core.db.routers import replica_reads, reset_replica_lags
+
+
+class Tests(TransactionTestCase):
+    multi_db = True
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        cache.clear()
+        reset_replica_lags()
+        self.client = APIClient()
+        self.user = User.objects.create_user("replicated", "replicated@sims.andela", "password123")
+        self.user.is_active = self.user.is_email_verified = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(self.user.token))
+        Article.objects.create(author=self.user, title="Primary only", description="Description", body="Body")
+
+    def tearDown(self):
+        cache.clear()
+        reset_replica_lags()
+
+    @staticmethod
+    def count(response):
+        # an empty list is rendered under `article`
+        body = response.json()
+        return (body.get("articles") or body["article"])["count"]
+
+    def test_reads_of_replica_apps_go_to_replica(self):
+        with replica_reads():
+            self.assertEqual(Article.objects.count(), 0)
+            self.assertEqual(User.objects.count(), 1)
+
+    def test_reads_outside_requests_go_to_primary(self):
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_pinned_reads_go_to_primary(self):
+        with replica_reads(pinned=True):
+            self.assertEqual(Article.objects.count(), 1)
+
+    def test_reads_after_write_go_to_primary(self):
+        with replica_reads():
+            Article.objects.create(author=self.user, title="Written", description="Description", body="Body")
+            self.assertEqual(Article.objects.count(), 2)
+
+    def test_lagging_replica_skipped(self):
+        routers._lags["replica"] = (monotonic(), 60.0)
+        with replica_reads():
+            self.assertEqual(Article.objects.count(), 1)
+
+    @override_settings(REPLICA_MAX_LAG=5, REPLICA_LAG_CHECK_INTERVAL=0)
+    def test_replica_lag_checked_again(self):
+        routers._lags["replica"] = (monotonic(), 60.0)
+        with replica_reads():
+            self.assertEqual(Article.objects.count(), 0)
+
+    def test_get_requests_read_from_replica(self):
+        response = self.client.get("/api/articles/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.count(response), 0)
+
+    @override_settings(REPLICA_PIN_SECONDS=10)
+    def test_client_reads_own_writes(self):
+        response = self.client.post("/api/articles/", {"article": {
+            "title": "Fresh", "description": "Description", "body": "Body"}}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.count(self.client.get("/api/articles/")), 2)
+
+        # other clients read from the replica
+        self.client.credentials()
+        self.client.cookies.clear()
+        other = User.objects.create_user("other", "other@sims.andela", "password123")
+        other.is_active = other.is_email_verified = True
+        other.save()
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(other.token))
+        self.assertEqual(self.count(self.client.get("/api/articles/")), 0)
@@ -0,0 +1,77 @@
+"""
+tests for the request metrics middleware
+"""
+from django.test import TestCase
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+
+from authors.apps.authentication.models import User
+from authors.apps.authentication.serializers import UserSerializer
+from authors.apps.core.instrumentation import RequestTimings, request_summary, set_current_timings
+from authors.apps.core.metrics import registry
+
+
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        registry.reset()
+        self.client = APIClient()
+        self.password = "teamiroq1"
+        self.user = User.objects.create_user("iroq", "iroq@sims.andela", self.password)
+        self.user.is_active = True
+        self.user.is_email_verified = True
+        self.user.save()
+        self.admin = User.objects.create_superuser("admin", "admin@sims.andela", self.password)
+        self.admin.is_email_verified = True
+        self.admin.save()
+
+    def login(self, email):
+        response = self.client.post(
+            "/api/users/login/", {"user": {"email": email, "password": self.password}}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION="Token {0}".format(response.data["token"]))
+
+    def test_server_timing_header(self):
+        self.login("iroq@sims.andela")
+        response = self.client.get("/api/articles/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        header = response["Server-Timing"]
+        for name in ("db", "serializer", "render", "app", "total"):
+            self.assertIn("{0};dur=".format(name), header)
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="\d+ queries"')
+
+    def test_repo_serializers_timed(self):
+        timings = RequestTimings()
+        set_current_timings(timings)
+        try:
+            UserSerializer(self.user).data
+        finally:
+            set_current_timings(None)
+
+        self.assertGreater(timings.durations["serializer"], 0)
+        self.assertEqual(serializers.BaseSerializer.data.fget.__module__, "rest_framework.serializers")
+
+    def test_stats_aggregated_per_view(self):
+        self.login("iroq@sims.andela")
+        self.client.get("/api/articles/")
+        self.client.get("/api/articles/")
+
+        stats = request_summary()
+        self.assertEqual(stats["ArticleViewSet.list"]["app"], "articles")
+        self.assertEqual(stats["ArticleViewSet.list"]["duration_seconds"]["count"], 2)
+        self.assertGreater(stats["ArticleViewSet.list"]["queries"]["sum"], 0)
+        self.assertEqual(stats["LoginAPIView.post"]["queries"]["count"], 1)
+
+    def test_metrics_endpoint_requires_admin(self):
+        self.login("iroq@sims.andela")
+        response = self.client.get("/api/metrics/requests/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.login("admin@sims.andela")
+        response = self.client.get("/api/metrics/requests/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("LoginAPIView.post", response.data["views"])
@@ -0,0 +1,114 @@
+"""
+tests for the token bucket throttles
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.authentication.models import User
+from authors.apps.core.throttling import parse_rate
+
+RATES = {"login": "3/min", "login_account": "2/min", "password_reset": "5/min", "password_reset_account": "1/min"}
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_RATES=RATES)
+class Tests(TestCase):
+
+    def setUp(self):
+        """
+        setup tests
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.email, self.password = "throttled@example.com", "password123"
+        user = User.objects.create_user("throttled", self.email, self.password)
+        user.is_active = user.is_email_verified = True
+        user.save()
+
+    def tearDown(self):
+        cache.clear()
+
+    def login(self, email=None, ip="10.0.0.1", **headers):
+        return self.client.post(
+            "/api/users/login/", {"user": {"email": email or self.email, "password": self.password}},
+            format="json", REMOTE_ADDR=ip, **headers)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/min"), (10, 10 / 60))
+        self.assertEqual(parse_rate("3/hour"), (3, 3 / 3600))
+
+    def test_login_throttled_per_account(self):
+        self.assertEqual(self.login(ip="10.0.0.1").status_code, status.HTTP_200_OK)
+        self.assertEqual(self.login(ip="10.0.0.2").status_code, status.HTTP_200_OK)
+
+        response = self.login(ip="10.0.0.3")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+
+        # the account bucket is keyed by the normalized email
+        self.assertEqual(self.login(email=" THROTTLED@example.com").status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_throttled_per_ip(self):
+        for index in range(3):
+            self.login(email="someone{0}@example.com".format(index))
+
+        self.assertEqual(self.login(email="another@example.com").status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login(ip="10.0.0.9").status_code, status.HTTP_200_OK)
+
+    def test_forwarded_for_not_spoofed(self):
+        # the router appends the address of the client to what the client sent
+        for index in range(4):
+            response = self.login(email="someone{0}@example.com".format(index), ip="10.1.0.1",
+                                  HTTP_X_FORWARDED_FOR="192.168.0.{0}, 10.0.0.5".format(index))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        self.assertEqual(self.login(ip="10.1.0.1", HTTP_X_FORWARDED_FOR="10.0.0.6").status_code,
+                         status.HTTP_200_OK)
+
+    def test_bucket_refills(self):
+        with mock.patch("authors.apps.core.throttling.time", return_value=1000.0):
+            self.login()
+            self.login()
+            self.assertEqual(self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # 2/min adds a token every 30 seconds
+        with mock.patch("authors.apps.core.throttling.time", return_value=1031.0):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            self.assertEqual(self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_rejection_skips_database(self):
+        self.login()
+        self.login()
+
+        with self.assertNumQueries(0):
+            response = self.client.post(
+                "/api/users/login/", {"user": {"email": self.email, "password": self.password}},
+                format="json", REMOTE_ADDR="10.0.0.1", HTTP_AUTHORIZATION="Token {0}".format("x.y.z"))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_bucket_expired_while_read(self):
+        self.login()
+        with mock.patch.object(cache, "incr", side_effect=ValueError("Key not found")):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_no_lock_taken(self):
+        with mock.patch.object(cache, "add") as add, mock.patch.object(cache, "delete") as delete:
+            for _ in range(3):
+                self.login()
+        self.assertFalse(add.called or delete.called)
+
+    def test_scopes_have_separate_buckets(self):
+        self.login()
+        self.login()
+
+        response = self.client.post("/api/users/reset/password/", {"user": {"email": self.email}}, format="json")
+        self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
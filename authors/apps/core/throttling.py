@@ -0,0 +1,160 @@
+"""
+Token bucket throttles,
+a rate of `10/min` lets a client burst 10 requests, its bucket then refills
+with one request every 6 seconds.
+
+A bucket is kept in the `THROTTLE_CACHE` cache as the time, in milliseconds, at
+which it will be full again (the GCRA form of a token bucket). Each request adds
+the refill interval with an atomic `cache.incr` and is let through while that
+time is at most a full bucket ahead, so every worker sharing the cache sees the
+same bucket without a lock. `incr` is atomic in memcached and in the local memory
+cache, not in the database cache. Concurrent requests racing on a bucket that
+was full are all let through.
+Views pick their rates with `throttle_scope`, see `THROTTLE_RATES` in the settings.
+"""
+import hashlib
+from math import ceil
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """
+    parses a rate such as `10/min`
+    :param rate:
+    :return: bucket capacity and tokens added per second
+    """
+    requests, period = rate.split("/")
+    capacity = int(requests)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base class of the token bucket throttles, subclasses decide who owns a bucket
+    """
+    scope_suffix = ""
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_bucket_ident(self, request):
+        """
+        returns the identity of the bucket the request takes a token from,
+        None to let the request through
+        :param request:
+        :return:
+        """
+        raise NotImplementedError(".get_bucket_ident() must be overridden")
+
+    def get_rate(self, view):
+        """
+        returns the scope and rate of the view, the rate is None when the view is not throttled
+        :param view:
+        :return:
+        """
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return None, None
+
+        scope += self.scope_suffix
+        return scope, getattr(settings, "THROTTLE_RATES", {}).get(scope)
+
+    def allow_request(self, request, view):
+        if not getattr(settings, "THROTTLE_ENABLED", True):
+            return True
+
+        scope, rate = self.get_rate(view)
+        ident = self.get_bucket_ident(request) if rate else None
+        if ident is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        return self.take_token("throttle:{0}:{1}".format(scope, ident), capacity, refill)
+
+    def take_token(self, key, capacity, refill):
+        """
+        takes a token from the bucket if it has one left
+        :param key:
+        :param capacity:
+        :param refill: tokens added per second
+        :return: True when the bucket had a token
+        """
+        cache = caches[getattr(settings, "THROTTLE_CACHE", "default")]
+        now = int(time() * 1000)
+        interval = int(ceil(1000 / refill))
+        full_in = cache.get(key)
+
+        try:
+            if full_in is None or full_in <= now:
+                raise ValueError("full bucket")
+            full_in = cache.incr(key, interval)
+        except ValueError:
+            # a full bucket, or one that expired since it was read: start it again
+            full_in = now + interval
+            cache.set(key, full_in, self.get_timeout(full_in, now))
+            return True
+
+        excess = full_in - now - capacity * interval
+        if excess > 0:
+            cache.decr(key, interval)
+            self.wait_time = excess / 1000
+            return False
+
+        # a bucket left alone until it is full again is the same as no bucket
+        cache.touch(key, self.get_timeout(full_in, now))
+        return True
+
+    @staticmethod
+    def get_timeout(full_in, now):
+        return int(ceil((full_in - now) / 1000)) + 1
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per client IP address, rates are looked up under the view's `throttle_scope`.
+    The address is the one appended to `X-Forwarded-For` by the last of `NUM_PROXIES`
+    proxies, addresses sent by clients are ignored
+    """
+
+    def get_bucket_ident(self, request):
+        return self.get_ident(request)
+
+
+class AccountTokenBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per account, identified by the email sent in the request body,
+    rates are looked up under the view's `throttle_scope` followed by `_account`
+    """
+    scope_suffix = "_account"
+
+    def get_bucket_ident(self, request):
+        user = request.data.get("user", {}) if hasattr(request.data, "get") else {}
+        email = user.get("email") if hasattr(user, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha1(email.strip().lower().encode("utf8")).hexdigest()
+
+
+class ThrottleFirstMixin:
+    """
+    Checks the throttles before authentication and permissions,
+    so rejecting a request costs a few cache lookups and no database access or password hashing
+    """
+
+    def initial(self, request, *args, **kwargs):
+        self.check_throttles(request)
+        self._throttles_checked = True
+        super().initial(request, *args, **kwargs)
+
+    def check_throttles(self, request):
+        if not getattr(self, "_throttles_checked", False):
+            super().check_throttles(request)
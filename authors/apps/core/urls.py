@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import RequestMetricsAPIView
+
+urlpatterns = [
+    path('requests/', RequestMetricsAPIView.as_view(), name="request_metrics"),
+]
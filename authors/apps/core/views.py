@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authors.apps.core.instrumentation import request_summary
+from authors.apps.core.metrics import registry
+
+
+class RequestMetricsAPIView(APIView):
+    """
+    Returns the per view histograms of request latency, query count,
+    database, serializer and render time.
+    Only accessible to admin users.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response({"views": request_summary()}, status=status.HTTP_200_OK)
+
+
+def metrics_view(request):
+    """
+    Exports all the metrics in the Prometheus text exposition format.
+    Scrapers must send `METRICS_TOKEN` as a bearer token, without a token the
+    endpoint is only served to the test suite. DEBUG is on in the production
+    settings, so it does not open the endpoint.
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if not token:
+        if not getattr(settings, "TESTING", False):
+            return HttpResponse("Not Found\n", status=404, content_type="text/plain")
+    elif request.META.get("HTTP_AUTHORIZATION", "") != "Bearer {0}".format(token):
+        return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+
+    return HttpResponse(registry.exposition(), content_type="text/plain; version=0.0.4; charset=utf-8")
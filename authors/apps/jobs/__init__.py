@@ -0,0 +1,3 @@
+"""
+Database backed job queue running slow side effects outside of requests
+"""
@@ -0,0 +1,29 @@
+"""
+Runs the queued jobs, see `authors.apps.jobs.queue`.
+Run one or more of these next to the web processes.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from authors.apps.jobs.queue import Worker
+
+
+class Command(BaseCommand):
+    help = "Run the queued jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=getattr(settings, "JOB_WORKER_THREADS", 4),
+                            help="Jobs run at the same time.")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Seconds to wait for new jobs when the queue is empty.")
+        parser.add_argument("--burst", action="store_true",
+                            help="Stop once the queue is empty.")
+
+    def handle(self, *args, **options):
+        worker = Worker(threads=options["threads"])
+        self.stdout.write("Worker {0} running with {1} thread(s).".format(worker.name, worker.threads))
+        try:
+            ran = worker.run(poll_interval=options["poll_interval"], burst=options["burst"])
+        except KeyboardInterrupt:
+            return
+        self.stdout.write("Ran {0} job(s).".format(ran))
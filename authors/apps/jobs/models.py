@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A call of a function run by a worker, see `authors.apps.jobs.queue`
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = ((QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed'))
+
+    # dotted path of the function and its arguments in JSON
+    task = models.CharField(max_length=255)
+    arguments = models.TextField(default='{}')
+
+    status = models.CharField(max_length=16, choices=STATUSES, default=QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    last_error = models.TextField(blank=True, default='')
+
+    # the worker running the job and since when
+    locked_by = models.CharField(max_length=255, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # the jobs due next
+        indexes = [models.Index(fields=['status', 'run_at'], name='jobs_due')]
+
+    def __str__(self):
+        return '{0} ({1})'.format(self.task, self.status)
@@ -0,0 +1,174 @@
+"""
+Job queue,
+`enqueue` stores a call of a function in the jobs table and `run_worker` runs
+the stored calls in a thread pool.
+
+A job is written in the transaction of the caller: callers enqueue inside
+`transaction.atomic()` together with the rows the job reads, so workers only see
+the job once those rows are committed and a rolled back request leaves no job.
+Outside a transaction the job is committed right away. Workers
+claim jobs with `SELECT ... FOR UPDATE SKIP LOCKED` where the database supports
+it (PostgreSQL) and with a conditional UPDATE per job otherwise (SQLite). Failed
+jobs are retried with an exponential backoff, up to `max_attempts` runs.
+"""
+import json
+import logging
+import os
+import socket
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import sleep
+
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from authors.apps.jobs.models import Job
+
+logger = logging.getLogger('authors.jobs')
+
+
+def enqueue(task, *args, **kwargs):
+    """
+    queues a call of a function in the current transaction, run right away when `JOBS_EAGER`
+    is set (e.g. in tests)
+    :param task: dotted path of the function, its arguments must be JSON serializable
+    :param args:
+    :param kwargs:
+    :return: the job, None when it ran eagerly
+    """
+    function = import_string(task)
+    arguments = json.dumps({'args': args, 'kwargs': kwargs})
+    if getattr(settings, 'JOBS_EAGER', False):
+        function(*args, **kwargs)
+        return None
+
+    return Job.objects.create(task=task, arguments=arguments,
+                              max_attempts=getattr(settings, 'JOB_MAX_ATTEMPTS', 5))
+
+
+def get_retry_delay(attempts):
+    """
+    returns how long to wait before running a job again after its n-th failed attempt
+    :param attempts:
+    :return:
+    """
+    return timedelta(seconds=getattr(settings, 'JOB_RETRY_DELAY', 10) * 2 ** (attempts - 1))
+
+
+def release_stale_jobs(now=None):
+    """
+    queues again the jobs of workers that died while running them
+    :param now:
+    :return: number of jobs released
+    """
+    now = now or timezone.now()
+    timeout = timedelta(seconds=getattr(settings, 'JOB_LOCK_TIMEOUT', 600))
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timeout).update(
+        status=Job.QUEUED, locked_by='', locked_at=None)
+
+
+def claim_jobs(worker, limit, now=None):
+    """
+    marks up to `limit` due jobs as run by the worker
+    :param worker: name of the worker
+    :param limit:
+    :param now:
+    :return: the claimed jobs
+    """
+    now = now or timezone.now()
+    due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by('run_at', 'id')
+    claim = dict(status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1)
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(**claim)
+    else:
+        # another worker may claim a candidate first, the status condition lets only one of them win
+        ids = [pk for pk in due.values_list('id', flat=True)[:limit]
+               if Job.objects.filter(id=pk, status=Job.QUEUED).update(**claim)]
+    return list(Job.objects.filter(id__in=ids).order_by('run_at', 'id'))
+
+
+def run_job(job):
+    """
+    runs a claimed job and records the outcome, a failed job is queued again until it
+    ran `max_attempts` times
+    :param job:
+    :return: True when the job succeeded
+    """
+    try:
+        arguments = json.loads(job.arguments)
+        import_string(job.task)(*arguments.get('args', ()), **arguments.get('kwargs', {}))
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Job %s (%s) failed on attempt %s\n%s', job.pk, job.task, job.attempts, error)
+        outcome = dict(status=Job.FAILED, finished_at=timezone.now())
+        if job.attempts < job.max_attempts:
+            outcome = dict(status=Job.QUEUED, run_at=timezone.now() + get_retry_delay(job.attempts))
+        Job.objects.filter(pk=job.pk).update(last_error=error, locked_by='', locked_at=None, **outcome)
+        return False
+
+    Job.objects.filter(pk=job.pk).update(status=Job.DONE, finished_at=timezone.now(), locked_by='',
+                                         locked_at=None)
+    return True
+
+
+def _run_in_thread(job):
+    try:
+        return run_job(job)
+    finally:
+        # every thread has its own connection
+        connections.close_all()
+
+
+class Worker:
+    """
+    Claims due jobs and runs them, `threads` at a time
+    """
+
+    def __init__(self, threads=None, name=None):
+        self.threads = threads or getattr(settings, 'JOB_WORKER_THREADS', 4)
+        self.name = name or '{0}:{1}'.format(socket.gethostname(), os.getpid())
+        self.executor = ThreadPoolExecutor(self.threads) if self.threads > 1 else None
+
+    def run_once(self):
+        """
+        runs the jobs due now
+        :return: number of jobs run
+        """
+        release_stale_jobs()
+        jobs = claim_jobs(self.name, self.threads)
+        if self.executor is None:
+            for job in jobs:
+                run_job(job)
+        else:
+            list(self.executor.map(_run_in_thread, jobs))
+        return len(jobs)
+
+    def run(self, poll_interval=1.0, burst=False):
+        """
+        runs jobs until interrupted, waiting `poll_interval` seconds when there is none
+        :param poll_interval:
+        :param burst: stop once no job is due
+        :return: number of jobs run
+        """
+        total = 0
+        try:
+            while True:
+                # like the end of a request, drops the connection when it broke or got too old
+                close_old_connections()
+                ran = self.run_once()
+                total += ran
+                if not ran:
+                    if burst:
+                        break
+                    sleep(poll_interval)
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+        return total
@@ -0,0 +1,133 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+from authors.apps.jobs.models import Job
+from authors.apps.jobs.queue import Worker, claim_jobs, enqueue, release_stale_jobs
+
+CALLS = []
+
+
+def record(*args, **kwargs):
+    CALLS.append((args, kwargs))
+
+
+def fail():
+    raise ValueError('broken')
+
+
+@override_settings(JOBS_EAGER=False, JOB_MAX_ATTEMPTS=3, JOB_RETRY_DELAY=10)
+class TestJobs(TestCase):
+    def setUp(self):
+        CALLS.clear()
+        self.worker = Worker(threads=1, name='test')
+
+    def test_enqueue_stores_job(self):
+        job = enqueue('authors.apps.jobs.tests.test_jobs.record', 1, 'two', three=3)
+
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.max_attempts, 3)
+        self.assertEqual(CALLS, [])
+
+    def test_worker_runs_due_jobs(self):
+        job = enqueue('authors.apps.jobs.tests.test_jobs.record', 1, three=3)
+        later = enqueue('authors.apps.jobs.tests.test_jobs.record', 2)
+        Job.objects.filter(pk=later.pk).update(run_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(self.worker.run_once(), 1)
+        self.assertEqual(CALLS, [((1,), {'three': 3})])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(Job.objects.get(pk=later.pk).status, Job.QUEUED)
+
+    def test_failed_job_retried_with_backoff(self):
+        job = enqueue('authors.apps.jobs.tests.test_jobs.fail')
+
+        delays = []
+        for _ in range(3):
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+            before = timezone.now()
+            self.assertEqual(self.worker.run_once(), 1)
+            job.refresh_from_db()
+            if job.status == Job.QUEUED:
+                delays.append(round((job.run_at - before).total_seconds()))
+
+        self.assertEqual(delays, [10, 20])
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertIn('ValueError: broken', job.last_error)
+        self.assertEqual(self.worker.run_once(), 0)
+
+    def test_claimed_job_not_claimed_again(self):
+        enqueue('authors.apps.jobs.tests.test_jobs.record')
+
+        self.assertEqual(len(claim_jobs('first', 5)), 1)
+        self.assertEqual(claim_jobs('second', 5), [])
+
+    def test_stale_job_released(self):
+        job = enqueue('authors.apps.jobs.tests.test_jobs.record')
+        claim_jobs('dead', 1)
+
+        self.assertEqual(release_stale_jobs(), 0)
+        self.assertEqual(release_stale_jobs(now=timezone.now() + timedelta(hours=1)), 1)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.QUEUED, ''))
+        self.assertEqual(self.worker.run_once(), 1)
+        self.assertEqual(Job.objects.get(pk=job.pk).attempts, 2)
+
+    def test_activation_email_sent_by_worker(self):
+        response = self.client.post('/api/users/', {'user': {
+            'username': 'queued', 'email': 'queued@example.com', 'password': 'password123'}},
+            content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+
+        out = StringIO()
+        call_command('run_worker', '--burst', '--threads', '1', stdout=out)
+        self.assertIn('Ran 1 job(s).', out.getvalue())
+        self.assertEqual(mail.outbox[0].to, ['queued@example.com'])
+
+    def test_password_reset_email_sent_by_worker(self):
+        User.objects.create_user('resetting', 'resetting@example.com', 'password123')
+        response = self.client.post('/api/users/reset/password', {'user': {'email': 'resetting@example.com'}},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(self.worker.run_once(), 1)
+        self.assertEqual(mail.outbox[0].to, ['resetting@example.com'])
+
+    def test_job_rolled_back_with_request(self):
+        user = User.objects.create_user('writer', 'writer@example.com', 'password123')
+        user.is_active = user.is_email_verified = True
+        user.save()
+
+        def enqueue_then_fail(*args):
+            enqueue(*args)
+            raise RuntimeError('request failed')
+
+        with mock.patch('authors.apps.articles.views.enqueue', side_effect=enqueue_then_fail), \
+                self.assertRaises(RuntimeError):
+            self.client.post('/api/articles/', {'article': {
+                'title': 'Rolled back', 'description': 'Description', 'body': 'Body'}},
+                content_type='application/json', HTTP_AUTHORIZATION='Token {0}'.format(user.token))
+
+        self.assertFalse(Article.objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_jobs_run_inline(self):
+        self.assertIsNone(enqueue('authors.apps.jobs.tests.test_jobs.record', 1))
+        self.assertEqual(CALLS, [((1,), {})])
+        self.assertFalse(Job.objects.exists())
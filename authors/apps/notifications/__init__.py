@@ -0,0 +1,3 @@
+"""
+In-app notifications of new articles by followed authors and of comments
+"""
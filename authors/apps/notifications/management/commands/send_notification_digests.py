@@ -0,0 +1,19 @@
+"""
+Emails every user a digest of their unread notifications.
+Digests are optional, run this periodically (e.g. daily from a scheduler) to send them.
+"""
+from django.core.management.base import BaseCommand
+
+from authors.apps.notifications.notify import send_digests
+
+
+class Command(BaseCommand):
+    help = "Email every user a digest of their unread notifications."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100,
+                            help="Emails sent over one connection to the mail server.")
+
+    def handle(self, *args, **options):
+        sent = send_digests(batch_size=options["batch_size"])
+        self.stdout.write("Sent {0} digest email(s).".format(sent))
@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+
+
+class Notification(models.Model):
+    """
+    Something that happened which a user should know about
+    """
+    ARTICLE_PUBLISHED = 'article_published'
+    ARTICLE_COMMENTED = 'article_commented'
+    VERBS = (
+        (ARTICLE_PUBLISHED, 'published an article'),
+        (ARTICLE_COMMENTED, 'commented on your article'),
+    )
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    verb = models.CharField(max_length=32, choices=VERBS)
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='+', null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    # set when the recipient reads the notification, or when it is sent in a digest email
+    read_at = models.DateTimeField(null=True, blank=True)
+    emailed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('-id',)
+        # the unread notifications of a user, newest first
+        indexes = [models.Index(fields=['recipient', 'read_at', '-id'], name='notifications_unread')]
+
+    def __str__(self):
+        return '{0} {1}'.format(self.actor_id, self.get_verb_display())
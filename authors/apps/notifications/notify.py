@@ -0,0 +1,108 @@
+"""
+Creating notifications and sending them in digest emails
+"""
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.utils import timezone
+
+from authors.apps.articles.models import Article
+from authors.apps.notifications.models import Notification
+from authors.apps.profiles.models import UserProfile
+
+# notifications inserted per query
+BATCH_SIZE = 1000
+
+
+def notify_followers(article):
+    """
+    notifies the followers of the author of a new article, with one query to find the
+    followers and one insert per `BATCH_SIZE` followers
+    :param article:
+    :return: number of notifications created
+    """
+    followers = UserProfile.following.through.objects.filter(
+        to_userprofile__user_id=article.author_id).values_list('from_userprofile__user_id', flat=True)
+
+    created = 0
+    batch = []
+    with transaction.atomic():
+        for follower in followers.iterator():
+            batch.append(Notification(recipient_id=follower, actor_id=article.author_id, article_id=article.pk,
+                                      verb=Notification.ARTICLE_PUBLISHED, created_at=article.created_at))
+            if len(batch) == BATCH_SIZE:
+                created += len(Notification.objects.bulk_create(batch))
+                batch = []
+        created += len(Notification.objects.bulk_create(batch))
+    return created
+
+
+def fan_out_article(article_id):
+    """
+    job notifying the followers of the author of a new article
+    :param article_id:
+    :return: number of notifications created
+    """
+    article = Article.objects.filter(pk=article_id).only('id', 'author_id', 'created_at').first()
+    return notify_followers(article) if article is not None else 0
+
+
+def notify_comment(comment):
+    """
+    notifies the author of an article of a comment by someone else
+    :param comment:
+    :return: the notification, None when the author commented
+    """
+    author_id = Article.objects.filter(pk=comment.article_id).values_list('author_id', flat=True).first()
+    if author_id is None or author_id == comment.author_id:
+        return None
+    return Notification.objects.create(recipient_id=author_id, actor_id=comment.author_id,
+                                       article_id=comment.article_id, verb=Notification.ARTICLE_COMMENTED)
+
+
+def format_digest(notifications):
+    lines = ['{0} {1}: {2}'.format(notification.actor.username, notification.get_verb_display(),
+                                   notification.article.title if notification.article_id else '')
+             for notification in notifications]
+    return 'Hey there, here is what you missed on Authors Haven.\n\n' + '\n'.join(lines) + '\n'
+
+
+def send_digests(batch_size=100):
+    """
+    emails every user their unread notifications that were not emailed yet, one email per
+    user, sent over one connection per `batch_size` users
+    :param batch_size:
+    :return: number of emails sent
+    """
+    pending = Notification.objects.filter(read_at__isnull=True, emailed_at__isnull=True)
+    last_id = pending.order_by('-id').values_list('id', flat=True).first()
+    if last_id is None:
+        return 0
+
+    # notifications created while the digests are sent wait for the next run
+    pending = pending.filter(id__lte=last_id)
+    rows = pending.select_related('recipient', 'actor', 'article').only(
+        'recipient__email', 'actor__username', 'article__title', 'verb').order_by('recipient_id', 'id')
+
+    sent = 0
+    messages, recipients = [], []
+
+    def send():
+        # a batch is marked as emailed once it is sent, a failure only resends the failed batch
+        count = send_mass_mail(messages, fail_silently=False)
+        pending.filter(recipient_id__in=recipients).update(emailed_at=timezone.now())
+        return count
+
+    for recipient, notifications in groupby(rows.iterator(), key=lambda notification: notification.recipient_id):
+        notifications = list(notifications)
+        messages.append(('Your Authors Haven digest', format_digest(notifications),
+                         settings.DEFAULT_FROM_EMAIL, [notifications[0].recipient.email]))
+        recipients.append(recipient)
+        if len(messages) == batch_size:
+            sent += send()
+            messages, recipients = [], []
+    if messages:
+        sent += send()
+    return sent
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from authors.apps.core.instrumentation import TimedSerializerMixin
+from authors.apps.notifications.models import Notification
+
+
+class NotificationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+
+    actor = serializers.CharField(source='actor.username')
+    message = serializers.CharField(source='get_verb_display')
+    article = serializers.SlugRelatedField(slug_field='slug', read_only=True)
+    read = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Notification
+        fields = ('id', 'verb', 'message', 'actor', 'article', 'created_at', 'read')
+
+    def get_read(self, instance):
+        return instance.read_at is not None
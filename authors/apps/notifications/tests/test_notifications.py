@@ -0,0 +1,123 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+from authors.apps.notifications.models import Notification
+from authors.apps.notifications.notify import notify_followers
+
+
+class TestNotifications(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = []
+        for name in ('author', 'reader', 'other'):
+            user = User.objects.create_user(name, '{}@example.com'.format(name), 'password123')
+            user.is_active = user.is_email_verified = True
+            user.save()
+            self.users.append(user)
+        self.author, self.reader, self.other = self.users
+        self.reader.userprofile.following.add(self.author.userprofile)
+        self.other.userprofile.following.add(self.author.userprofile)
+
+    def login(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + user.token)
+
+    def publish(self, title='Published'):
+        self.login(self.author)
+        response = self.client.post('/api/articles/', {'article': {
+            'title': title, 'description': 'Description', 'body': 'Body'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Article.objects.get(slug=response.json()['article']['slug'])
+
+    def unread(self, user):
+        self.login(user)
+        response = self.client.get('/api/notifications/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_followers_notified_of_new_articles(self):
+        article = self.publish()
+
+        notifications = self.unread(self.reader)['results']
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(notifications[0]['actor'], 'author')
+        self.assertEqual(notifications[0]['article'], article.slug)
+        self.assertEqual(notifications[0]['verb'], Notification.ARTICLE_PUBLISHED)
+        self.assertEqual(self.unread(self.author)['results'], [])
+
+    def test_fan_out_is_bulk(self):
+        article = Article.objects.create(author=self.author, title='Bulk', description='Bulk', body='Bulk')
+
+        # the followers, then one insert in a savepoint
+        with self.assertNumQueries(4):
+            self.assertEqual(notify_followers(article), 2)
+
+    def test_author_notified_of_comments(self):
+        article = self.publish()
+        self.login(self.reader)
+        self.client.post('/api/articles/{}/comment/'.format(article.slug), {'comment': {'body': 'Nice'}},
+                         format='json')
+        self.login(self.author)
+        self.client.post('/api/articles/{}/comment/'.format(article.slug), {'comment': {'body': 'Thanks'}},
+                         format='json')
+
+        notifications = self.unread(self.author)['results']
+        self.assertEqual([(item['actor'], item['verb']) for item in notifications],
+                         [('reader', Notification.ARTICLE_COMMENTED)])
+
+    def test_cursor_pagination(self):
+        for index in range(25):
+            self.publish('Article {}'.format(index))
+
+        page = self.unread(self.reader)
+        self.assertEqual(len(page['results']), 20)
+        self.assertIsNone(page['previous'])
+
+        # notifications arriving meanwhile do not shift the next page
+        self.publish('Late')
+        self.login(self.reader)
+        page = self.client.get(page['next']).json()
+        self.assertEqual([item['id'] for item in page['results']], sorted(
+            [item['id'] for item in page['results']], reverse=True))
+        self.assertEqual(len(page['results']), 5)
+        self.assertIsNone(page['next'])
+
+    def test_mark_all_read(self):
+        self.publish('First')
+        self.publish('Second')
+        last_id = self.unread(self.reader)['results'][0]['id']
+        self.publish('Third')
+
+        self.login(self.reader)
+        response = self.client.post('/api/notifications/read/', {'last_id': last_id}, format='json')
+        self.assertEqual(response.json(), {'marked_read': 2})
+        self.assertEqual(len(self.unread(self.reader)['results']), 1)
+
+        response = self.client.post('/api/notifications/read/', {}, format='json')
+        self.assertEqual(response.json(), {'marked_read': 1})
+        self.assertEqual(self.unread(self.reader)['results'], [])
+        self.assertEqual(len(self.client.get('/api/notifications/?all=true').json()['results']), 3)
+
+        response = self.client.post('/api/notifications/read/', {'last_id': 'last'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_digests(self):
+        self.publish('First')
+        self.publish('Second')
+        Notification.objects.filter(recipient=self.other).update(read_at='2018-09-24T10:07:00Z')
+
+        output = StringIO()
+        call_command('send_notification_digests', stdout=output)
+        self.assertEqual(output.getvalue().strip(), 'Sent 1 digest email(s).')
+        self.assertEqual(mail.outbox[0].to, ['reader@example.com'])
+        self.assertIn('author published an article: Second', mail.outbox[0].body)
+
+        # notifications are emailed once
+        call_command('send_notification_digests', stdout=output)
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import NotificationsAPIView, ReadNotificationsAPIView
+
+urlpatterns = [
+    path('', NotificationsAPIView.as_view(), name="notifications"),
+    path('read/', ReadNotificationsAPIView.as_view(), name="read_notifications"),
+]
@@ -0,0 +1,56 @@
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authors.apps.notifications.models import Notification
+from authors.apps.notifications.serializers import NotificationSerializer
+
+
+class NotificationPagination(CursorPagination):
+    """
+    Pages through notifications newest first, the cursor holds the last id seen
+    so pages stay stable while new notifications arrive
+    """
+    ordering = '-id'
+    page_size = 20
+
+
+class NotificationsAPIView(APIView):
+    """ This class lists the unread notifications of the user, `?all=true` includes read ones
+    """
+    permission_classes = (IsAuthenticated,)
+    serializer_class = NotificationSerializer
+
+    def get(self, request):
+        queryset = Notification.objects.filter(recipient=request.user).select_related('actor', 'article').only(
+            'id', 'verb', 'created_at', 'read_at', 'actor__username', 'article__slug')
+        if request.query_params.get('all') != 'true':
+            queryset = queryset.filter(read_at__isnull=True)
+
+        paginator = NotificationPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.serializer_class(page, many=True)
+
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ReadNotificationsAPIView(APIView):
+    """ This class marks the notifications of the user as read
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        """ Function marks all the unread notifications as read, up to `last_id` when given """
+        unread = Notification.objects.filter(recipient=request.user, read_at__isnull=True)
+
+        last_id = request.data.get('last_id')
+        if last_id is not None:
+            try:
+                unread = unread.filter(id__lte=int(last_id))
+            except (TypeError, ValueError):
+                raise serializers.ValidationError({'last_id': 'A valid integer is required.'})
+
+        return Response({'marked_read': unread.update(read_at=timezone.now())}, status=status.HTTP_200_OK)
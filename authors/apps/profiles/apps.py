@@ -6,4 +6,3 @@ class MyAppConfig(AppConfig):
 
     def ready(self):
         import authors.apps.profiles.signals
-
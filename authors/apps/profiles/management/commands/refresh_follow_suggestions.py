@@ -0,0 +1,20 @@
+"""
+Recomputes the follow suggestions of all users.
+Follows update the suggestions of the follower as they happen, run this periodically
+(e.g. from a scheduler) to pick up favorites and the follows of other users.
+"""
+from django.core.management.base import BaseCommand
+
+from authors.apps.profiles.suggestions import SUGGESTIONS_PER_USER, refresh_suggestions
+
+
+class Command(BaseCommand):
+    help = "Recompute the follow suggestions of all users."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=SUGGESTIONS_PER_USER,
+                            help="Suggestions kept per user.")
+
+    def handle(self, *args, **options):
+        stored = refresh_suggestions(limit=options["limit"])
+        self.stdout.write("Stored {0} follow suggestion(s).".format(stored))
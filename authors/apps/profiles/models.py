@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from authors.apps.authentication.models import User
 
 
@@ -24,12 +24,27 @@ class UserProfile(models.Model):
         return self.user.username
 
     def follow(self, profile):
-        """Following a user"""
-        self.following.add(profile)
+        """Following a user, with a single insert. Returns False when already following them"""
+        try:
+            with transaction.atomic():
+                self.following.through.objects.create(from_userprofile_id=self.pk, to_userprofile_id=profile.pk)
+        except IntegrityError:
+            return False
+        return True
 
     def unfollow(self, profile):
-        """Unfollow a user"""
-        self.following.remove(profile)
+        """Unfollow a user, with a single delete. Returns False when not following them"""
+        deleted, _ = self.following.through.objects.filter(
+            from_userprofile_id=self.pk, to_userprofile_id=profile.pk).delete()
+        return deleted > 0
+
+    def follow_counts(self, profile):
+        """The number of followers of a profile and the number of users this user follows"""
+        Follow = self.following.through
+        return {
+            'followers_count': Follow.objects.filter(to_userprofile_id=profile.pk).count(),
+            'following_count': Follow.objects.filter(from_userprofile_id=self.pk).count(),
+        }
 
     def is_following(self, profile):
         """To check if a user is already following the profile"""
@@ -46,3 +61,20 @@ class UserProfile(models.Model):
     def has_favorited(self, article):
         """Check if user has already favorited that article"""
         return self.favorites.filter(pk=article.pk).exists()
+
+
+class FollowSuggestion(models.Model):
+    """
+    A profile suggested for a user to follow, see `authors.apps.profiles.suggestions`
+    """
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='suggestions')
+    suggested = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='suggested_to')
+    score = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('profile', 'suggested'),)
+        indexes = [models.Index(fields=['profile', '-score'], name='profiles_suggestion_score')]
+
+    def __str__(self):
+        return '{0} -> {1}'.format(self.profile_id, self.suggested_id)
@@ -1,10 +1,11 @@
 from rest_framework import serializers
 
 from authors.apps.articles.models import Article
-from authors.apps.profiles.models import UserProfile
+from authors.apps.core.instrumentation import TimedSerializerMixin
+from authors.apps.profiles.models import FollowSuggestion, UserProfile
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     username = serializers.CharField(source='user.username')
     following = serializers.SerializerMethodField()
@@ -39,3 +40,14 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     def get_favorites(self, instance):
         return self.helper('favorites', instance)
+
+
+class FollowSuggestionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+
+    username = serializers.CharField(source='suggested.user.username')
+    bio = serializers.CharField(source='suggested.bio')
+    avatar = serializers.URLField(source='suggested.avatar')
+
+    class Meta:
+        model = FollowSuggestion
+        fields = ('username', 'bio', 'avatar', 'score')
@@ -1,12 +1,17 @@
-from django.dispatch import receiver
+"""
+Fallback for users saved without `UserManager.save_with_profile`, e.g. from the
+admin or with `User.objects.create`: their profile is created after them, every
+user must have one.
+"""
 from django.db.models.signals import post_save
+from django.dispatch import receiver
 
-from .models import *
+from authors.apps.authentication.models import User
+from authors.apps.profiles.models import UserProfile
 
 
 @receiver(post_save, sender=User)
-def build_profile_on_user_creation(sender, instance, created, **kwargs):
-    if created:
-        """ Check if user is created """
-        profile = UserProfile(user=instance)
-        profile.save()
+def create_missing_profile(sender, instance, created, **kwargs):
+    if not created or getattr(instance, "_saving_with_profile", False):
+        return
+    instance.userprofile, _ = UserProfile.objects.get_or_create(user=instance)
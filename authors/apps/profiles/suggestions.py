@@ -0,0 +1,147 @@
+"""
+Follow suggestions,
+scores the profiles a user may want to follow from the follow graph
+(friends of friends) and from favorites shared with other users
+"""
+import heapq
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+# weight of each path from a user to a suggested profile
+FRIEND_OF_FRIEND_WEIGHT = 1.0
+CO_FAVORITE_WEIGHT = 0.5
+
+# suggestions stored per user by `refresh_suggestions`
+SUGGESTIONS_PER_USER = 20
+
+
+def collect_graph():
+    """
+    returns the follow graph and the favorites, one query each
+    :return: following (profile id to followed ids), favorites (profile id to article ids)
+        and favorited_by (article id to profile ids)
+    """
+    from authors.apps.profiles.models import UserProfile
+
+    following = defaultdict(set)
+    for follower, followed in UserProfile.following.through.objects.values_list(
+            "from_userprofile_id", "to_userprofile_id").order_by().iterator():
+        following[follower].add(followed)
+
+    favorites, favorited_by = defaultdict(set), defaultdict(set)
+    for profile, article in UserProfile.favorites.through.objects.values_list(
+            "userprofile_id", "article_id").order_by().iterator():
+        favorites[profile].add(article)
+        favorited_by[article].add(profile)
+    return following, favorites, favorited_by
+
+
+def get_scores(profile_id, following, favorites, favorited_by):
+    """
+    returns the scores of the profiles suggested to a user, leaving out the user
+    and the profiles they follow already
+    :param profile_id:
+    :param following:
+    :param favorites:
+    :param favorited_by:
+    :return: dict mapping profile ids to scores
+    """
+    followed = following.get(profile_id, set())
+    scores = defaultdict(float)
+    for friend in followed:
+        for candidate in following.get(friend, ()):
+            scores[candidate] += FRIEND_OF_FRIEND_WEIGHT
+    for article in favorites.get(profile_id, ()):
+        for candidate in favorited_by[article]:
+            scores[candidate] += CO_FAVORITE_WEIGHT
+
+    scores.pop(profile_id, None)
+    for profile in followed:
+        scores.pop(profile, None)
+    return scores
+
+
+def refresh_suggestions(profile_ids=None, limit=SUGGESTIONS_PER_USER):
+    """
+    recomputes and stores the top suggestions of the users
+    :param profile_ids: restrict to these profiles, all profiles when None
+    :param limit: suggestions kept per user
+    :return: number of suggestions stored
+    """
+    from authors.apps.profiles.models import FollowSuggestion, UserProfile
+
+    graph = collect_graph()
+    if profile_ids is None:
+        profile_ids = UserProfile.objects.values_list("pk", flat=True).order_by()
+    profile_ids = list(profile_ids)
+
+    suggestions = []
+    for profile_id in profile_ids:
+        scores = get_scores(profile_id, *graph)
+        # ties go to the oldest profiles so runs are repeatable
+        for suggested in heapq.nsmallest(limit, scores, key=lambda pk: (-scores[pk], pk)):
+            suggestions.append(FollowSuggestion(profile_id=profile_id, suggested_id=suggested,
+                                                score=scores[suggested]))
+
+    with transaction.atomic():
+        FollowSuggestion.objects.filter(profile_id__in=profile_ids).delete()
+        FollowSuggestion.objects.bulk_create(suggestions, batch_size=1000)
+    return len(suggestions)
+
+
+def followed(profile, followed_profile, limit=SUGGESTIONS_PER_USER):
+    """
+    updates the suggestions of a user who followed a profile, with a constant number of queries:
+    the profile is no longer suggested and the profiles it follows become friends of friends
+    :param profile: the follower
+    :param followed_profile:
+    :param limit: suggestions kept per user, as in `refresh_suggestions`
+    :return:
+    """
+    from authors.apps.profiles.models import FollowSuggestion
+
+    Follow = profile.following.through
+    candidates = set(Follow.objects.filter(from_userprofile_id=followed_profile.pk).exclude(
+        to_userprofile_id__in=Follow.objects.filter(from_userprofile_id=profile.pk).values("to_userprofile_id")
+    ).exclude(to_userprofile_id=profile.pk).values_list("to_userprofile_id", flat=True))
+
+    with transaction.atomic():
+        FollowSuggestion.objects.filter(profile_id=profile.pk, suggested_id=followed_profile.pk).delete()
+        if not candidates:
+            return
+
+        suggestions = FollowSuggestion.objects.filter(profile_id=profile.pk)
+        suggestions.filter(suggested_id__in=candidates).update(score=F("score") + FRIEND_OF_FRIEND_WEIGHT)
+        existing = set(suggestions.filter(suggested_id__in=candidates).values_list("suggested_id", flat=True))
+        FollowSuggestion.objects.bulk_create([
+            FollowSuggestion(profile_id=profile.pk, suggested_id=suggested, score=FRIEND_OF_FRIEND_WEIGHT)
+            for suggested in candidates - existing
+        ])
+
+        # keep the top suggestions only, ranked like `refresh_suggestions` ranks them
+        kept = list(suggestions.order_by("-score", "suggested_id").values_list("pk", flat=True)[:limit])
+        suggestions.exclude(pk__in=kept).delete()
+
+
+def unfollowed(profile, unfollowed_profile):
+    """
+    updates the suggestions of a user who unfollowed a profile, the profiles it follows lose
+    the friend of friend path through it. The unfollowed profile is suggested again by the next
+    `refresh_suggestions`
+    :param profile: the former follower
+    :param unfollowed_profile:
+    :return:
+    """
+    from authors.apps.profiles.models import FollowSuggestion
+
+    Follow = profile.following.through
+    suggestions = FollowSuggestion.objects.filter(
+        profile_id=profile.pk, suggested_id__in=Follow.objects.filter(
+            from_userprofile_id=unfollowed_profile.pk).values("to_userprofile_id"))
+
+    with transaction.atomic():
+        suggestions.update(score=F("score") - FRIEND_OF_FRIEND_WEIGHT)
+        # a tiny margin keeps float rounding from leaving emptied suggestions behind
+        FollowSuggestion.objects.filter(profile_id=profile.pk, score__lte=1e-9).delete()
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -72,3 +74,27 @@ class TestFollowUnfollow(TestCase, BaseTest):
         self.response = self.client.delete('/api/profile/{}/unfollow/'.format('non-user'))
         self.assertEqual(self.response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(self.response.json(), {'detail': 'Profile with this username was not found.'})
+
+    def test_follow_returns_counts(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + self.login_response.data['token'])
+        self.response = self.client.post('/api/profile/{}/follow/'.format(self.second_user.username))
+        self.assertEqual(self.response.json(), {'profile': {
+            'username': self.second_user.username, 'following': True, 'followers_count': 1, 'following_count': 1}})
+        self.assertTrue(self.user.userprofile.is_following(self.second_user.userprofile))
+
+        self.response = self.client.delete('/api/profile/{}/unfollow/'.format(self.second_user.username))
+        self.assertEqual(self.response.json(), {'profile': {
+            'username': self.second_user.username, 'following': False, 'followers_count': 0, 'following_count': 0}})
+        self.assertFalse(self.user.userprofile.is_following(self.second_user.userprofile))
+
+    def test_follow_is_a_single_write(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + self.login_response.data['token'])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post('/api/profile/{}/follow/'.format(self.second_user.username))
+            self.client.delete('/api/profile/{}/unfollow/'.format(self.second_user.username))
+
+        writes = [query['sql'].split()[0] for query in queries if query['sql'].split()[0] in ('INSERT', 'UPDATE', 'DELETE')
+                  and 'profiles_userprofile_following' in query['sql'].split('WHERE')[0]]
+        self.assertEqual(writes, ['INSERT', 'DELETE'])
@@ -0,0 +1,115 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+from authors.apps.profiles import suggestions
+from authors.apps.profiles.models import FollowSuggestion
+
+
+class TestFollowSuggestions(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = {}
+        for name in ('ann', 'bob', 'cat', 'dan', 'eve'):
+            user = User.objects.create_user(name, '{}@example.com'.format(name), 'password123')
+            user.is_active = user.is_email_verified = True
+            user.save()
+            self.users[name] = user
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.users['ann'].token)
+
+    def profile(self, name):
+        return self.users[name].userprofile
+
+    def follow(self, follower, *names):
+        self.profile(follower).following.add(*[self.profile(name) for name in names])
+
+    def get_suggestions(self):
+        response = self.client.get('/api/profiles/user/suggestions/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['username'], item['score']) for item in response.json()['suggestions']]
+
+    def test_friends_of_friends_and_co_favorites(self):
+        self.follow('ann', 'bob', 'cat')
+        self.follow('bob', 'dan', 'ann')
+        self.follow('cat', 'dan', 'bob')
+        article = Article.objects.create(author=self.users['dan'], title='Shared', description='Shared',
+                                         body='Shared taste')
+        self.profile('ann').favorites.add(article)
+        self.profile('eve').favorites.add(article)
+
+        self.assertEqual(suggestions.refresh_suggestions(), 5)
+
+        # ann and the profiles she follows are never suggested to her
+        self.assertEqual(self.get_suggestions(), [('dan', 2.0), ('eve', 0.5)])
+
+    def test_suggestions_follow_the_follows(self):
+        self.follow('bob', 'cat', 'dan')
+        suggestions.refresh_suggestions()
+        self.assertEqual(self.get_suggestions(), [])
+
+        self.client.post('/api/profiles/profile/bob/follow/')
+        self.assertEqual(self.get_suggestions(), [('cat', 1.0), ('dan', 1.0)])
+
+        self.client.post('/api/profiles/profile/cat/follow/')
+        self.assertEqual(self.get_suggestions(), [('dan', 1.0)])
+
+        self.client.delete('/api/profiles/profile/bob/unfollow/')
+        self.assertEqual(self.get_suggestions(), [])
+
+    def test_incremental_updates_match_the_batch(self):
+        self.follow('bob', 'cat', 'dan')
+        self.follow('eve', 'dan')
+        self.client.post('/api/profiles/profile/bob/follow/')
+        self.client.post('/api/profiles/profile/eve/follow/')
+        incremental = self.get_suggestions()
+
+        suggestions.refresh_suggestions()
+        self.assertEqual(self.get_suggestions(), incremental)
+
+    def test_incremental_updates_keep_the_limit(self):
+        self.follow('ann', 'bob')
+        self.follow('bob', 'cat')
+        self.follow('eve', 'cat', 'dan', 'bob')
+        suggestions.refresh_suggestions()
+
+        self.follow('ann', 'eve')
+        suggestions.followed(self.profile('ann'), self.profile('eve'), limit=1)
+        stored = list(FollowSuggestion.objects.filter(profile=self.profile('ann')).order_by(
+            '-score', 'suggested_id').values_list('suggested__user__username', 'score'))
+        self.assertEqual(stored, [('cat', 2.0)])
+
+        suggestions.refresh_suggestions(limit=1)
+        self.assertEqual(stored, list(FollowSuggestion.objects.filter(profile=self.profile('ann')).order_by(
+            '-score', 'suggested_id').values_list('suggested__user__username', 'score')))
+
+    def test_suggestions_are_read_in_one_query(self):
+        self.follow('ann', 'bob')
+        self.follow('bob', 'cat', 'dan', 'eve')
+        suggestions.refresh_suggestions()
+
+        # the authentication query loads the user and the profile
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.get_suggestions()), 3)
+
+    def test_limit(self):
+        self.follow('ann', 'bob')
+        self.follow('bob', 'cat', 'dan', 'eve')
+        suggestions.refresh_suggestions(limit=2)
+        self.assertEqual(FollowSuggestion.objects.filter(profile=self.profile('ann')).count(), 2)
+
+        response = self.client.get('/api/profiles/user/suggestions/?limit=1')
+        self.assertEqual(len(response.json()['suggestions']), 1)
+        response = self.client.get('/api/profiles/user/suggestions/?limit=many')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command(self):
+        self.follow('ann', 'bob')
+        self.follow('bob', 'cat')
+        output = StringIO()
+        call_command('refresh_follow_suggestions', stdout=output)
+        self.assertEqual(output.getvalue().strip(), 'Stored 1 follow suggestion(s).')
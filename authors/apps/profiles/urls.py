@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import (UserProfileAPIView, FollowUnfollowUserAPIView
+from .views import (UserProfileAPIView, FollowUnfollowUserAPIView, FollowSuggestionsAPIView
 )
 
 urlpatterns = [
     path('profile/<username>/', UserProfileAPIView.as_view(), name="view_profile"),
     path('user/update/profile/', UserProfileAPIView.as_view(), name="update_profile"),
+    path('user/suggestions/', FollowSuggestionsAPIView.as_view(), name="follow_suggestions"),
     path('profile/<username>/follow/', FollowUnfollowUserAPIView.as_view(), name="follow_user"),
     path('profile/<username>/unfollow/', FollowUnfollowUserAPIView.as_view(), name="unfollow_user"),
 ]
@@ -3,9 +3,10 @@ from rest_framework.generics import RetrieveUpdateAPIView, RetrieveAPIView
 from rest_framework import status, serializers
 from rest_framework.views import APIView
 
-from authors.apps.profiles.models import UserProfile
+from authors.apps.profiles import suggestions
+from authors.apps.profiles.models import FollowSuggestion, UserProfile
 from rest_framework.permissions import IsAuthenticated
-from .serializers import UserProfileSerializer
+from .serializers import FollowSuggestionSerializer, UserProfileSerializer
 from .exceptions import UserProfileDoesNotExist
 from rest_framework.response import Response
 from .renderers import ProfileJSONRenderer
@@ -68,47 +69,57 @@ class UserProfileAPIView(RetrieveUpdateAPIView):
 class FollowUnfollowUserAPIView(APIView):
 
     permission_classes = (IsAuthenticated,)
-    serializer_class = UserProfileSerializer
-
-    def post(self, request, username=None):
-        current_user = self.request.user
 
+    def get_profile(self, username):
+        """ Function returns the profile to follow or unfollow, only with the columns needed """
         try:
-            follow = UserProfile.objects.get(user__username=username)
+            return UserProfile.objects.only('id', 'user_id').get(user__username=username)
         except UserProfile.DoesNotExist:
             raise NotFound('Profile with this username was not found.')
 
-        if follow.pk is current_user.pk:
-            raise serializers.ValidationError('You cannot follow yourself.')
+    def follow_response(self, profile, username, following):
+        data = {'username': username, 'following': following}
+        data.update(self.request.user.userprofile.follow_counts(profile))
+        return Response({'profile': data}, status=status.HTTP_200_OK)
 
-        current_user_profile = UserProfile.objects.get(user=current_user)
+    def post(self, request, username=None):
+        follow = self.get_profile(username)
 
-        if current_user_profile.is_following(follow):
+        if follow.user_id == request.user.pk:
+            raise serializers.ValidationError('You cannot follow yourself.')
+
+        if not request.user.userprofile.follow(follow):
             return Response({"message": "You are already following that user"}, status=status.HTTP_400_BAD_REQUEST)
+        suggestions.followed(request.user.userprofile, follow)
 
-        current_user_profile.follow(follow)
-        current_user_profile.save()
+        return self.follow_response(follow, username, True)
 
-        serializer = self.serializer_class(current_user_profile, context={'request': request})
+    def delete(self, request, username=None):
+        unfollow = self.get_profile(username)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if not request.user.userprofile.unfollow(unfollow):
+            return Response({"message": "You cannot un-follow a user you do not follow"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        suggestions.unfollowed(request.user.userprofile, unfollow)
 
-    def delete(self, request, username=None):
-        current_user = self.request.user
+        return self.follow_response(unfollow, username, False)
 
-        try:
-            unfollow = UserProfile.objects.get(user__username=username)
-        except UserProfile.DoesNotExist:
-            raise NotFound('Profile with this username was not found.')
 
-        current_user_profile = UserProfile.objects.get(user=current_user)
+class FollowSuggestionsAPIView(APIView):
+    """ This class returns the profiles suggested for the user to follow,
+        precomputed by the `refresh_follow_suggestions` command
+    """
+    permission_classes = (IsAuthenticated,)
+    serializer_class = FollowSuggestionSerializer
 
-        if not current_user_profile.is_following(unfollow):
-            return Response({"message": "You cannot un-follow a user you do not follow"},
-                            status=status.HTTP_400_BAD_REQUEST)
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), suggestions.SUGGESTIONS_PER_USER)
+        except ValueError:
+            raise serializers.ValidationError({'limit': 'A valid integer is required.'})
 
-        current_user_profile.unfollow(unfollow)
-        current_user_profile.save()
-        serializer = self.serializer_class(current_user_profile, context={'request': request})
+        queryset = FollowSuggestion.objects.filter(profile_id=request.user.userprofile.pk).select_related(
+            'suggested__user').order_by('-score', 'suggested_id')[:max(limit, 0)]
+        serializer = self.serializer_class(queryset, many=True)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response({'suggestions': serializer.data}, status=status.HTTP_200_OK)
@@ -1,32 +1,43 @@
-from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
 from rest_framework.permissions import AllowAny
 
 from authors.apps.authentication.models import User
 from authors.apps.authentication.renderers import UserJSONRenderer
 
 
-def create_user_and_return_token(user_id, email, name):
-    # check if the user id from decoded token exists in the decoded token dict
-    user = User.objects.filter(social_id=user_id)
+def get_social_user(provider, social_id):
+    """
+    returns the user of a social login, users created before the provider was
+    recorded are found by their social id and get their provider set
+    :param provider:
+    :param social_id:
+    :return:
+    """
+    users = {user.social_provider: user for user in
+             User.objects.filter(social_provider__in=(provider, ''), social_id=social_id)}
+    user = users.get(provider)
+    if user is None and '' in users:
+        user = users['']
+        User.objects.filter(pk=user.pk).update(social_provider=provider)
+    return user
+
+
+def create_user_and_return_token(user_id, email, name, provider):
+    user = get_social_user(provider, user_id)
 
     # if user does not exist, register the user into the database.
-    # i.e. create a new user
-    if not user.exists():
-        user = {
-            'username': name, 'email': email, 'password': 'nopassword'}
-
-        # create a new facebook user
-        User.objects.create_user(**user)
-
-        User.objects.filter(email=email).update(social_id=user_id)
-
-        auth = authenticate(email=email, password="nopassword")
-        return auth.token
-    else:
-        # if user already exists and is authenticated by google also,
-        # return the user an authentication token
-        auth = authenticate(email=email, password="nopassword")
-        return auth.token
+    if user is None:
+        try:
+            with transaction.atomic():
+                user = User.objects.create_social_user(name, email, provider, user_id)
+        except IntegrityError:
+            # signed up by a concurrent request with the same token
+            user = get_social_user(provider, user_id)
+            if user is None:
+                raise
+
+    # social users have no password, the token is minted directly
+    return user.token
 
 
 class BaseClassAttributes:
@@ -1,13 +1,28 @@
 import facebook
+from django.conf import settings
+
+from authors.apps.social_auth.transport import get_session, verified_token
 
 
 class FacebookValidate:
 
     @staticmethod
-    def validate(auth_token):
+    def validate(auth_token, session=None):
+        """
+        returns the profile of a facebook access token, tokens verified earlier
+        are read from the cache for `SOCIAL_AUTH_CACHE_TIMEOUT` seconds
+        :param auth_token:
+        :param session: requests compatible session, defaults to `SOCIAL_AUTH_HTTP_SESSION`
+        :return:
+        """
+        return verified_token("facebook", auth_token, lambda token: FacebookValidate.verify(token, session))
+
+    @staticmethod
+    def verify(auth_token, session=None):
         try:
             # create an instance of the facebook
-            graph = facebook.GraphAPI(access_token=auth_token, version="3.0")
+            graph = facebook.GraphAPI(access_token=auth_token, version="3.0", session=session or get_session(),
+                                      timeout=settings.SOCIAL_AUTH_TIMEOUT)
 
             # fetch user info i.e. name, email and picture
             profile = graph.request('/me?fields=id,name,email')
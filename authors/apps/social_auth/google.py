@@ -1,25 +1,42 @@
 import os
 
-from google.auth.exceptions import RefreshError
-from google.auth.transport import requests
+from google.auth.exceptions import RefreshError, TransportError
 from google.oauth2 import id_token
 from google.oauth2.credentials import Credentials
 
+from authors.apps.social_auth.transport import CachingRequest, verified_token
+
 
 class GoogleAuth:
 
     @staticmethod
-    def validate(auth_token, refresh_token=None, access_token=None):
+    def validate(auth_token, refresh_token=None, access_token=None, request=None):
+        """
+        returns the user info of a google id token, tokens verified earlier
+        are read from the cache until they expire
+        :param auth_token:
+        :param refresh_token:
+        :param access_token:
+        :param request: google-auth transport, defaults to a `CachingRequest`
+        :return:
+        """
+        return verified_token("google", auth_token, lambda token: GoogleAuth.verify(
+            token, refresh_token=refresh_token, access_token=access_token, request=request))
+
+    @staticmethod
+    def verify(auth_token, refresh_token=None, access_token=None, request=None):
         try:
             token_uri = "https://accounts.google.com/o/oauth2/token"
             key = os.environ.get("GOOGLE_API_KEY", None)
             secret = os.environ.get("GOOGLE_API_SECRET", None)
 
+            # the certificates google signs tokens with are cached by the transport
+            request = request or CachingRequest()
+
             credentials = Credentials(access_token, refresh_token=refresh_token, id_token=auth_token,
                                       token_uri=token_uri, client_id=key, client_secret=secret)
             # and now we refresh the token
             # but not if we know that its not a valid token.
-            request = requests.Request()
             try:
                 credentials.refresh(request)
             except RefreshError:
@@ -28,11 +45,10 @@ class GoogleAuth:
             auth_token = credentials.id_token
 
             # Specify the CLIENT_ID of the app that accesses the backend:
-            id_info = id_token.verify_oauth2_token(auth_token, requests.Request(),
-                                                   os.environ.get("GOOGLE_API_KEY", None))
+            id_info = id_token.verify_oauth2_token(auth_token, request, os.environ.get("GOOGLE_API_KEY", None))
 
             # ID token is valid. Get the user's Google Account ID from the decoded token.
             return id_info
-        except ValueError:
+        except (ValueError, TransportError):
             # Invalid token
             return "The token is either invalid or has expired"
@@ -1,11 +1,12 @@
 from rest_framework import serializers
 
 from authors.apps.social_auth import google, facebook
+from authors.apps.core.instrumentation import TimedSerializerMixin
 from authors.apps.social_auth.common import create_user_and_return_token
 
 
 # noinspection PyMethodMayBeStatic,SpellCheckingInspection
-class GoogleSocialAuthViewSerializer(serializers.Serializer):
+class GoogleSocialAuthViewSerializer(TimedSerializerMixin, serializers.Serializer):
     """ Handles all social auth related tasks from google """
 
     # get google authentication token from and do validations
@@ -31,11 +32,11 @@ class GoogleSocialAuthViewSerializer(serializers.Serializer):
 
         name = "{0}_{1}".format(user_info['name'], user_id) if 'name' in keys else 'noname_{0}'.format(user_id)
 
-        return create_user_and_return_token(user_id=user_id, email=email, name=name)
+        return create_user_and_return_token(user_id=user_id, email=email, name=name, provider='google')
 
 
 # noinspection PyMethodMayBeStatic,SpellCheckingInspection
-class FacebookSocialAuthViewSerializer(serializers.Serializer):
+class FacebookSocialAuthViewSerializer(TimedSerializerMixin, serializers.Serializer):
     """ Handles all social auth related tasks from google """
 
     # get google authentication token from and do validations
@@ -63,4 +64,4 @@ class FacebookSocialAuthViewSerializer(serializers.Serializer):
 
         name = "{0}_{1}".format(user_info['name'], user_id) if 'name' in keys else 'noname_{0}'.format(user_id)
 
-        return create_user_and_return_token(user_id=user_id, email=email, name=name)
+        return create_user_and_return_token(user_id=user_id, email=email, name=name, provider='facebook')
@@ -0,0 +1,166 @@
+import json
+from importlib import import_module
+from time import time
+
+import rsa
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from google.auth import crypt, jwt
+from requests.structures import CaseInsensitiveDict
+
+from authors.apps.authentication.models import User
+from authors.apps.social_auth.transport import get_timeout
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+FACEBOOK_URL = "https://graph.facebook.com/"
+
+PUBLIC_KEY, PRIVATE_KEY = rsa.newkeys(512)
+
+
+class StubResponse:
+
+    def __init__(self, payload, status_code=200, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode("utf8")
+        self.headers = CaseInsensitiveDict({"content-type": "application/json"})
+        self.headers.update(headers or {})
+
+    def json(self):
+        return json.loads(self.content.decode("utf8"))
+
+
+class StubSession:
+    """
+    requests compatible session answering from `responses` and recording the urls it was asked for
+    """
+    responses = {}
+    calls = []
+
+    def request(self, method, url, **kwargs):
+        StubSession.calls.append(url)
+        for prefix, response in StubSession.responses.items():
+            if url.startswith(prefix):
+                return response(url, **kwargs) if callable(response) else response
+        return StubResponse({"error": {"message": "Not found"}}, status_code=404)
+
+
+def facebook_profile(url, params=None, **kwargs):
+    if (params or {}).get("access_token") == "valid":
+        return StubResponse({"id": "4242", "name": "Face Book", "email": "face@book.com"})
+    return StubResponse({"error": {"message": "Invalid OAuth access token.", "code": 190}}, status_code=400)
+
+
+def google_token(subject, expires_in=3600):
+    signer = crypt.RSASigner.from_string(PRIVATE_KEY.save_pkcs1().decode(), key_id="stub")
+    now = int(time())
+    return jwt.encode(signer, {
+        "iss": "accounts.google.com", "sub": subject, "email": "{0}@gmail.com".format(subject),
+        "name": "Goo Gle", "iat": now, "exp": now + expires_in}).decode()
+
+
+@override_settings(SOCIAL_AUTH_HTTP_SESSION="authors.apps.social_auth.tests.test_verification.StubSession")
+class Tests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        StubSession.calls = []
+        StubSession.responses = {
+            GOOGLE_CERTS_URL: StubResponse({"stub": PUBLIC_KEY.save_pkcs1().decode()},
+                                           headers={"Cache-Control": "public, max-age=3600"}),
+            FACEBOOK_URL: facebook_profile,
+        }
+
+    def tearDown(self):
+        cache.clear()
+
+    def login(self, provider, auth_token):
+        return self.client.post("/api/social/auth/{0}/".format(provider), data=json.dumps(
+            {"user": {"auth_token": auth_token}}), content_type="application/json")
+
+    def test_google_token_verified_once(self):
+        token = google_token("1001")
+
+        response = self.login("google", token)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("auth_token", response.json())
+        self.assertEqual(StubSession.calls, [GOOGLE_CERTS_URL])
+
+        self.assertEqual(self.login("google", token).status_code, 200)
+        self.assertEqual(len(StubSession.calls), 1)
+
+    def test_google_certificates_cached(self):
+        self.assertEqual(self.login("google", google_token("1001")).status_code, 200)
+        self.assertEqual(self.login("google", google_token("1002")).status_code, 200)
+
+        self.assertEqual(StubSession.calls, [GOOGLE_CERTS_URL])
+
+    def test_invalid_google_token_not_cached(self):
+        self.assertEqual(self.login("google", "fake_google_token").status_code, 400)
+        self.assertEqual(self.login("google", "fake_google_token").status_code, 400)
+
+        # only the certificates are cached
+        self.assertEqual(StubSession.calls, [GOOGLE_CERTS_URL])
+
+    def test_facebook_token_verified_once(self):
+        self.assertEqual(self.login("facebook", "valid").status_code, 200)
+        self.assertEqual(self.login("facebook", "valid").status_code, 200)
+        self.assertEqual(len(StubSession.calls), 1)
+
+    def test_invalid_facebook_token_not_cached(self):
+        for _ in range(2):
+            response = self.login("facebook", "expired")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()["errors"]["auth_token"], [
+                "The token is either invalid or expired. Please login again."])
+        self.assertEqual(len(StubSession.calls), 2)
+
+    def test_social_user_created_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.login("facebook", "valid").status_code, 200)
+
+        user_queries = [query["sql"] for query in queries if '"authentication_user"' in query["sql"]]
+        self.assertEqual(len(user_queries), 2)
+        self.assertTrue(user_queries[1].startswith("INSERT"))
+
+        user = User.objects.get(social_provider="facebook", social_id="4242")
+        self.assertFalse(user.has_usable_password())
+
+        cache.clear()
+        self.assertEqual(self.login("facebook", "valid").status_code, 200)
+        self.assertEqual(User.objects.filter(social_id="4242").count(), 1)
+
+    def test_legacy_social_user_gets_provider(self):
+        User.objects.create_user("legacy", "legacy@book.com", "password123")
+        User.objects.filter(email="legacy@book.com").update(social_id="4242")
+
+        self.assertEqual(self.login("facebook", "valid").status_code, 200)
+        self.assertEqual(User.objects.get(email="legacy@book.com").social_provider, "facebook")
+        self.assertEqual(User.objects.filter(social_id="4242").count(), 1)
+
+    def test_password_users_not_taken_for_social_users(self):
+        migration = import_module("authors.apps.authentication.migrations.0003_clear_password_user_social_ids")
+        User.objects.create_user("legacy", "legacy@book.com", "password123")
+        User.objects.filter(email="legacy@book.com").update(social_id="4242")
+        User.objects.create_user("password", "password@book.com", "password123")
+        User.objects.filter(email="password@book.com").update(social_id="20181023101532123456")
+
+        migration.clear_password_user_social_ids(apps, None)
+        self.assertEqual(list(User.objects.order_by("email").values_list("social_id", flat=True)),
+                         ["4242", None])
+
+    def test_social_ids_of_providers_are_separate(self):
+        User.objects.create_social_user("googler", "googler@gmail.com", "google", "4242")
+
+        self.assertEqual(self.login("facebook", "valid").status_code, 200)
+        self.assertEqual(User.objects.filter(social_id="4242").count(), 2)
+
+    @override_settings(SOCIAL_AUTH_CACHE_TIMEOUT=300)
+    def test_cache_timeout_bounded_by_expiry(self):
+        self.assertEqual(get_timeout({"sub": "1", "exp": 1030}, now=1000), 30)
+        self.assertEqual(get_timeout({"sub": "1", "exp": 5000}, now=1000), 300)
+        self.assertEqual(get_timeout({"sub": "1", "exp": 900}, now=1000), 0)
+        self.assertEqual(get_timeout({"id": "1"}), 300)
+        self.assertEqual(get_timeout("The token is either invalid or expired."), 0)
@@ -0,0 +1,123 @@
+"""
+Outbound calls of the social logins,
+a pluggable HTTP session, a cache of verified tokens and a caching
+google-auth transport that keeps Google's certificates between logins
+"""
+import hashlib
+import re
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from google.auth import transport
+from google.auth.transport import requests as google_requests
+
+from authors.apps.core.metrics import record_cache_lookup
+
+MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def get_session():
+    """
+    returns a new `SOCIAL_AUTH_HTTP_SESSION`, a requests compatible session
+    :return:
+    """
+    return import_string(settings.SOCIAL_AUTH_HTTP_SESSION)()
+
+
+def _hash(value):
+    return hashlib.sha256(value.encode("utf8")).hexdigest()
+
+
+def get_timeout(user_info, now=None):
+    """
+    returns how long the user info of a verified token may be cached,
+    never beyond the expiry of the token
+    :param user_info:
+    :param now:
+    :return: seconds, 0 when it must not be cached
+    """
+    if not isinstance(user_info, dict):
+        # failed verifications are not cached
+        return 0
+
+    timeout = settings.SOCIAL_AUTH_CACHE_TIMEOUT
+    if "exp" in user_info:
+        timeout = min(timeout, int(user_info["exp"] - (now or time())))
+    return max(timeout, 0)
+
+
+def verified_token(provider, auth_token, verify):
+    """
+    returns the user info of a token, verifying it with the provider only
+    when it is not cached already
+    :param provider:
+    :param auth_token:
+    :param verify: callable verifying the token with the provider
+    :return:
+    """
+    key = "social_auth:{0}:{1}".format(provider, _hash(auth_token))
+    user_info = cache.get(key)
+    record_cache_lookup("social_auth", user_info is not None)
+    if user_info is not None:
+        return user_info
+
+    user_info = verify(auth_token)
+    timeout = get_timeout(user_info)
+    if timeout:
+        cache.set(key, user_info, timeout)
+    return user_info
+
+
+def get_max_age(headers):
+    match = MAX_AGE.search(headers.get("cache-control", "") or "")
+    return int(match.group(1)) if match else 0
+
+
+class CachedResponse(transport.Response):
+    """
+    A response read back from the cache
+    """
+
+    def __init__(self, status, headers, data):
+        self._status, self._headers, self._data = status, headers, data
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def headers(self):
+        return self._headers
+
+    @property
+    def data(self):
+        return self._data
+
+
+class CachingRequest(transport.Request):
+    """
+    google-auth transport caching successful GET responses, e.g. Google's
+    certificates, for as long as their `Cache-Control: max-age` allows
+    """
+
+    def __init__(self, session=None):
+        self.request = google_requests.Request(session or get_session())
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        timeout = timeout or settings.SOCIAL_AUTH_TIMEOUT
+        if method != "GET":
+            return self.request(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+        key = "social_auth:http:{0}".format(_hash(url))
+        cached = cache.get(key)
+        record_cache_lookup("social_auth_http", cached is not None)
+        if cached is not None:
+            return CachedResponse(*cached)
+
+        response = self.request(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+        max_age = get_max_age(response.headers)
+        if response.status == 200 and max_age:
+            cache.set(key, (response.status, dict(response.headers), response.data), max_age)
+        return response
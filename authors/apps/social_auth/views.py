@@ -2,19 +2,24 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from authors.apps.core.throttling import IPTokenBucketThrottle, ThrottleFirstMixin
 from authors.apps.social_auth.common import BaseClassAttributes
 from authors.apps.social_auth.serializers import GoogleSocialAuthViewSerializer, FacebookSocialAuthViewSerializer
 
 
-class GoogleSocialAuthView(APIView, BaseClassAttributes):
+class GoogleSocialAuthView(ThrottleFirstMixin, APIView, BaseClassAttributes):
     serializer_class = GoogleSocialAuthViewSerializer
+    throttle_classes = (IPTokenBucketThrottle,)
+    throttle_scope = 'social_auth'
 
     def post(self, request):
         return HandleRequest.handle_user(request, self.serializer_class)
 
 
-class FacebookSocialAuthView(APIView, BaseClassAttributes):
+class FacebookSocialAuthView(ThrottleFirstMixin, APIView, BaseClassAttributes):
     serializer_class = FacebookSocialAuthViewSerializer
+    throttle_classes = (IPTokenBucketThrottle,)
+    throttle_scope = 'social_auth'
 
     def post(self, request):
         return HandleRequest.handle_user(request, self.serializer_class)
@@ -11,11 +11,16 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 """
 
 import os
+import sys
+from importlib.util import find_spec
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# True while the test suite is running
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in os.path.basename(sys.argv[0])
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/1.11/howto/deployment/checklist/
 
@@ -44,10 +49,14 @@ INSTALLED_APPS = [
     'authors.apps.authentication',
     'authors.apps.core',
     'authors.apps.profiles',
-    'authors.apps.articles'
+    'authors.apps.articles',
+    'authors.apps.notifications',
+    'authors.apps.jobs',
 ]
 
 MIDDLEWARE = [
+    'authors.apps.core.middleware.RequestMetricsMiddleware',
+    'authors.apps.core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,9 +86,18 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'authors.wsgi.application'
 
+# Pooled PostgreSQL connections, see `authors.apps.core.db.pool`. Every process
+# keeps up to `DB_POOL_MAX_SIZE` connections, a request waits up to `DB_POOL_TIMEOUT`
+# seconds for a free one and connections idle for `DB_POOL_HEALTH_CHECK_INTERVAL`
+# seconds are checked before they are reused.
+DB_POOL = os.environ.get('DB_POOL', 'False') == 'True'
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30))
+
 DATABASES = {
     "default": {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'authors.apps.core.db.postgresql' if DB_POOL else 'django.db.backends.postgresql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASS'),
@@ -87,6 +105,25 @@ DATABASES = {
     }
 }
 
+# Read replicas, see `authors.apps.core.db.routers`. Production settings add one
+# database per url of `DATABASE_REPLICA_URLS` (comma separated). Reads of
+# `REPLICA_APPS` in GET requests go to a replica lagging at most `REPLICA_MAX_LAG`
+# seconds, a client that wrote reads from the primary for `REPLICA_PIN_SECONDS`.
+REPLICA_DATABASES = []
+REPLICA_APPS = ['articles', 'profiles']
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 5))
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+DATABASE_ROUTERS = ['authors.apps.core.db.routers.ReplicaRouter']
+
+if TESTING:
+    # a second SQLite database standing in for a replica, see `authors.apps.core.tests.test_replicas`
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'replica.sqlite3'),
+    }
+    REPLICA_DATABASES = ['replica']
+
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
 
@@ -106,6 +143,25 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing, see `authors.apps.authentication.hashers`.
+# New passwords are hashed with `PASSWORD_HASHER`, argon2 when argon2-cffi is
+# installed and PBKDF2 otherwise. Passwords stored with another hasher or at
+# another cost are rehashed the next time their user logs in. Measure the cost
+# with `python manage.py benchmark_password_hashing`.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2' if find_spec('argon2') else 'pbkdf2')
+PBKDF2_ITERATIONS = int(os.environ.get('PBKDF2_ITERATIONS', 120000))
+ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 512))
+ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 2))
+
+PASSWORD_HASHER_CLASSES = {
+    'argon2': 'authors.apps.authentication.hashers.ConfigurableArgon2PasswordHasher',
+    'pbkdf2': 'authors.apps.authentication.hashers.ConfigurablePBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in sorted(PASSWORD_HASHER_CLASSES.items()) if name != PASSWORD_HASHER
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/1.11/topics/i18n/
@@ -146,6 +202,10 @@ REST_FRAMEWORK = {
         'authors.apps.authentication.backends.JWTAuthentication',
     ),
 
+    # Proxies in front of the app, the throttles take the client address they appended
+    # to `X-Forwarded-For` and ignore what clients put there. Heroku's router is one
+    # proxy, set `NUM_PROXIES=0` when clients connect to gunicorn directly.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 1)),
 }
 
 # Email send configurations
@@ -155,4 +215,105 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 EMAIL_USE_TLS = True
+# seconds an SMTP call may block a job before it fails and is retried
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 10))
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@uio.nm')
+
+# Request instrumentation, see `authors.apps.core.middleware.RequestMetricsMiddleware`.
+# Send query count and timings back to clients in a `Server-Timing` header.
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', 'True') == 'True'
+
+# Metrics exported at `/metrics`, see `authors.apps.core.metrics`.
+# Point `METRICS_MULTIPROC_DIR` at a directory shared by the gunicorn workers of
+# a dyno so the exporter sums the metrics of all workers, not only its own.
+METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR', None)
+METRICS_FLUSH_INTERVAL = int(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+# Scrapers must send `Authorization: Bearer <METRICS_TOKEN>`, `/metrics` answers 404
+# when no token is set (except in tests)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', None)
+
+# Article views, see `authors.apps.articles.view_counts`. Views are buffered in each
+# process and written every `VIEW_COUNT_FLUSH_INTERVAL` seconds or `VIEW_COUNT_FLUSH_SIZE`
+# views, a user viewing an article again within `VIEW_COUNT_DEDUPE_WINDOW` seconds is not counted.
+VIEW_COUNT_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNT_FLUSH_INTERVAL', 0 if TESTING else 10))
+VIEW_COUNT_FLUSH_SIZE = int(os.environ.get('VIEW_COUNT_FLUSH_SIZE', 100))
+VIEW_COUNT_DEDUPE_WINDOW = int(os.environ.get('VIEW_COUNT_DEDUPE_WINDOW', 1800))
+
+# Background jobs, see `authors.apps.jobs.queue`. Jobs run inline when
+# `JOBS_EAGER` is set, which is the default of the test suite.
+JOBS_EAGER = os.environ.get('JOBS_EAGER', str(TESTING)) == 'True'
+JOB_WORKER_THREADS = int(os.environ.get('JOB_WORKER_THREADS', 4))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+# seconds before the first retry, doubled after every failed attempt
+JOB_RETRY_DELAY = int(os.environ.get('JOB_RETRY_DELAY', 10))
+# seconds after which a job still running is considered abandoned by a dead worker
+JOB_LOCK_TIMEOUT = int(os.environ.get('JOB_LOCK_TIMEOUT', 600))
+
+# Shared cache, the throttles keep their buckets here. The default is local to
+# each process, point `CACHE_BACKEND` and `CACHE_LOCATION` at memcached so every
+# gunicorn worker shares the same buckets. The buckets need an atomic `incr`,
+# which the database cache does not have.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'authors-haven'),
+    },
+}
 
+# Seconds an email that matched no user is remembered, so repeated logins and
+# password resets for unknown emails do not reach the database. Only used with a
+# shared cache: with the default process local cache, other workers would keep
+# rejecting the email after it signs up. Changing emails with `QuerySet.update()`
+# does not forget them, they may be rejected until the timeout.
+MISSING_EMAIL_CACHE_TIMEOUT = int(os.environ.get('MISSING_EMAIL_CACHE_TIMEOUT', 60))
+
+# Token bucket throttles, see `authors.apps.core.throttling`.
+# `<scope>` rates apply per IP address, `<scope>_account` rates per account email.
+# The test suite logs in over and over, so throttles are off while testing.
+THROTTLE_ENABLED = os.environ.get('THROTTLE_ENABLED', str(not TESTING)) == 'True'
+THROTTLE_CACHE = 'default'
+THROTTLE_RATES = {
+    'login': os.environ.get('THROTTLE_RATE_LOGIN', '30/min'),
+    'login_account': os.environ.get('THROTTLE_RATE_LOGIN_ACCOUNT', '10/min'),
+    'register': os.environ.get('THROTTLE_RATE_REGISTER', '10/hour'),
+    'password_reset': os.environ.get('THROTTLE_RATE_PASSWORD_RESET', '10/hour'),
+    'password_reset_account': os.environ.get('THROTTLE_RATE_PASSWORD_RESET_ACCOUNT', '3/hour'),
+    'social_auth': os.environ.get('THROTTLE_RATE_SOCIAL_AUTH', '30/min'),
+}
+
+# Social login, see `authors.apps.social_auth.transport`.
+# Dotted path of the requests compatible session used to call Google and Facebook.
+SOCIAL_AUTH_HTTP_SESSION = os.environ.get('SOCIAL_AUTH_HTTP_SESSION', 'requests.Session')
+SOCIAL_AUTH_TIMEOUT = float(os.environ.get('SOCIAL_AUTH_TIMEOUT', 5))
+# Seconds a verified token is cached, never beyond the expiry of the token.
+# A revoked token keeps working until its cache entry expires.
+SOCIAL_AUTH_CACHE_TIMEOUT = int(os.environ.get('SOCIAL_AUTH_CACHE_TIMEOUT', 300))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '%(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'loggers': {
+        # one JSON line per request with its query count and timings
+        'authors.requests': {
+            'handlers': ['console'],
+            'level': os.environ.get('REQUEST_LOG_LEVEL', 'WARNING' if TESTING else 'INFO'),
+            'propagate': False,
+        },
+        'authors.jobs': {
+            'handlers': ['console'],
+            'level': os.environ.get('JOB_LOG_LEVEL', 'ERROR' if TESTING else 'INFO'),
+            'propagate': False,
+        },
+    },
+}
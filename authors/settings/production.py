@@ -2,12 +2,25 @@ import os
 
 import dj_database_url
 
-from authors.settings import DATABASES
+from authors.settings import DATABASES, DB_POOL, REPLICA_DATABASES
 
-db_env = dj_database_url.config(default=os.environ.get("DATABASE_URL", None), conn_max_age=600)
+POSTGRESQL_ENGINES = ('django.db.backends.postgresql', 'django.db.backends.postgresql_psycopg2')
+
+# with the pool connections are given back at the end of every request instead of kept per thread
+db_env = dj_database_url.config(default=os.environ.get("DATABASE_URL", None), conn_max_age=0 if DB_POOL else 600)
+if DB_POOL and db_env.get('ENGINE') in POSTGRESQL_ENGINES:
+    db_env['ENGINE'] = 'authors.apps.core.db.postgresql'
 
 DATABASES['default'].update(db_env)
 
+REPLICA_DATABASES = list(REPLICA_DATABASES)
+for index, url in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(","))):
+    alias = "replica_{0}".format(index + 1)
+    DATABASES[alias] = dj_database_url.parse(url, conn_max_age=0 if DB_POOL else 600)
+    if DB_POOL and DATABASES[alias]['ENGINE'] in POSTGRESQL_ENGINES:
+        DATABASES[alias]['ENGINE'] = 'authors.apps.core.db.postgresql'
+    REPLICA_DATABASES.append(alias)
+
 DEBUG = True
 
 ALLOWED_HOSTS = ['ah-backend-staging.herokuapp.com', 'ah-backend-production.herokuapp.com']
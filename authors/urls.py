@@ -18,6 +18,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
 
+from authors.apps.core.views import metrics_view
 from authors.settings import STATIC_ROOT, STATIC_URL
 
 
@@ -34,6 +35,15 @@ urlpatterns = [
     # urls for articles
     path('api/articles/', include('authors.apps.articles.urls')),
     path('api/profiles/', include('authors.apps.profiles.urls')),
+
+    # in-app notifications
+    path('api/notifications/', include('authors.apps.notifications.urls')),
+
+    # request metrics, admin only
+    path('api/metrics/', include('authors.apps.core.urls')),
+
+    # metrics in the prometheus text format
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 urlpatterns += static(STATIC_URL, document_root=STATIC_ROOT)
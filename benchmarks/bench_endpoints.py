@@ -0,0 +1,78 @@
+"""
+Endpoint benchmarks,
+run with `pytest benchmarks/bench_endpoints.py --bench-scale 5`
+
+Every benchmark records the number of SQL queries of one request in `extra_info`,
+so query regressions show up next to the timings in the pytest-benchmark report.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def run(benchmark, request, expected_status=200):
+    """
+    benchmarks `request`, a callable returning a response, and records its query count
+    :param benchmark:
+    :param request:
+    :param expected_status:
+    :return: the last response
+    """
+    with CaptureQueriesContext(connection) as queries:
+        response = request()
+    assert response.status_code == expected_status, response.content
+    benchmark.extra_info["queries"] = len(queries)
+
+    return benchmark(request)
+
+
+@pytest.mark.parametrize("ordering", ["new", "hot", "top"])
+def test_article_list(benchmark, client, ordering):
+    run(benchmark, lambda: client.get("/api/articles/", {"ordering": ordering}))
+
+
+def test_article_list_expanded(benchmark, client):
+    run(benchmark, lambda: client.get("/api/articles/", {"expand": "body,comments,author"}))
+
+
+def test_article_list_deep_offset(benchmark, client, data):
+    run(benchmark, lambda: client.get("/api/articles/", {"offset": len(data.articles) // 2}))
+
+
+def test_article_detail(benchmark, client, other_article):
+    run(benchmark, lambda: client.get("/api/articles/{0}/".format(other_article.slug)))
+
+
+@pytest.mark.parametrize("field", ["title", "author", "tag"])
+def test_article_search(benchmark, client, data, field):
+    values = {
+        "title": "article 1",
+        "author": data.users[1].username,
+        "tag": data.tags[0].tag_name,
+    }
+    run(benchmark, lambda: client.get("/api/articles/", {field: values[field]}))
+
+
+def test_article_rate(benchmark, client, other_article):
+    payload = {"article": {"score": 4}}
+    run(benchmark, lambda: client.post(
+        "/api/articles/{0}/rate/".format(other_article.slug), payload, format="json"))
+
+
+def test_article_like(benchmark, client, other_article):
+    # every request toggles the like, so the benchmark alternates between liking and unliking
+    run(benchmark, lambda: client.post("/api/articles/{0}/like/".format(other_article.slug)))
+
+
+def test_article_comment(benchmark, client, other_article):
+    payload = {"comment": {"body": "a benchmark comment"}}
+    run(benchmark, lambda: client.post(
+        "/api/articles/{0}/comment/".format(other_article.slug), payload, format="json"), expected_status=201)
+
+
+def test_profile(benchmark, client, data):
+    run(benchmark, lambda: client.get("/api/profiles/profile/{0}/".format(data.users[1].username)))
+
+
+def test_current_user(benchmark, client):
+    run(benchmark, lambda: client.get("/api/user/"))
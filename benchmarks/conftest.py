@@ -0,0 +1,55 @@
+"""
+Fixtures of the endpoint benchmarks,
+the database is filled once per session by the synthetic data generator
+"""
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from authors.apps.core import data_generator
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-scale", type=int, default=int(os.environ.get("BENCH_SCALE", 1)),
+                     help="scale of the generated data set, defaults to $BENCH_SCALE or 1")
+    parser.addoption("--bench-seed", type=int, default=int(os.environ.get("BENCH_SEED", 0)),
+                     help="seed of the generated data set, defaults to $BENCH_SEED or 0")
+
+
+@pytest.fixture(scope="session")
+def generated_data(request, django_db_setup, django_db_blocker):
+    """
+    generates the data set once, it is shared by every benchmark of the session
+    """
+    with django_db_blocker.unblock():
+        return data_generator.generate(scale=request.config.getoption("--bench-scale"),
+                                       seed=request.config.getoption("--bench-seed"), prefix="bench")
+
+
+@pytest.fixture
+def data(generated_data, db):
+    return generated_data
+
+
+@pytest.fixture
+def user(data):
+    return data.users[0]
+
+
+@pytest.fixture
+def client(user):
+    """
+    api client authenticated as the first generated user
+    """
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token {0}".format(user.token))
+    return client
+
+
+@pytest.fixture
+def other_article(data, user):
+    """
+    an article written by someone else than `user`
+    """
+    return next(article for article in data.articles if article.author_id != user.pk)
@@ -0,0 +1,91 @@
+"""
+Load test,
+sends requests to a running server from more and more concurrent clients and
+reports the throughput and latency at every level, e.g.
+
+    python benchmarks/load_test.py --url http://localhost:8000/api/articles/ --token <jwt> --concurrency 1 4 16 32
+
+Compare the sync workers (`GUNICORN_WORKER_CLASS=sync`) with the threaded ones
+while requests wait on slow I/O: throughput stops growing once every worker
+thread is busy.
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from statistics import mean
+from time import perf_counter
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def send(url, headers, timeout):
+    """
+    sends one request
+    :return: the latency in seconds and the status, None when the request failed
+    """
+    started = perf_counter()
+    try:
+        with urlopen(Request(url, headers=headers), timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except HTTPError as error:
+        status = error.code
+    except (URLError, OSError):
+        status = None
+    return perf_counter() - started, status
+
+
+def run_level(url, headers, concurrency, requests, timeout):
+    """
+    sends `requests` requests from `concurrency` clients at once
+    :return: summary of the level
+    """
+    with ThreadPoolExecutor(concurrency) as executor:
+        started = perf_counter()
+        results = list(executor.map(lambda _: send(url, headers, timeout), range(requests)))
+        elapsed = perf_counter() - started
+
+    latencies = [latency for latency, status in results if status is not None and status < 500]
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": requests - len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(mean(latencies) * 1000, 1) if latencies else 0,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:8000/api/articles/")
+    parser.add_argument("--token", default=None, help="JWT sent in the Authorization header.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level.")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--json", action="store_true", help="Print one JSON line per level.")
+    options = parser.parse_args(argv)
+
+    headers = {"Authorization": "Token " + options.token} if options.token else {}
+    if not options.json:
+        print("{0:>11} {1:>8} {2:>7} {3:>9} {4:>9} {5:>9}".format(
+            "concurrency", "errors", "req/s", "mean ms", "p50 ms", "p95 ms"))
+    for concurrency in options.concurrency:
+        level = run_level(options.url, headers, concurrency, max(options.requests, concurrency), options.timeout)
+        if options.json:
+            print(json.dumps(level))
+        else:
+            print("{concurrency:>11} {errors:>8} {requests_per_second:>7} {mean_ms:>9} {p50_ms:>9} {p95_ms:>9}".format(
+                **level))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
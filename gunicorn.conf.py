@@ -0,0 +1,41 @@
+"""
+gunicorn settings, see the Deployment section of the README.
+
+Threaded workers (`gthread`) serve `GUNICORN_THREADS` requests at once in every
+process, so a request waiting on the database or on Google or Facebook only
+holds one thread instead of a whole worker.
+"""
+import os
+
+bind = "0.0.0.0:{0}".format(os.environ.get("PORT", "8000"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# a worker not answering for this long is restarted, requests should never get close
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# restart workers now and then so leaks do not pile up
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", None)
+errorlog = "-"
+
+
+def on_starting(server):
+    # samples of workers of a previous run would be summed with the new ones
+    directory = os.environ.get("METRICS_MULTIPROC_DIR")
+    if directory:
+        from authors.apps.core.metrics import clear_multiprocess_dir
+        clear_multiprocess_dir(directory)
+
+
+def child_exit(server, worker):
+    # workers are recycled after `max_requests`, keep their samples in one file
+    directory = os.environ.get("METRICS_MULTIPROC_DIR")
+    if directory:
+        from authors.apps.core.metrics import mark_process_dead
+        mark_process_dead(worker.pid, directory)